@@ -0,0 +1,87 @@
+"""
+Benchmark contraction hierarchy queries against plain Dijkstra.
+
+Builds a hierarchy for each seeded weighted graph, then times the same random
+point-to-point queries with `WeightedGraph.find_shortest_path` and with the
+hierarchy, checking that both agree:
+
+    python -m benchmarks.contraction_hierarchy --vertices 10000 --queries 500
+"""
+import argparse
+import sys
+import time
+from random import Random
+
+from benchmarks.run_benchmarks import AVERAGE_DEGREE
+from graphs.contraction import ContractionHierarchy
+from graphs.generators import erdos_renyi_graph, grid_graph, power_law_graph
+
+
+def build_graphs(vertex_count, seed):
+    """Return a list of (name, graph) pairs of weighted graphs."""
+    side = max(int(vertex_count ** 0.5), 2)
+    return [
+        ('grid_weighted', grid_graph(side, side, seed, weighted=True)),
+        ('power_law_weighted', power_law_graph(vertex_count, AVERAGE_DEGREE // 2,
+                                               seed, weighted=True)),
+        ('erdos_renyi_weighted', erdos_renyi_graph(
+            vertex_count, AVERAGE_DEGREE / max(vertex_count - 1, 1), seed,
+            weighted=True)),
+    ]
+
+
+def time_queries(find_shortest_path, queries):
+    """Return the seconds taken to answer every query, and the answers."""
+    start = time.perf_counter()
+    answers = [find_shortest_path(start_id, target_id) for start_id, target_id in queries]
+    return time.perf_counter() - start, answers
+
+
+def run(vertex_count, query_count, seed):
+    """Run the comparison on every graph and return the result records."""
+    results = []
+    for graph_name, graph in build_graphs(vertex_count, seed):
+        start = time.perf_counter()
+        hierarchy = ContractionHierarchy.build(graph)
+        build_seconds = time.perf_counter() - start
+
+        rng = Random(seed)
+        vertex_ids = graph.get_vertex_ids()
+        queries = [(rng.choice(vertex_ids), rng.choice(vertex_ids))
+                   for _ in range(query_count)]
+        dijkstra_seconds, expected = time_queries(graph.find_shortest_path, queries)
+        hierarchy_seconds, answers = time_queries(hierarchy.find_shortest_path, queries)
+        if [distance for distance, _ in answers] != [distance for distance, _ in expected]:
+            raise AssertionError(f'{graph_name}: hierarchy distances differ from Dijkstra')
+
+        results.append({
+            'graph': graph_name,
+            'vertices': len(vertex_ids),
+            'edges': graph.get_edge_count(),
+            'shortcut_edges': len(hierarchy.forward[1]) + len(hierarchy.backward[1]),
+            'build_seconds': build_seconds,
+            'dijkstra_query_seconds': dijkstra_seconds / query_count,
+            'hierarchy_query_seconds': hierarchy_seconds / query_count,
+        })
+        record = results[-1]
+        print(f"{graph_name:>22} V={record['vertices']:<8} "
+              f"build {build_seconds:8.2f} s  "
+              f"dijkstra {record['dijkstra_query_seconds'] * 1000:8.3f} ms  "
+              f"hierarchy {record['hierarchy_query_seconds'] * 1000:8.3f} ms  "
+              f"x{dijkstra_seconds / max(hierarchy_seconds, 1e-9):.1f}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--vertices', type=int, default=2000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=2020)
+    args = parser.parse_args(argv)
+
+    run(args.vertices, args.queries, args.seed)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
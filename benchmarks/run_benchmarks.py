@@ -0,0 +1,212 @@
+"""
+Benchmark harness for the graph algorithms.
+
+Builds seeded synthetic graphs, times every algorithm on them and records the
+peak memory it allocates, then writes the results as JSON so runs can be
+compared between releases:
+
+    python -m benchmarks.run_benchmarks --scale small --output results.json
+    python -m benchmarks.run_benchmarks --compare results.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections import deque
+from contextlib import redirect_stdout
+
+from graphs.analytics import betweenness_centrality, pagerank
+from graphs.generators import (bipartite_graph, erdos_renyi_graph, grid_graph,
+                               power_law_graph, random_dag)
+from graphs.triangles import triangle_counts
+
+# vertex counts for each scale; APSP runs on a smaller graph since it is V^3
+SCALES = {
+    'tiny': 200,
+    'small': 2000,
+    'medium': 20000,
+    'large': 200000,
+}
+APSP_MAX_VERTICES = 300
+AVERAGE_DEGREE = 8
+
+
+def _drain(result):
+    """Consume lazy results (e.g. generator traversals) so their cost counts."""
+    if hasattr(result, '__next__'):
+        deque(result, maxlen=0)
+    return result
+
+
+def build_graphs(vertex_count, seed):
+    """Return a list of (name, graph) pairs for every generator."""
+    probability = AVERAGE_DEGREE / max(vertex_count - 1, 1)
+    side = max(int(vertex_count ** 0.5), 2)
+    return [
+        ('erdos_renyi', erdos_renyi_graph(vertex_count, probability, seed)),
+        ('erdos_renyi_directed', erdos_renyi_graph(vertex_count, probability, seed,
+                                                   is_directed=True)),
+        ('grid', grid_graph(side, side, seed)),
+        ('power_law', power_law_graph(vertex_count, AVERAGE_DEGREE // 2, seed)),
+        ('dag', random_dag(vertex_count, probability, seed)),
+        ('bipartite', bipartite_graph(vertex_count // 2, vertex_count - vertex_count // 2,
+                                      2 * probability, seed)),
+        ('erdos_renyi_weighted', erdos_renyi_graph(vertex_count, probability, seed,
+                                                   weighted=True)),
+        ('grid_weighted', grid_graph(side, side, seed, weighted=True)),
+        ('power_law_weighted', power_law_graph(vertex_count, AVERAGE_DEGREE // 2,
+                                               seed, weighted=True)),
+    ]
+
+
+def algorithms_for(name, graph):
+    """Return (algorithm name, callable) pairs that apply to the graph."""
+    vertex_ids = graph.get_vertex_ids()
+    start_id, target_id = vertex_ids[0], vertex_ids[-1]
+    is_weighted = name.endswith('_weighted')
+
+    algorithms = [
+        ('bfs_traversal', lambda: _drain(graph.bfs_traversal(start_id))),
+        ('find_shortest_path', lambda: graph.find_shortest_path(start_id, target_id)),
+        ('find_connected_components', lambda: graph.find_connected_components()),
+        ('greedy_coloring_dsatur', lambda: graph.greedy_coloring('dsatur')),
+        ('pagerank', lambda: pagerank(graph)),
+        ('betweenness_sampled', lambda: betweenness_centrality(graph, samples=32, seed=0)),
+        ('triangle_counts', lambda: triangle_counts(graph)),
+    ]
+    if graph.is_directed_graph():
+        algorithms.append(('get_strongly_connected_components',
+                           lambda: graph.get_strongly_connected_components()))
+    if name == 'dag':
+        algorithms.append(('topological_sort', lambda: graph.topological_sort()))
+    if is_weighted:
+        algorithms += [
+            ('minimum_spanning_tree_kruskal',
+             lambda: graph.minimum_spanning_tree_kruskal()),
+            ('minimum_spanning_tree_prim',
+             lambda: graph.minimum_spanning_tree_prim(forest=True)),
+        ]
+        if len(vertex_ids) <= APSP_MAX_VERTICES:
+            algorithms.append(('all_pairs_shortest_paths',
+                               lambda: graph.all_pairs_shortest_paths()))
+    return algorithms
+
+
+def measure(function, repeat):
+    """
+    Return the best wall time over `repeat` runs and the peak traced memory of
+    one extra run. Memory is traced separately because tracemalloc slows the
+    code it watches.
+    """
+    best = float('inf')
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return best, peak
+
+
+def run(vertex_count, seed, repeat):
+    """Run every benchmark and return the list of result records."""
+    sized_graphs = build_graphs(vertex_count, seed)
+    if vertex_count > APSP_MAX_VERTICES:
+        sized_graphs += [(name, graph) for name, graph
+                         in build_graphs(APSP_MAX_VERTICES, seed)
+                         if name.endswith('_weighted')]
+
+    results = []
+    for graph_name, graph in sized_graphs:
+        for algorithm_name, function in algorithms_for(graph_name, graph):
+            seconds, peak_bytes = measure(function, repeat)
+            results.append({
+                'graph': graph_name,
+                'algorithm': algorithm_name,
+                'vertices': len(graph.get_vertex_ids()),
+                'edges': graph.get_edge_count(),
+                'seconds': seconds,
+                'peak_bytes': peak_bytes,
+            })
+            print(f"{graph_name:>22} {algorithm_name:>34} "
+                  f"V={results[-1]['vertices']:<8} {seconds * 1000:10.2f} ms "
+                  f"{peak_bytes / 1024:10.1f} KiB")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the benchmarks that got slower than the baseline by more than
+    `threshold` (a fraction) and return how many there were.
+    """
+    def key(record):
+        return (record['graph'], record['algorithm'], record['vertices'])
+
+    previous = {key(record): record for record in baseline['results']}
+    regressions = 0
+    for record in results:
+        old = previous.get(key(record))
+        if old is None or old['seconds'] <= 0:
+            continue
+        change = record['seconds'] / old['seconds'] - 1
+        if change > threshold:
+            regressions += 1
+            print(f"REGRESSION {record['graph']} {record['algorithm']}: "
+                  f"{old['seconds'] * 1000:.2f} ms -> {record['seconds'] * 1000:.2f} ms "
+                  f"(+{change:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--vertices', type=int,
+                        help='vertex count, overriding --scale')
+    parser.add_argument('--seed', type=int, default=2020)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='results file to check for regressions against')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='slowdown fraction reported as a regression')
+    args = parser.parse_args(argv)
+
+    # read the baseline first, since --output may name the same file
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    vertex_count = args.vertices or SCALES[args.scale]
+    results = run(vertex_count, args.seed, args.repeat)
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            'meta': {
+                'vertices': vertex_count,
+                'seed': args.seed,
+                'repeat': args.repeat,
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            },
+            'results': results,
+        }, f, indent=2)
+
+    if baseline is not None:
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,557 @@
+from array import array
+from functools import partial
+from heapq import heappop, heappush
+from itertools import islice, repeat
+from math import log, sqrt
+from operator import add, mul, sub
+from random import Random
+
+from graphs.parallel import map_source_chunks
+from graphs.shortest_paths import INFINITY, bfs_csr, dijkstra_csr
+
+SCORE_TYPECODE = 'd'
+
+DIRECTIONS = ('in', 'out', 'both')
+
+
+class ConvergenceError(ValueError):
+    """
+    Raised when a power iteration does not converge within its iteration
+    limit. `scores` holds the last iterate, which can warm start a longer run.
+    """
+
+    def __init__(self, iterations, scores):
+        super().__init__(f'Power iteration did not converge in {iterations} iterations')
+        self.iterations = iterations
+        self.scores = scores
+
+
+def _rows(offsets):
+    """Return (start, end) pairs for every row of a CSR offsets array."""
+    return zip(offsets, islice(offsets, 1, None))
+
+
+def _in_sums(reverse, values, weighted):
+    """
+    Return, for every vertex, the sum of values[u] (times the edge weight if
+    weighted) over its incoming edges u -> v: the transposed adjacency matrix
+    times the values. Each row is summed with `sum(map(...))` over array
+    slices, so the per-edge work runs in C.
+    """
+    sources = reverse.targets
+    get = values.__getitem__
+    if weighted:
+        weights = reverse.weights
+        return array(SCORE_TYPECODE, [sum(map(mul, map(get, sources[start:end]),
+                                              weights[start:end]))
+                                      for start, end in _rows(reverse.offsets)])
+    return array(SCORE_TYPECODE, [sum(map(get, sources[start:end]))
+                                  for start, end in _rows(reverse.offsets)])
+
+
+def _start_vector(initial, vertex_count):
+    """
+    Return the scores to start a power iteration from, a copy of `initial`
+    when given and uniform scores otherwise.
+    """
+    if initial is None:
+        return array(SCORE_TYPECODE, [1.0]) * vertex_count
+    if len(initial) != vertex_count:
+        raise ValueError(f'Expected {vertex_count} initial scores, got {len(initial)}')
+    return array(SCORE_TYPECODE, initial)
+
+
+def _initial_array(csr, initial):
+    """Turn a vertex id -> score map into an array indexed like csr.ids."""
+    if initial is None:
+        return None
+    return array(SCORE_TYPECODE, (initial.get(vertex_id, 0.0) for vertex_id in csr.ids))
+
+
+def _check_weights(csr, weighted):
+    """Return whether to use edge weights, rejecting negative ones."""
+    if not weighted or csr.weights is None:
+        return False
+    if any(weight < 0 for weight in csr.weights):
+        raise ValueError('Edge weights must not be negative')
+    return True
+
+
+def pagerank_csr(csr, damping=0.85, tolerance=1e-6, max_iterations=100,
+                 initial=None, weighted=True):
+    """
+    Compute PageRank by power iteration over a CSRAdjacency.
+
+    A random surfer follows an outgoing edge with probability `damping`
+    (proportionally to edge weights when weighted) and jumps to a uniformly
+    random vertex otherwise. Vertices without outgoing edges (dangling
+    vertices) send their score to every vertex evenly.
+
+    Parameters:
+    csr (CSRAdjacency): The adjacency. Undirected edges count both ways.
+    damping (number): The probability of following an edge, from 0 to 1.
+    tolerance (number): Stop once the scores change by less than this in
+        total (summing the absolute changes), as they always sum to 1.
+    max_iterations (integer): The most iterations to run.
+    initial (sequence<number>): Scores to start from, indexed like csr.ids,
+        such as a previous result for a slightly changed graph. They are
+        rescaled to sum to 1; uniform scores are used if they sum to 0.
+    weighted (boolean): Use the edge weights of a weighted adjacency.
+
+    Returns:
+    tuple(array, integer): The score of every vertex index, summing to 1, and
+    the number of iterations run.
+
+    Raises:
+    ConvergenceError: If the scores did not converge in max_iterations.
+    ValueError: For a damping outside 0..1 or a negative edge weight.
+    """
+    if not 0 <= damping <= 1:
+        raise ValueError(f'Damping must be between 0 and 1, got {damping}')
+    vertex_count = len(csr)
+    if vertex_count == 0:
+        return array(SCORE_TYPECODE), 0
+    weighted = _check_weights(csr, weighted)
+    reverse = csr.transpose()
+
+    # damping / total out-weight of every vertex, 0 for dangling vertices
+    if weighted:
+        out_weights = [sum(csr.weights[start:end]) for start, end in _rows(csr.offsets)]
+    else:
+        out_weights = [end - start for start, end in _rows(csr.offsets)]
+    follow = array(SCORE_TYPECODE, [damping / total if total > 0 else 0.0
+                                    for total in out_weights])
+    dangling = [vertex for vertex, total in enumerate(out_weights) if total <= 0]
+
+    scores = _start_vector(initial, vertex_count)
+    total = sum(scores)
+    if total <= 0:
+        scores = _start_vector(None, vertex_count)
+        total = vertex_count
+    scores = array(SCORE_TYPECODE, [score / total for score in scores])
+
+    teleport = (1 - damping) / vertex_count
+    for iteration in range(1, max_iterations + 1):
+        # the score each vertex sends along every unit of its out-weight
+        shares = array(SCORE_TYPECODE, map(mul, scores, follow))
+        base = teleport + damping * sum(map(scores.__getitem__, dangling)) / vertex_count
+        new_scores = array(SCORE_TYPECODE, map(add, repeat(base),
+                                               _in_sums(reverse, shares, weighted)))
+        change = sum(map(abs, map(sub, new_scores, scores)))
+        scores = new_scores
+        if change < tolerance:
+            return scores, iteration
+    raise ConvergenceError(max_iterations, scores)
+
+
+def degree_centrality_csr(csr, direction='both'):
+    """
+    Return the degree centrality of every vertex of a CSRAdjacency: its
+    number of edges divided by V - 1, the most it could have without
+    parallel edges or self-loops.
+
+    Parameters:
+    csr (CSRAdjacency): The adjacency.
+    direction (string): For directed adjacencies, count incoming edges
+        ('in'), outgoing edges ('out') or both ('both').
+
+    Returns:
+    array: The centrality of every vertex index.
+    """
+    if direction not in DIRECTIONS:
+        raise ValueError(f'Unknown degree direction {direction!r}')
+    vertex_count = len(csr)
+    scale = 1 / (vertex_count - 1) if vertex_count > 1 else 1.0
+
+    out_degrees = [end - start for start, end in _rows(csr.offsets)]
+    if not csr.is_directed or direction == 'out':
+        degrees = out_degrees
+    else:
+        in_degrees = [end - start for start, end in _rows(csr.transpose().offsets)]
+        degrees = in_degrees if direction == 'in' else map(sum, zip(in_degrees, out_degrees))
+    return array(SCORE_TYPECODE, [degree * scale for degree in degrees])
+
+
+def eigenvector_centrality_csr(csr, tolerance=1e-6, max_iterations=100,
+                               initial=None, weighted=True):
+    """
+    Compute eigenvector centrality by power iteration over a CSRAdjacency:
+    a vertex is central when central vertices have edges into it.
+
+    Each iteration multiplies the scores by the transposed adjacency matrix
+    plus the identity and rescales them to unit length. Adding the identity
+    keeps the same eigenvectors but stops the iteration from oscillating on
+    bipartite graphs.
+
+    Parameters:
+    csr (CSRAdjacency): The adjacency. Undirected edges count both ways.
+    tolerance (number): Stop once the scores move by less than this in
+        Euclidean distance, as they always have unit length.
+    max_iterations (integer): The most iterations to run.
+    initial (sequence<number>): Scores to start from, indexed like csr.ids,
+        such as a previous result. Defaults to all ones.
+    weighted (boolean): Use the edge weights of a weighted adjacency.
+
+    Returns:
+    tuple(array, integer): The score of every vertex index, with unit
+    Euclidean length, and the number of iterations run.
+
+    Raises:
+    ConvergenceError: If the scores did not converge in max_iterations.
+    ValueError: If the initial scores are all zero, or for a negative edge
+        weight.
+    """
+    vertex_count = len(csr)
+    if vertex_count == 0:
+        return array(SCORE_TYPECODE), 0
+    weighted = _check_weights(csr, weighted)
+    reverse = csr.transpose()
+
+    scores = _start_vector(initial, vertex_count)
+    norm = sqrt(sum(map(mul, scores, scores)))
+    if norm == 0:
+        raise ValueError('Initial scores must not all be zero')
+    scores = array(SCORE_TYPECODE, [score / norm for score in scores])
+
+    for iteration in range(1, max_iterations + 1):
+        new_scores = array(SCORE_TYPECODE, map(add, scores,
+                                               _in_sums(reverse, scores, weighted)))
+        norm = sqrt(sum(map(mul, new_scores, new_scores)))
+        new_scores = array(SCORE_TYPECODE, [score / norm for score in new_scores])
+        change = sqrt(sum(difference * difference
+                          for difference in map(sub, new_scores, scores)))
+        scores = new_scores
+        if change < tolerance:
+            return scores, iteration
+    raise ConvergenceError(max_iterations, scores)
+
+
+def pagerank(graph, damping=0.85, tolerance=1e-6, max_iterations=100,
+             initial=None, weighted=True):
+    """
+    Rank the vertices of a Graph or WeightedGraph with PageRank. See
+    `pagerank_csr` for the parameters.
+
+    Parameters:
+    initial (dict): Vertex id -> score to start from, typically the result
+        of an earlier call before the graph changed. Missing ids start at 0.
+
+    Returns:
+    dict: Vertex id -> score, with the scores summing to 1.
+
+    Raises:
+    ConvergenceError: With the last scores as a vertex id -> score map.
+    """
+    csr = graph.to_csr()
+    try:
+        scores, _ = pagerank_csr(csr, damping, tolerance, max_iterations,
+                                 _initial_array(csr, initial), weighted)
+    except ConvergenceError as error:
+        raise ConvergenceError(error.iterations, dict(zip(csr.ids, error.scores))) from None
+    return dict(zip(csr.ids, scores))
+
+
+def degree_centrality(graph, direction='both'):
+    """
+    Return vertex id -> degree centrality for a Graph or WeightedGraph. See
+    `degree_centrality_csr`.
+    """
+    csr = graph.to_csr()
+    return dict(zip(csr.ids, degree_centrality_csr(csr, direction)))
+
+
+def eigenvector_centrality(graph, tolerance=1e-6, max_iterations=100,
+                           initial=None, weighted=True):
+    """
+    Return vertex id -> eigenvector centrality for a Graph or WeightedGraph.
+    See `eigenvector_centrality_csr` for the parameters; `initial` is a
+    vertex id -> score map, such as an earlier result.
+    """
+    csr = graph.to_csr()
+    try:
+        scores, _ = eigenvector_centrality_csr(csr, tolerance, max_iterations,
+                                               _initial_array(csr, initial), weighted)
+    except ConvergenceError as error:
+        raise ConvergenceError(error.iterations, dict(zip(csr.ids, error.scores))) from None
+    return dict(zip(csr.ids, scores))
+
+
+def _shortest_path_counts(csr, source, weighted):
+    """
+    Find the shortest paths from one source index, by breadth-first search
+    or, if weighted, Dijkstra's Algorithm, counting how many there are.
+
+    Returns:
+    tuple(list, array, array): The reached vertex indices in order of
+    distance, the distance to every vertex index (INFINITY if not reached)
+    and the number of shortest paths to every vertex index.
+    """
+    vertex_count = len(csr)
+    offsets, targets = csr.offsets, csr.targets
+    distances = array(SCORE_TYPECODE, [INFINITY]) * vertex_count
+    counts = array(SCORE_TYPECODE, [0.0]) * vertex_count
+    distances[source] = 0
+    counts[source] = 1
+
+    if not weighted:
+        order = [source]
+        for vertex in order:  # grows as the search goes, like a queue
+            next_distance = distances[vertex] + 1
+            count = counts[vertex]
+            for neighbor in targets[offsets[vertex]:offsets[vertex + 1]]:
+                if distances[neighbor] == INFINITY:
+                    distances[neighbor] = next_distance
+                    counts[neighbor] = count
+                    order.append(neighbor)
+                elif distances[neighbor] == next_distance:
+                    counts[neighbor] += count
+        return order, distances, counts
+
+    weights = csr.weights
+    settled = bytearray(vertex_count)
+    order = []
+    heap = [(0.0, source)]
+    while heap:
+        distance, vertex = heappop(heap)
+        if settled[vertex]:
+            continue  # stale entry
+        settled[vertex] = 1
+        order.append(vertex)
+        count = counts[vertex]
+        for edge in range(offsets[vertex], offsets[vertex + 1]):
+            neighbor = targets[edge]
+            new_distance = distance + weights[edge]
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                counts[neighbor] = count
+                heappush(heap, (new_distance, neighbor))
+            elif new_distance == distances[neighbor] and not settled[neighbor]:
+                counts[neighbor] += count
+    return order, distances, counts
+
+
+def _betweenness_chunk(csr, sources, weighted):
+    """
+    Sum the dependencies of every vertex on the given sources with Brandes'
+    Algorithm: after the shortest paths from a source are counted, vertices
+    are taken farthest first and pass their dependency back to their
+    predecessors, found along the edges of the transposed adjacency.
+
+    Returns:
+    array: The summed dependency of every vertex index.
+    """
+    vertex_count = len(csr)
+    reverse = csr.transpose()
+    offsets, predecessors, weights = reverse.offsets, reverse.targets, reverse.weights
+    totals = array(SCORE_TYPECODE, [0.0]) * vertex_count
+
+    for source in sources:
+        order, distances, counts = _shortest_path_counts(csr, source, weighted)
+        dependencies = array(SCORE_TYPECODE, [0.0]) * vertex_count
+        for vertex in reversed(order):
+            share = (1 + dependencies[vertex]) / counts[vertex]
+            distance = distances[vertex]
+            start, end = offsets[vertex], offsets[vertex + 1]
+            if weighted:
+                for predecessor, weight in zip(predecessors[start:end], weights[start:end]):
+                    if distances[predecessor] + weight == distance and predecessor != vertex:
+                        dependencies[predecessor] += counts[predecessor] * share
+            else:
+                for predecessor in predecessors[start:end]:
+                    if distances[predecessor] == distance - 1:
+                        dependencies[predecessor] += counts[predecessor] * share
+            if vertex != source:
+                totals[vertex] += dependencies[vertex]
+    return totals
+
+
+def _closeness_chunk(csr, sources, weighted):
+    """
+    Sum, for every vertex, its distances from the given sources that reach it.
+
+    Returns:
+    tuple(array, array, number): The summed distance to every vertex index,
+    the number of sources (other than itself) reaching it, and the longest
+    distance seen.
+    """
+    vertex_count = len(csr)
+    farness = array(SCORE_TYPECODE, [0.0]) * vertex_count
+    reached = array('q', [0]) * vertex_count
+    longest = 0
+    for source in sources:
+        if weighted:
+            distances = dijkstra_csr(csr, source)[0]
+        else:
+            distances = bfs_csr(csr, source)[0]
+        for vertex, distance in enumerate(distances):
+            if distance != INFINITY and vertex != source:
+                farness[vertex] += distance
+                reached[vertex] += 1
+                if distance > longest:
+                    longest = distance
+    return farness, reached, longest
+
+
+def _pick_sources(vertex_count, samples, seed):
+    """Return the source indices to run from: all of them, or a random sample."""
+    if samples is None or samples >= vertex_count:
+        return list(range(vertex_count))
+    if samples < 1:
+        raise ValueError(f'Expected a positive number of samples, got {samples}')
+    return sorted(Random(seed).sample(range(vertex_count), samples))
+
+
+def _map_chunks(graph, csr, sources, task, max_workers, chunk_size):
+    """Run task(csr, sources) in this process, or in chunks over a process pool."""
+    if max_workers == 1:
+        return [task(csr, sources)]
+    return map_source_chunks(graph, [csr.ids[source] for source in sources], task,
+                             max_workers=max_workers, chunk_size=chunk_size)
+
+
+def sampling_error(vertex_count, samples, confidence=0.95):
+    """
+    Return the error bound of a sampled estimate as a fraction of the range
+    each sampled value can take.
+
+    By Hoeffding's inequality (which also holds when sampling without
+    replacement) and a union bound over the vertices, the mean over `samples`
+    random sources is within this bound of the mean over all sources for
+    every vertex at once, with probability at least `confidence`.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError(f'Confidence must be between 0 and 1, got {confidence}')
+    if samples >= vertex_count:
+        return 0.0
+    return sqrt(log(2 * vertex_count / (1 - confidence)) / (2 * samples))
+
+
+def betweenness_centrality(graph, samples=None, normalized=True, weighted=True,
+                           confidence=0.95, seed=None, max_workers=1, chunk_size=16):
+    """
+    Compute the betweenness centrality of every vertex of a Graph or
+    WeightedGraph with Brandes' Algorithm: how many shortest paths between
+    other vertices run through it, each pair splitting its share between its
+    shortest paths.
+
+    Exact betweenness runs a search from every vertex, O(V * E) in all (times
+    log V when weighted). Sampling runs from a random subset of the vertices
+    instead and scales the result up (Brandes and Pich), trading accuracy for
+    time: the error shrinks with the square root of the number of samples.
+
+    Parameters:
+    graph (Graph): The Graph or WeightedGraph.
+    samples (integer): The number of random source vertices, or None to run
+        from every vertex for the exact result.
+    normalized (boolean): Divide by (V - 1)(V - 2), the number of ordered
+        pairs of other vertices, so scores lie between 0 and 1.
+    weighted (boolean): Use the edge weights of a WeightedGraph, with
+        Dijkstra's Algorithm. Otherwise every edge counts as 1.
+    confidence (number): The probability with which the error bound holds.
+    seed (integer): Seeds the choice of samples.
+    max_workers (integer): The number of worker processes to share the
+        sources between, or None for one per core. With 1, everything runs in
+        this process.
+    chunk_size (integer): The number of sources handed to a worker at once.
+
+    Returns:
+    tuple(dict, number): Vertex id -> betweenness, and a bound on the error of
+    every score (in the same units) that holds with probability `confidence`;
+    0 for the exact result.
+
+    Raises:
+    ValueError: For a negative edge weight or a non-positive sample count.
+    """
+    csr = graph.to_csr()
+    vertex_count = len(csr)
+    weighted = _check_weights(csr, weighted)
+    sources = _pick_sources(vertex_count, samples, seed)
+
+    totals = array(SCORE_TYPECODE, [0.0]) * vertex_count
+    task = partial(_betweenness_chunk, weighted=weighted)
+    for chunk_totals in _map_chunks(graph, csr, sources, task, max_workers, chunk_size):
+        totals = array(SCORE_TYPECODE, map(add, totals, chunk_totals))
+
+    # a source's dependency on any vertex is at most V - 2, so each sampled
+    # value of V * dependency / ((V - 1)(V - 2)) lies in [0, V / (V - 1)]
+    pairs = (vertex_count - 1) * (vertex_count - 2)
+    error = 0.0
+    if pairs > 0:
+        error = sampling_error(vertex_count, len(sources), confidence) \
+            * vertex_count / (vertex_count - 1)
+    scale = vertex_count / len(sources) if sources else 0.0
+    if normalized and pairs > 0:
+        scale /= pairs
+    else:
+        # undirected paths were counted once from each end
+        halve = 1 if csr.is_directed else 2
+        scale /= halve
+        error *= pairs / halve
+    return dict(zip(csr.ids, [total * scale for total in totals])), error
+
+
+def closeness_centrality(graph, samples=None, weighted=True, confidence=0.95,
+                         seed=None, max_workers=1, chunk_size=16):
+    """
+    Compute the closeness centrality of every vertex of a Graph or
+    WeightedGraph: the inverse of the average distance to it from the
+    vertices that can reach it, scaled by the fraction of vertices that can
+    (Wasserman and Faust), so vertices of small components rank lower.
+
+    Exact closeness runs a search from every vertex. Sampling runs from a
+    random subset instead and averages the distances from those (Eppstein
+    and Wang).
+
+    Parameters:
+    graph (Graph): The Graph or WeightedGraph. For directed graphs, distances
+        are measured along edge directions, towards each vertex.
+    samples (integer): The number of random source vertices, or None to run
+        from every vertex for the exact result.
+    weighted (boolean): Use the edge weights of a WeightedGraph. Otherwise
+        distances count edges.
+    confidence (number): The probability with which the error bound holds.
+    seed (integer): Seeds the choice of samples.
+    max_workers (integer): The number of worker processes, or None for one per
+        core. With 1, everything runs in this process.
+    chunk_size (integer): The number of sources handed to a worker at once.
+
+    Returns:
+    tuple(dict, number): Vertex id -> closeness (0 for vertices no other
+    vertex reaches), and a bound on the error of the estimated average
+    distance to every vertex, which holds with probability `confidence` for
+    connected graphs; 0 for the exact result.
+
+    Raises:
+    ValueError: For a negative edge weight or a non-positive sample count.
+    """
+    csr = graph.to_csr()
+    vertex_count = len(csr)
+    weighted = _check_weights(csr, weighted)
+    sources = _pick_sources(vertex_count, samples, seed)
+
+    farness = array(SCORE_TYPECODE, [0.0]) * vertex_count
+    reached = array('q', [0]) * vertex_count
+    longest = 0
+    task = partial(_closeness_chunk, weighted=weighted)
+    for chunk in _map_chunks(graph, csr, sources, task, max_workers, chunk_size):
+        chunk_farness, chunk_reached, chunk_longest = chunk
+        farness = array(SCORE_TYPECODE, map(add, farness, chunk_farness))
+        reached = array('q', map(add, reached, chunk_reached))
+        longest = max(longest, chunk_longest)
+
+    is_source = bytearray(vertex_count)
+    for source in sources:
+        is_source[source] = 1
+    closeness = []
+    for vertex in range(vertex_count):
+        if farness[vertex] == 0:
+            closeness.append(0.0)
+            continue
+        other_sources = len(sources) - is_source[vertex]
+        closeness.append(reached[vertex] / farness[vertex]
+                         * reached[vertex] / other_sources)
+
+    error = 0.0
+    if vertex_count > 1:
+        error = sampling_error(vertex_count, len(sources), confidence) * longest
+    return dict(zip(csr.ids, closeness)), error
@@ -0,0 +1,221 @@
+from array import array
+from heapq import heappop, heappush
+
+UNCOLORED = -1
+COLOR_TYPECODE = 'i'
+
+STRATEGIES = ('insertion', 'largest_first', 'smallest_last', 'dsatur')
+
+
+def _neighbor_rows(csr):
+    """Return the (offsets, targets) pairs whose rows together hold every
+    vertex's neighbors, ignoring edge direction."""
+    rows = [(csr.offsets, csr.targets)]
+    if csr.is_directed:
+        reverse = csr.transpose()
+        rows.append((reverse.offsets, reverse.targets))
+    return rows
+
+
+def _degrees(csr, rows):
+    return array('q', (sum(offsets[v + 1] - offsets[v] for offsets, _ in rows)
+                       for v in range(len(csr))))
+
+
+def _largest_first_order(degrees):
+    """Welsh-Powell: vertices by decreasing degree, ties in index order. A
+    counting sort keeps it linear."""
+    buckets = [[] for _ in range(max(degrees, default=0) + 1)]
+    for vertex, degree in enumerate(degrees):
+        buckets[degree].append(vertex)
+    return [vertex for bucket in reversed(buckets) for vertex in bucket]
+
+
+def _smallest_last_order(degrees, rows):
+    """
+    Matula-Beck: repeatedly remove a vertex of minimum remaining degree and
+    color in the reverse removal order. Buckets of vertices by remaining
+    degree, with stale entries skipped, make it O(V + E).
+    """
+    vertex_count = len(degrees)
+    remaining = array('q', degrees)
+    removed = bytearray(vertex_count)
+    buckets = [[] for _ in range(max(degrees, default=0) + 1)]
+    for vertex in reversed(range(vertex_count)):
+        buckets[remaining[vertex]].append(vertex)
+
+    order = []
+    lowest = 0
+    while len(order) < vertex_count:
+        bucket = buckets[lowest]
+        if not bucket:
+            lowest += 1
+            continue
+        vertex = bucket.pop()
+        if removed[vertex] or remaining[vertex] != lowest:
+            continue  # stale entry
+        removed[vertex] = 1
+        order.append(vertex)
+        for offsets, targets in rows:
+            for neighbor in targets[offsets[vertex]:offsets[vertex + 1]]:
+                if not removed[neighbor]:
+                    remaining[neighbor] -= 1
+                    buckets[remaining[neighbor]].append(neighbor)
+                    if remaining[neighbor] < lowest:
+                        lowest = remaining[neighbor]
+    order.reverse()
+    return order
+
+
+def _color_in_order(order, rows, colors, max_degree):
+    """Give each vertex in turn the smallest color none of its neighbors has."""
+    # used[c] == vertex marks color c as taken around `vertex`, so the array
+    # is reused for every vertex without clearing it
+    used = array('q', [UNCOLORED]) * (max_degree + 2)
+    color_count = 0
+    for vertex in order:
+        for offsets, targets in rows:
+            for neighbor in targets[offsets[vertex]:offsets[vertex + 1]]:
+                if colors[neighbor] != UNCOLORED:
+                    used[colors[neighbor]] = vertex
+        color = 0
+        while used[color] == vertex:
+            color += 1
+        colors[vertex] = color
+        if color >= color_count:
+            color_count = color + 1
+    return color_count
+
+
+def _dsatur(rows, degrees, colors, max_degree):
+    """
+    DSatur: always color the uncolored vertex with the most distinct colors
+    among its neighbors (its saturation), breaking ties by higher degree,
+    then lower index. Vertices sit in one heap per saturation level, with
+    stale entries skipped, so each step is O(log V). The colors around each
+    vertex are kept as the set bits of one int per vertex.
+    """
+    vertex_count = len(degrees)
+    neighbor_colors = [0] * vertex_count  # bit c set: a neighbor has color c
+    saturation = array('q', [0]) * vertex_count
+    buckets = [[] for _ in range(max_degree + 1)]
+    buckets[0] = [(-degree, vertex) for vertex, degree in enumerate(degrees)]
+    buckets[0].sort()
+
+    highest = 0
+    color_count = 0
+    for _ in range(vertex_count):
+        while True:
+            bucket = buckets[highest]
+            if not bucket:
+                highest -= 1
+                continue
+            _, vertex = heappop(bucket)
+            if colors[vertex] == UNCOLORED and saturation[vertex] == highest:
+                break  # otherwise a stale entry
+
+        # the lowest clear bit is the smallest color no neighbor has
+        taken = neighbor_colors[vertex]
+        color = (~taken & (taken + 1)).bit_length() - 1
+        colors[vertex] = color
+        if color >= color_count:
+            color_count = color + 1
+
+        bit = 1 << color
+        for offsets, targets in rows:
+            for neighbor in targets[offsets[vertex]:offsets[vertex + 1]]:
+                if colors[neighbor] != UNCOLORED or neighbor_colors[neighbor] & bit:
+                    continue
+                neighbor_colors[neighbor] |= bit
+                saturation[neighbor] += 1
+                heappush(buckets[saturation[neighbor]], (-degrees[neighbor], neighbor))
+                if saturation[neighbor] > highest:
+                    highest = saturation[neighbor]
+    return color_count
+
+
+def greedy_coloring_csr(csr, strategy='insertion'):
+    """
+    Color the vertices of a CSRAdjacency so that no edge joins two vertices
+    of the same color, ignoring edge direction and self-loops.
+
+    Parameters:
+    csr (CSRAdjacency): The adjacency.
+    strategy (string): The order vertices are colored in: 'insertion' (index
+        order), 'largest_first' (Welsh-Powell), 'smallest_last' (degeneracy
+        order) or 'dsatur'.
+
+    Returns:
+    tuple(array, integer): The color 0..k-1 of every vertex index, and k.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f'Unknown coloring strategy {strategy!r}')
+
+    vertex_count = len(csr)
+    rows = _neighbor_rows(csr)
+    degrees = _degrees(csr, rows)
+    max_degree = max(degrees, default=0)
+    colors = array(COLOR_TYPECODE, [UNCOLORED]) * vertex_count
+
+    if strategy == 'dsatur':
+        return colors, _dsatur(rows, degrees, colors, max_degree)
+    if strategy == 'largest_first':
+        order = _largest_first_order(degrees)
+    elif strategy == 'smallest_last':
+        order = _smallest_last_order(degrees, rows)
+    else:
+        order = range(vertex_count)
+    return colors, _color_in_order(order, rows, colors, max_degree)
+
+
+def two_coloring_csr(csr):
+    """
+    Try to split the vertices of a CSRAdjacency into two sides with every
+    edge between the sides, ignoring edge direction. Breadth-first search
+    from the lowest unvisited index of every component puts the root on side
+    0 and alternates sides by level, in O(V + E).
+
+    Returns:
+    tuple(bytearray, list): The side (0 or 1) of every vertex index and None
+    if the graph is bipartite. Otherwise None and the vertex indices of an
+    odd cycle, in order around the cycle; it closes through the first edge
+    found between two vertices of the same BFS level, so it is at most twice
+    that level plus one long.
+    """
+    vertex_count = len(csr)
+    rows = _neighbor_rows(csr)
+    sides = bytearray(vertex_count)
+    seen = bytearray(vertex_count)
+    parents = array('q', range(vertex_count))
+
+    for root in range(vertex_count):
+        if seen[root]:
+            continue
+        seen[root] = 1
+        frontier = [root]
+        while frontier:
+            next_frontier = []
+            for vertex in frontier:
+                side = sides[vertex]
+                for offsets, targets in rows:
+                    for neighbor in targets[offsets[vertex]:offsets[vertex + 1]]:
+                        if not seen[neighbor]:
+                            seen[neighbor] = 1
+                            sides[neighbor] = 1 - side
+                            parents[neighbor] = vertex
+                            next_frontier.append(neighbor)
+                        elif sides[neighbor] == side:
+                            return None, _odd_cycle(parents, vertex, neighbor)
+            frontier = next_frontier
+    return sides, None
+
+
+def _odd_cycle(parents, vertex, neighbor):
+    """Close the cycle of the edge vertex-neighbor through the BFS tree, where
+    both vertices are on the same level."""
+    up_from_vertex, up_from_neighbor = [vertex], [neighbor]
+    while up_from_vertex[-1] != up_from_neighbor[-1]:
+        up_from_vertex.append(parents[up_from_vertex[-1]])
+        up_from_neighbor.append(parents[up_from_neighbor[-1]])
+    up_from_vertex.reverse()  # from the common ancestor down to vertex
+    return up_from_vertex + up_from_neighbor[:-1]
@@ -0,0 +1,231 @@
+from graphs.csr import CSRAdjacency
+from graphs.frontier import direction_optimizing_levels, new_parent_array
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+
+
+class CompactVertex(object):
+    """
+    A lightweight view of a single vertex stored in a CSRAdjacency.
+
+    Compact vertices are created on demand and hold only a reference to the
+    adjacency and their integer index, so they cost nothing while unused.
+    """
+
+    __slots__ = ('__csr', '__index')
+
+    def __init__(self, csr, index):
+        """
+        Initialize a view of vertex `index` of `csr`.
+
+        Parameters:
+        csr (CSRAdjacency): The adjacency holding the vertex.
+        index (integer): The dense index of the vertex.
+        """
+        self.__csr = csr
+        self.__index = index
+
+    def __str__(self):
+        """Output the list of neighbors of this vertex."""
+        ids = self.__csr.ids
+        neighbor_ids = [ids[i] for i in self.__csr.neighbors(self.__index)]
+        return f'{self.get_id()} adjacent to {neighbor_ids}'
+
+    def __repr__(self):
+        """Output the list of neighbors of this vertex."""
+        return self.__str__()
+
+    def __eq__(self, other):
+        return (isinstance(other, CompactVertex)
+                and self.__csr is other.__csr and self.__index == other.__index)
+
+    def __hash__(self):
+        return hash((id(self.__csr), self.__index))
+
+    def get_index(self):
+        """Return the dense integer index of this vertex."""
+        return self.__index
+
+    def get_id(self):
+        """Return the id of this vertex."""
+        return self.__csr.ids[self.__index]
+
+    def get_neighbors(self):
+        """Return the neighbors of this vertex."""
+        csr = self.__csr
+        return [CompactVertex(csr, i) for i in csr.neighbors(self.__index)]
+
+    def get_neighbors_with_weights(self):
+        """Return the neighbors of this vertex as (vertex, weight) tuples."""
+        csr = self.__csr
+        return [(CompactVertex(csr, i), weight) for i, weight in zip(
+            csr.neighbors(self.__index), csr.neighbor_weights(self.__index))]
+
+    def iter_neighbors(self):
+        """Iterate over the neighbors of this vertex."""
+        csr = self.__csr
+        return (CompactVertex(csr, i) for i in csr.neighbors(self.__index))
+
+    def iter_neighbor_ids(self):
+        """Iterate over the ids of this vertex's neighbors."""
+        ids = self.__csr.ids
+        return (ids[i] for i in self.__csr.neighbors(self.__index))
+
+    def iter_neighbors_with_weights(self):
+        """Iterate over (neighbor, weight) tuples."""
+        csr = self.__csr
+        return ((CompactVertex(csr, i), weight) for i, weight in zip(
+            csr.neighbors(self.__index), csr.neighbor_weights(self.__index)))
+
+    def iter_neighbor_ids_with_weights(self):
+        """Iterate over (neighbor id, weight) tuples."""
+        csr = self.__csr
+        ids = csr.ids
+        return ((ids[i], weight) for i, weight in zip(
+            csr.neighbors(self.__index), csr.neighbor_weights(self.__index)))
+
+
+class CompactStorage(object):
+    """
+    Mixin replacing a graph's per-vertex dictionaries with a frozen
+    CSRAdjacency. The vertex lookups that the graph algorithms rely on are
+    answered from the flat arrays, while mutation raises a TypeError.
+    """
+
+    def __init__(self, csr):
+        """
+        Initialize a frozen graph backed by `csr`.
+
+        Parameters:
+        csr (CSRAdjacency): The adjacency to serve vertices from.
+        """
+        super().__init__(is_directed=csr.is_directed)
+        self.__csr = csr
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Return a frozen copy of `graph`."""
+        return cls(CSRAdjacency.from_graph(graph))
+
+    def add_vertex(self, vertex_id):
+        raise TypeError(f'{type(self).__name__} is read-only')
+
+    def add_edge(self, vertex_id1, vertex_id2, weight=None):
+        raise TypeError(f'{type(self).__name__} is read-only')
+
+    def add_vertices_from(self, vertex_ids):
+        raise TypeError(f'{type(self).__name__} is read-only')
+
+    def add_edges_from(self, edges, build_reverse=False, pause_gc=False):
+        raise TypeError(f'{type(self).__name__} is read-only')
+
+    def remove_edge(self, vertex_id1, vertex_id2):
+        raise TypeError(f'{type(self).__name__} is read-only')
+
+    def remove_vertex(self, vertex_id):
+        raise TypeError(f'{type(self).__name__} is read-only')
+
+    def get_vertex(self, vertex_id):
+        """Return the vertex if it exists."""
+        index = self.__csr.index.get(vertex_id)
+        if index is None:
+            return None
+        return CompactVertex(self.__csr, index)
+
+    def get_vertices(self):
+        """Return all vertices in the graph."""
+        csr = self.__csr
+        return [CompactVertex(csr, i) for i in range(len(csr))]
+
+    def get_vertex_ids(self):
+        """Return the ids of all vertices in the graph."""
+        return list(self.__csr.ids)
+
+    def get_edge_count(self):
+        """Return the number of edges, counting each undirected edge once."""
+        csr = self.__csr
+        if csr.is_directed:
+            return csr.edge_count()
+        loops = sum(1 for i in range(len(csr)) if i in csr.neighbors(i))
+        return (csr.edge_count() + loops) // 2
+
+    def contains_id(self, vertex_id):
+        return vertex_id in self.__csr.index
+
+    def is_directed_graph(self):
+        """Return True if the graph is directed."""
+        return self.__csr.is_directed
+
+    def to_csr(self):
+        """Return the CSRAdjacency backing this graph (no copy is made)."""
+        return self.__csr
+
+    def get_out_degree(self, vertex_id):
+        """Return the number of edges out of vertex_id."""
+        csr = self.__csr
+        index = csr.index[vertex_id]
+        return csr.offsets[index + 1] - csr.offsets[index]
+
+    def get_predecessor_ids(self, vertex_id):
+        """Return the ids of the vertices with an edge into vertex_id."""
+        reverse = self.__csr.transpose()
+        ids = reverse.ids
+        return [ids[i] for i in reverse.neighbors(reverse.index[vertex_id])]
+
+    def get_predecessor_ids_with_weights(self, vertex_id):
+        """Return (predecessor id, weight) tuples for the edges into vertex_id."""
+        reverse = self.__csr.transpose()
+        ids = reverse.ids
+        index = reverse.index[vertex_id]
+        return [(ids[i], weight) for i, weight in
+                zip(reverse.neighbors(index), reverse.neighbor_weights(index))]
+
+    def bfs_levels(self, start_id, parents=None):
+        """
+        Run a level-synchronous breadth-first search, one frontier at a time,
+        switching to bottom-up steps over the CSR arrays for large frontiers.
+        Takes the same parameters as `Graph.bfs_levels`.
+        """
+        csr = self.__csr
+        if start_id not in csr.index:
+            raise KeyError("One or both vertices are not in the graph!")
+        return self.__bfs_levels(csr.index[start_id], parents)
+
+    def __bfs_levels(self, source, parents):
+        ids = self.__csr.ids
+        parent_array = new_parent_array(len(ids))
+        for frontier in direction_optimizing_levels(self.__csr, source, parent_array):
+            if parents is not None:
+                for vertex in frontier:
+                    parent = parent_array[vertex]
+                    parents[ids[vertex]] = None if parent == vertex else ids[parent]
+            yield [ids[vertex] for vertex in frontier]
+
+
+class CompactGraph(CompactStorage, Graph):
+    """A frozen, memory-compact Graph."""
+
+
+class CompactWeightedGraph(CompactStorage, WeightedGraph):
+    """A frozen, memory-compact WeightedGraph."""
+
+
+def freeze(graph):
+    """
+    Return a frozen, memory-compact copy of a Graph or WeightedGraph.
+
+    Vertex ids are interned to dense integers and every edge is stored in flat
+    `array` buffers, so the copy costs a few bytes per edge instead of a
+    Python object per vertex and neighbor entry.
+
+    Parameters:
+    graph (Graph): The graph to freeze. Compact graphs are returned as-is.
+
+    Returns:
+    CompactGraph or CompactWeightedGraph: The frozen graph.
+    """
+    if isinstance(graph, CompactStorage):
+        return graph
+    if isinstance(graph, WeightedGraph):
+        return CompactWeightedGraph.from_graph(graph)
+    return CompactGraph.from_graph(graph)
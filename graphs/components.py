@@ -0,0 +1,131 @@
+from array import array
+
+UNLABELED = -1
+LABEL_TYPECODE = 'i'  # 32-bit, like CSRAdjacency vertex indices
+
+
+def _new_labels(vertex_count):
+    return array(LABEL_TYPECODE, [UNLABELED]) * vertex_count
+
+
+def weakly_connected_components(csr):
+    """
+    Label the connected components of a CSRAdjacency in O(V + E), ignoring
+    edge direction.
+
+    Components are numbered in order of their lowest vertex index, so the
+    labels only depend on the vertex order.
+
+    Returns:
+    tuple(array, array): The component label of every vertex index, and the
+    number of vertices in each component.
+    """
+    vertex_count = len(csr)
+    # directed edges are followed both ways, through the transpose
+    rows = [(csr.offsets, csr.targets)]
+    if csr.is_directed:
+        reverse = csr.transpose()
+        rows.append((reverse.offsets, reverse.targets))
+
+    labels = _new_labels(vertex_count)
+    sizes = array('q')
+    for root in range(vertex_count):
+        if labels[root] != UNLABELED:
+            continue
+        label = len(sizes)
+        labels[root] = label
+        stack = [root]
+        size = 0
+        while stack:
+            vertex = stack.pop()
+            size += 1
+            for offsets, targets in rows:
+                for neighbor in targets[offsets[vertex]:offsets[vertex + 1]]:
+                    if labels[neighbor] == UNLABELED:
+                        labels[neighbor] = label
+                        stack.append(neighbor)
+        sizes.append(size)
+    return labels, sizes
+
+
+def strongly_connected_components(csr):
+    """
+    Label the strongly connected components of a CSRAdjacency in O(V + E)
+    with an iterative version of Tarjan's Algorithm, so deep graphs cannot
+    overflow the Python call stack.
+
+    Components are numbered in the order Tarjan's Algorithm completes them,
+    starting from the lowest unvisited vertex index. That is a reverse
+    topological order: every edge between two components goes from a higher
+    label to a lower one.
+
+    Returns:
+    tuple(array, array): The component label of every vertex index, and the
+    number of vertices in each component.
+    """
+    vertex_count = len(csr)
+    offsets, targets = csr.offsets, csr.targets
+    order = array('q', [UNLABELED]) * vertex_count  # discovery order
+    lowlink = array('q', [0]) * vertex_count
+    on_stack = bytearray(vertex_count)
+    labels = _new_labels(vertex_count)
+    sizes = array('q')
+
+    stack = []  # visited vertices not yet assigned to a component
+    discovered = 0
+    for root in range(vertex_count):
+        if order[root] != UNLABELED:
+            continue
+        order[root] = lowlink[root] = discovered
+        discovered += 1
+        stack.append(root)
+        on_stack[root] = 1
+        # the simulated call stack: (vertex, position of its next edge)
+        calls = [(root, offsets[root])]
+
+        while calls:
+            vertex, edge = calls[-1]
+            end = offsets[vertex + 1]
+            while edge < end:
+                neighbor = targets[edge]
+                edge += 1
+                if order[neighbor] == UNLABELED:
+                    calls[-1] = (vertex, edge)  # resume here after the call
+                    order[neighbor] = lowlink[neighbor] = discovered
+                    discovered += 1
+                    stack.append(neighbor)
+                    on_stack[neighbor] = 1
+                    calls.append((neighbor, offsets[neighbor]))
+                    break
+                if on_stack[neighbor] and order[neighbor] < lowlink[vertex]:
+                    lowlink[vertex] = order[neighbor]
+            else:
+                # every edge is done: return from the call
+                calls.pop()
+                if lowlink[vertex] == order[vertex]:
+                    label = len(sizes)
+                    size = 0
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        labels[member] = label
+                        size += 1
+                        if member == vertex:
+                            break
+                    sizes.append(size)
+                if calls:
+                    caller = calls[-1][0]
+                    if lowlink[vertex] < lowlink[caller]:
+                        lowlink[caller] = lowlink[vertex]
+    return labels, sizes
+
+
+def group_ids(ids, labels, sizes):
+    """
+    Return one list of vertex ids per component, in label order, with each
+    component's ids in vertex index order.
+    """
+    groups = [[] for _ in sizes]
+    for vertex_id, label in zip(ids, labels):
+        groups[label].append(vertex_id)
+    return groups
@@ -0,0 +1,337 @@
+import struct
+from array import array
+from heapq import heappop, heappush
+
+from graphs.shortest_paths import INFINITY, NO_VERTEX
+from util.binary_graph import (FLAG_DIRECTED, align, as_le_bytes, map_header,
+                               pack_ids, typed_view, unpack_ids, write_aligned,
+                               write_atomically)
+
+MAGIC = b'CHIX'
+VERSION = 1
+
+# magic, version, flags, vertex count, upward edge counts (forward, backward),
+# id table size in bytes
+HEADER = struct.Struct('<4sHHqqqq')
+
+# Witness searches give up after settling this many vertices. Stopping early
+# only adds shortcuts that were not strictly needed, never wrong answers.
+WITNESS_SETTLE_LIMIT = 64
+
+
+def _witness_distances(out_edges, source, excluded, max_distance):
+    """
+    Run a bounded Dijkstra from `source` over the remaining graph without
+    passing through `excluded`, returning the distances found so far. Every
+    distance is the length of a real path, so it is safe to use as a witness.
+    """
+    distances = {source: 0}
+    heap = [(0, source)]
+    settled = 0
+    while heap:
+        distance, vertex = heappop(heap)
+        if distance > distances[vertex]:
+            continue  # stale entry
+        if distance > max_distance or settled == WITNESS_SETTLE_LIMIT:
+            break
+        settled += 1
+        for neighbor, (weight, _) in out_edges[vertex].items():
+            if neighbor == excluded:
+                continue
+            new_distance = distance + weight
+            if new_distance < distances.get(neighbor, INFINITY):
+                distances[neighbor] = new_distance
+                heappush(heap, (new_distance, neighbor))
+    return distances
+
+
+def _needed_shortcuts(out_edges, in_edges, vertex):
+    """Return the (from, to, weight) shortcuts that contracting `vertex` needs."""
+    incoming, outgoing = in_edges[vertex], out_edges[vertex]
+    if not incoming or not outgoing:
+        return []
+
+    longest_out = max(weight for weight, _ in outgoing.values())
+    shortcuts = []
+    for source, (in_weight, _) in incoming.items():
+        witnesses = _witness_distances(out_edges, source, vertex, in_weight + longest_out)
+        for target, (out_weight, _) in outgoing.items():
+            if target == source:
+                continue
+            via = in_weight + out_weight
+            if witnesses.get(target, INFINITY) > via:
+                shortcuts.append((source, target, via))
+    return shortcuts
+
+
+def _upward_arrays(upward_edges):
+    """Pack per-vertex {neighbor: (weight, middle)} dicts into CSR arrays."""
+    offsets, targets, weights, middles = array('q', [0]), array('i'), array('d'), array('i')
+    for edges in upward_edges:
+        for neighbor, (weight, middle) in edges.items():
+            targets.append(neighbor)
+            weights.append(weight)
+            middles.append(middle)
+        offsets.append(len(targets))
+    return offsets, targets, weights, middles
+
+
+class ContractionHierarchy(object):
+    """
+    A contraction hierarchy index over a static WeightedGraph, answering
+    shortest path queries with two small upward searches.
+
+    Preprocessing contracts the vertices one at a time, least important
+    first, adding a shortcut edge u -> w whenever removing v would destroy
+    the only shortest path u -> v -> w. A query then only needs a forward
+    search from the start and a backward search from the target that both
+    climb towards more important vertices, and they meet at the most
+    important vertex of a shortest path. Shortcuts remember the vertex they
+    bypass, so paths can be unpacked into original edges.
+    """
+
+    def __init__(self, vertex_ids, rank, forward, backward, is_directed):
+        """
+        Parameters:
+        vertex_ids (list): Vertex ids, where `vertex_ids[i]` has index `i`.
+        rank (array): The contraction order position of every vertex index.
+        forward (tuple): The (offsets, targets, weights, middles) arrays of the
+            edges to higher ranked vertices. `middles` holds the vertex a
+            shortcut bypasses, or NO_VERTEX for an original edge.
+        backward (tuple): The same arrays for the reversed edges from higher
+            ranked vertices.
+        is_directed (boolean): Whether the indexed graph is directed.
+        """
+        self.vertex_ids = vertex_ids
+        self.index = {vertex_id: i for i, vertex_id in enumerate(vertex_ids)}
+        self.rank = rank
+        self.forward = forward
+        self.backward = backward
+        self.is_directed = is_directed
+
+    @classmethod
+    def build(cls, graph):
+        """
+        Contract every vertex of a graph to build its hierarchy.
+
+        Vertices are ordered by a lazily updated priority: the number of
+        shortcuts contracting them would add minus the edges it would remove,
+        plus how many of their neighbors are already contracted, which keeps
+        the contraction spread evenly over the graph.
+
+        Parameters:
+        graph (WeightedGraph): The graph to index. Edge weights must not be
+            negative, and later changes to the graph are not reflected.
+
+        Returns:
+        ContractionHierarchy: The index.
+
+        Raises:
+        ValueError: If the graph has a negative edge weight.
+        """
+        csr = graph.to_csr()
+        vertex_count = len(csr)
+        # the remaining graph: vertex -> {neighbor: (weight, bypassed vertex)}
+        out_edges = [{} for _ in range(vertex_count)]
+        in_edges = [{} for _ in range(vertex_count)]
+        for vertex in range(vertex_count):
+            for neighbor, weight in zip(csr.neighbors(vertex), csr.neighbor_weights(vertex)):
+                if weight < 0:
+                    raise ValueError('Contraction hierarchies need non-negative weights')
+                if neighbor == vertex:
+                    continue
+                if weight < out_edges[vertex].get(neighbor, (INFINITY,))[0]:
+                    out_edges[vertex][neighbor] = (weight, NO_VERTEX)
+                    in_edges[neighbor][vertex] = (weight, NO_VERTEX)
+
+        contracted_neighbors = [0] * vertex_count
+
+        def priority(vertex):
+            shortcuts = _needed_shortcuts(out_edges, in_edges, vertex)
+            return (len(shortcuts) - len(out_edges[vertex]) - len(in_edges[vertex])
+                    + contracted_neighbors[vertex]), shortcuts
+
+        priorities = [priority(vertex)[0] for vertex in range(vertex_count)]
+        heap = sorted(zip(priorities, range(vertex_count)))
+        rank = array('q', [0]) * vertex_count
+        upward_out, upward_in = [None] * vertex_count, [None] * vertex_count
+        next_rank = 0
+        while heap:
+            queued, vertex = heappop(heap)
+            if upward_out[vertex] is not None or queued != priorities[vertex]:
+                continue  # stale entry
+            current, shortcuts = priority(vertex)
+            if heap and current > heap[0][0]:
+                priorities[vertex] = current  # no longer the least important
+                heappush(heap, (current, vertex))
+                continue
+
+            rank[vertex] = next_rank
+            next_rank += 1
+            upward_out[vertex], upward_in[vertex] = out_edges[vertex], in_edges[vertex]
+            out_edges[vertex], in_edges[vertex] = {}, {}
+            for neighbor in upward_out[vertex]:
+                del in_edges[neighbor][vertex]
+                contracted_neighbors[neighbor] += 1
+            for neighbor in upward_in[vertex]:
+                del out_edges[neighbor][vertex]
+                contracted_neighbors[neighbor] += 1
+            for source, target, weight in shortcuts:
+                if weight < out_edges[source].get(target, (INFINITY,))[0]:
+                    out_edges[source][target] = (weight, vertex)
+                    in_edges[target][source] = (weight, vertex)
+
+        return cls(csr.ids, rank, _upward_arrays(upward_out), _upward_arrays(upward_in),
+                   csr.is_directed)
+
+    def _search(self, start, target):
+        """
+        Run the bidirectional upward search between two vertex indices.
+
+        Returns:
+        tuple: The distance, the index of the vertex where the searches met
+        (NO_VERTEX if they did not) and the forward and backward parent maps.
+        """
+        # per side: upward edge arrays, distances, parents, heap
+        forward = (self.forward, {start: 0}, {start: NO_VERTEX}, [(0, start)])
+        backward = (self.backward, {target: 0}, {target: NO_VERTEX}, [(0, target)])
+        best_distance, meeting = INFINITY, NO_VERTEX
+
+        while forward[3] or backward[3]:
+            if not backward[3] or (forward[3] and forward[3][0][0] <= backward[3][0][0]):
+                side, other = forward, backward
+            else:
+                side, other = backward, forward
+            (offsets, targets, weights, _), distances, parents, heap = side
+
+            distance, vertex = heappop(heap)
+            if distance > distances[vertex]:
+                continue  # stale entry
+            if distance >= best_distance:
+                heap.clear()  # nothing left on this side can improve the path
+                continue
+            if vertex in other[1]:
+                total = distance + other[1][vertex]
+                if total < best_distance:
+                    best_distance, meeting = total, vertex
+
+            for edge in range(offsets[vertex], offsets[vertex + 1]):
+                neighbor = targets[edge]
+                new_distance = distance + weights[edge]
+                if new_distance < distances.get(neighbor, INFINITY):
+                    distances[neighbor] = new_distance
+                    parents[neighbor] = vertex
+                    heappush(heap, (new_distance, neighbor))
+
+        return best_distance, meeting, forward[2], backward[2]
+
+    def _middle(self, vertex, neighbor):
+        """Return the vertex bypassed by the edge vertex -> neighbor, if any."""
+        if self.rank[vertex] < self.rank[neighbor]:
+            (offsets, targets, _, middles), row, other = self.forward, vertex, neighbor
+        else:
+            (offsets, targets, _, middles), row, other = self.backward, neighbor, vertex
+        for edge in range(offsets[row], offsets[row + 1]):
+            if targets[edge] == other:
+                return middles[edge]
+        raise ValueError('Contraction hierarchy index is inconsistent')
+
+    def _indices(self, start_id, target_id):
+        if start_id not in self.index or target_id not in self.index:
+            raise KeyError("One or both vertices are not in the graph!")
+        return self.index[start_id], self.index[target_id]
+
+    def get_distance(self, start_id, target_id):
+        """
+        Return the length of the shortest path from start_id to target_id, or
+        INFINITY if the target cannot be reached.
+        """
+        return self._search(*self._indices(start_id, target_id))[0]
+
+    def find_shortest_path(self, start_id, target_id):
+        """
+        Find the shortest path from a start vertex to a destination, with
+        every shortcut unpacked into the original edges.
+
+        Returns:
+        tuple(number, list<string>): The total weight of the shortest path and
+        the vertex ids along it, from start to end. If the target cannot be
+        reached, returns (INFINITY, None), like WeightedGraph.find_shortest_path.
+        """
+        start, target = self._indices(start_id, target_id)
+        distance, meeting, forward_parents, backward_parents = self._search(start, target)
+        if meeting == NO_VERTEX:  # path not found
+            return INFINITY, None
+
+        # the path in the hierarchy, start -> meeting -> target
+        hops = [meeting]
+        while forward_parents[hops[-1]] != NO_VERTEX:
+            hops.append(forward_parents[hops[-1]])
+        hops.reverse()
+        while backward_parents[hops[-1]] != NO_VERTEX:
+            hops.append(backward_parents[hops[-1]])
+
+        path = [start]
+        for vertex, neighbor in zip(hops, hops[1:]):
+            stack = [(vertex, neighbor)]
+            while stack:
+                edge_start, edge_end = stack.pop()
+                middle = self._middle(edge_start, edge_end)
+                if middle == NO_VERTEX:
+                    path.append(edge_end)
+                else:
+                    stack.append((middle, edge_end))
+                    stack.append((edge_start, middle))
+        return distance, [self.vertex_ids[i] for i in path]
+
+    def save(self, filename):
+        """
+        Write the index to a binary file that `ContractionHierarchy.load` maps
+        back into memory.
+
+        The file holds a fixed header, the vertex id table, the ranks (int64),
+        then the forward and the backward upward edges, each as offsets
+        (int64), targets (int32), weights (float64) and bypassed vertices
+        (int32), every section 8-byte aligned and little-endian.
+        """
+        id_flags, id_table = pack_ids(self.vertex_ids)
+        flags = id_flags | (FLAG_DIRECTED if self.is_directed else 0)
+
+        with write_atomically(filename) as f:
+            f.write(HEADER.pack(MAGIC, VERSION, flags, len(self.vertex_ids),
+                                len(self.forward[1]), len(self.backward[1]),
+                                len(id_table)))
+            write_aligned(f, id_table)
+            write_aligned(f, as_le_bytes(self.rank, 'q'))
+            for offsets, targets, weights, middles in (self.forward, self.backward):
+                write_aligned(f, as_le_bytes(offsets, 'q'))
+                write_aligned(f, as_le_bytes(targets, 'i'))
+                write_aligned(f, as_le_bytes(weights, 'd'))
+                write_aligned(f, as_le_bytes(middles, 'i'))
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Load an index saved by `save`. The arrays are used in place from a
+        read-only memory map.
+
+        Raises:
+        ValueError: If the file is not an index file of a supported version.
+        """
+        buffer, (flags, vertex_count, forward_count, backward_count, id_bytes) = \
+            map_header(filename, HEADER, MAGIC, VERSION, 'contraction hierarchy')
+
+        position = align(HEADER.size)
+        vertex_ids = unpack_ids(buffer[position:position + id_bytes], vertex_count, flags)
+        position = align(position + id_bytes)
+        rank, position = typed_view(buffer, position, vertex_count, 'q')
+
+        sides = []
+        for edge_count in (forward_count, backward_count):
+            offsets, position = typed_view(buffer, position, vertex_count + 1, 'q')
+            targets, position = typed_view(buffer, position, edge_count, 'i')
+            weights, position = typed_view(buffer, position, edge_count, 'd')
+            middles, position = typed_view(buffer, position, edge_count, 'i')
+            sides.append((offsets, targets, weights, middles))
+
+        return cls(vertex_ids, rank, sides[0], sides[1], bool(flags & FLAG_DIRECTED))
@@ -0,0 +1,147 @@
+from array import array
+
+
+class CSRAdjacency(object):
+    """
+    Compressed sparse row (CSR) adjacency for a graph.
+
+    Vertex ids are interned to dense integer indices 0..n-1. The neighbors of
+    the vertex with index `i` are `targets[offsets[i]:offsets[i + 1]]`, and the
+    matching edge weights (for weighted graphs) live in the same slice of
+    `weights`.
+    """
+
+    OFFSET_TYPECODE = 'q'  # 64-bit, edge counts can exceed 2**31
+    TARGET_TYPECODE = 'i'  # 32-bit vertex indices
+    WEIGHT_TYPECODE = 'd'
+
+    def __init__(self, ids, offsets, targets, weights=None, is_directed=True):
+        """
+        Initialize the adjacency from already-built buffers.
+
+        Parameters:
+        ids (list): Vertex ids, where `ids[i]` is the id of vertex index `i`.
+        offsets (sequence<int>): `len(ids) + 1` row offsets into `targets`.
+        targets (sequence<int>): Neighbor indices for every row, concatenated.
+        weights (sequence<float>): Edge weights parallel to `targets`, or None
+            for an unweighted graph.
+        is_directed (boolean): Whether the edges go in only one direction.
+        """
+        self.ids = ids
+        self.index = {vertex_id: i for i, vertex_id in enumerate(ids)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.is_directed = is_directed
+        self.__transpose = None
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Build the adjacency of a Graph or WeightedGraph.
+
+        Parameters:
+        graph (Graph): The graph to convert. It is not modified.
+
+        Returns:
+        CSRAdjacency: The adjacency of `graph`, with vertex indices assigned in
+        the order returned by `graph.get_vertices()`.
+        """
+        # imported here, as graphs.graph imports this module
+        from graphs.weighted_graph import WeightedGraph
+
+        vertices = graph.get_vertices()
+        ids = [vertex.get_id() for vertex in vertices]
+        index = {vertex_id: i for i, vertex_id in enumerate(ids)}
+        is_weighted = isinstance(graph, WeightedGraph)
+
+        offsets = array(cls.OFFSET_TYPECODE, [0])
+        targets = array(cls.TARGET_TYPECODE)
+        weights = array(cls.WEIGHT_TYPECODE) if is_weighted else None
+
+        for vertex in vertices:
+            if is_weighted:
+                for neighbor_id, weight in vertex.iter_neighbor_ids_with_weights():
+                    targets.append(index[neighbor_id])
+                    weights.append(weight)
+            else:
+                for neighbor_id in vertex.iter_neighbor_ids():
+                    targets.append(index[neighbor_id])
+            offsets.append(len(targets))
+
+        return cls(ids, offsets, targets, weights, graph.is_directed_graph())
+
+    def __len__(self):
+        """Return the number of vertices."""
+        return len(self.ids)
+
+    def edge_count(self):
+        """Return the number of stored (directed) edges."""
+        return len(self.targets)
+
+    def is_weighted(self):
+        """Return True if the adjacency stores edge weights."""
+        return self.weights is not None
+
+    def degree(self, index):
+        """Return the number of neighbors of the vertex with the given index."""
+        return self.offsets[index + 1] - self.offsets[index]
+
+    def neighbors(self, index):
+        """Return the neighbor indices of the vertex with the given index."""
+        return self.targets[self.offsets[index]:self.offsets[index + 1]]
+
+    def neighbor_weights(self, index):
+        """
+        Return the edge weights parallel to `neighbors(index)`. Unweighted
+        adjacencies report a weight of 1 for every edge.
+        """
+        start, end = self.offsets[index], self.offsets[index + 1]
+        if self.weights is None:
+            return [1] * (end - start)
+        return self.weights[start:end]
+
+    def transpose(self):
+        """
+        Return the adjacency with every edge reversed, sharing the id table.
+        Undirected adjacencies are their own transpose. The result is cached.
+        """
+        if not self.is_directed:
+            return self
+        if self.__transpose is not None:
+            return self.__transpose
+
+        vertex_count = len(self.ids)
+        in_degrees = [0] * (vertex_count + 1)
+        for target in self.targets:
+            in_degrees[target + 1] += 1
+
+        offsets = array(self.OFFSET_TYPECODE, [0]) * (vertex_count + 1)
+        for i in range(vertex_count):
+            offsets[i + 1] = offsets[i] + in_degrees[i + 1]
+
+        next_slot = list(offsets[:vertex_count])
+        targets = array(self.TARGET_TYPECODE, [0]) * len(self.targets)
+        weights = None
+        if self.weights is not None:
+            weights = array(self.WEIGHT_TYPECODE, [0.0]) * len(self.targets)
+
+        for source in range(vertex_count):
+            for edge in range(self.offsets[source], self.offsets[source + 1]):
+                target = self.targets[edge]
+                slot = next_slot[target]
+                targets[slot] = source
+                if weights is not None:
+                    weights[slot] = self.weights[edge]
+                next_slot[target] = slot + 1
+
+        transposed = CSRAdjacency.__new__(CSRAdjacency)
+        transposed.ids = self.ids
+        transposed.index = self.index
+        transposed.offsets = offsets
+        transposed.targets = targets
+        transposed.weights = weights
+        transposed.is_directed = True
+        transposed.__transpose = self
+        self.__transpose = transposed
+        return transposed
@@ -0,0 +1,129 @@
+from array import array
+from collections import deque
+
+from graphs.shortest_paths import NO_VERTEX
+
+# Depth-first search colors: not seen yet, on the current path, finished
+WHITE, GRAY, BLACK = 0, 1, 2
+
+
+class CycleError(ValueError):
+    """
+    Raised when an operation needs an acyclic graph. `cycle` holds the vertex
+    ids of one offending cycle, in edge order: cycle[0] -> cycle[1] -> ... ->
+    cycle[-1] -> cycle[0].
+    """
+
+    def __init__(self, cycle):
+        path = ' -> '.join(map(str, cycle + cycle[:1]))
+        super().__init__(f'The graph contains a cycle: {path}')
+        self.cycle = cycle
+
+
+def _walk(csr, visit):
+    """
+    Run an iterative three-color depth-first search from every unvisited
+    vertex index in order.
+
+    `visit(vertex)` is called when a vertex finishes. The search stops at the
+    first back edge, that is an edge to a vertex still on the current path
+    (for undirected graphs, other than the edge back to the parent).
+
+    Returns:
+    list<integer>: The vertex indices of the cycle closed by the back edge,
+    or None if there is none.
+    """
+    vertex_count = len(csr)
+    offsets, targets = csr.offsets, csr.targets
+    ignore_parent = not csr.is_directed
+    color = bytearray(vertex_count)
+    parents = array('q', [NO_VERTEX]) * vertex_count
+
+    for root in range(vertex_count):
+        if color[root] != WHITE:
+            continue
+        color[root] = GRAY
+        # the simulated call stack: (vertex, position of its next edge)
+        calls = [(root, offsets[root])]
+        while calls:
+            vertex, edge = calls[-1]
+            end = offsets[vertex + 1]
+            while edge < end:
+                neighbor = targets[edge]
+                edge += 1
+                if color[neighbor] == WHITE:
+                    calls[-1] = (vertex, edge)
+                    color[neighbor] = GRAY
+                    parents[neighbor] = vertex
+                    calls.append((neighbor, offsets[neighbor]))
+                    break
+                if color[neighbor] == GRAY:
+                    if ignore_parent and neighbor == parents[vertex]:
+                        continue  # the undirected edge just walked down
+                    cycle = [vertex]
+                    while cycle[-1] != neighbor:
+                        cycle.append(parents[cycle[-1]])
+                    cycle.reverse()
+                    return cycle
+            else:
+                calls.pop()
+                color[vertex] = BLACK
+                visit(vertex)
+    return None
+
+
+def find_cycle_csr(csr):
+    """
+    Find a cycle in a CSRAdjacency in O(V + E), searching from every vertex.
+
+    Returns:
+    list<integer>: The vertex indices of a cycle in edge order, or None if
+    the graph is acyclic.
+    """
+    return _walk(csr, lambda vertex: None)
+
+
+def kahn_order_csr(csr):
+    """
+    Return a topological order of a directed CSRAdjacency by repeatedly
+    removing vertices with no incoming edges, taken first-in first-out from a
+    deque in vertex index order.
+
+    Raises:
+    CycleError: With the vertex indices of a cycle, if there is one.
+    """
+    vertex_count = len(csr)
+    offsets, targets = csr.offsets, csr.targets
+    in_degree = array('q', [0]) * vertex_count
+    for neighbor in targets:
+        in_degree[neighbor] += 1
+
+    ready = deque(vertex for vertex in range(vertex_count) if in_degree[vertex] == 0)
+    order = []
+    while ready:
+        vertex = ready.popleft()
+        order.append(vertex)
+        for neighbor in targets[offsets[vertex]:offsets[vertex + 1]]:
+            in_degree[neighbor] -= 1
+            if in_degree[neighbor] == 0:
+                ready.append(neighbor)
+
+    if len(order) < vertex_count:
+        raise CycleError(find_cycle_csr(csr))
+    return order
+
+
+def dfs_order_csr(csr):
+    """
+    Return a topological order of a directed CSRAdjacency as the reverse
+    depth-first finishing order.
+
+    Raises:
+    CycleError: With the vertex indices of a cycle, if there is one.
+    """
+    finished = []
+    cycle = _walk(csr, finished.append)
+    if cycle is not None:
+        raise CycleError(cycle)
+    finished.reverse()
+    return finished
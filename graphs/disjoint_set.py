@@ -0,0 +1,99 @@
+from array import array
+
+
+class DisjointSet(object):
+    """
+    Union-find over arbitrary hashable items.
+
+    Items are interned to dense integer indices and the parent pointers and
+    ranks live in flat arrays. `find` uses path halving and `union` uses union
+    by rank, so any sequence of operations runs in near-constant amortized time
+    per operation without recursion.
+    """
+
+    def __init__(self, items=()):
+        """
+        Initialize a disjoint set where every item is in its own set.
+
+        Parameters:
+        items (iterable): The initial items.
+        """
+        self.__index = {}  # item -> index
+        self.__items = []  # index -> item
+        self.__parent = array('q')
+        self.__rank = bytearray()
+        self.__set_count = 0
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        """Return the number of items."""
+        return len(self.__items)
+
+    def __contains__(self, item):
+        return item in self.__index
+
+    def get_set_count(self):
+        """Return the number of disjoint sets."""
+        return self.__set_count
+
+    def add(self, item):
+        """
+        Add an item in a set of its own. Adding an existing item does nothing.
+
+        Parameters:
+        item (hashable): The item to add.
+        """
+        if item in self.__index:
+            return
+        self.__index[item] = len(self.__items)
+        self.__parent.append(len(self.__items))
+        self.__rank.append(0)
+        self.__items.append(item)
+        self.__set_count += 1
+
+    def __find_index(self, index):
+        """Return the root index of `index`, halving the path on the way."""
+        parent = self.__parent
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def find(self, item):
+        """
+        Return the representative item of the set containing `item`.
+
+        Raises:
+        KeyError: If the item was never added.
+        """
+        return self.__items[self.__find_index(self.__index[item])]
+
+    def union(self, item1, item2):
+        """
+        Merge the sets containing `item1` and `item2`.
+
+        Returns:
+        boolean: True if the items were in different sets, False otherwise.
+
+        Raises:
+        KeyError: If either item was never added.
+        """
+        root1 = self.__find_index(self.__index[item1])
+        root2 = self.__find_index(self.__index[item2])
+        if root1 == root2:
+            return False
+
+        rank = self.__rank
+        if rank[root1] < rank[root2]:
+            root1, root2 = root2, root1
+        self.__parent[root2] = root1
+        if rank[root1] == rank[root2]:
+            rank[root1] += 1
+        self.__set_count -= 1
+        return True
+
+    def connected(self, item1, item2):
+        """Return True if `item1` and `item2` are in the same set."""
+        return (self.__find_index(self.__index[item1])
+                == self.__find_index(self.__index[item2]))
@@ -0,0 +1,160 @@
+from array import array
+
+from graphs.components import LABEL_TYPECODE
+
+
+class DynamicComponents(object):
+    """
+    Connected component labels of a graph that keeps changing, ignoring edge
+    direction.
+
+    Adding an edge between two components relabels the smaller one, so every
+    vertex is relabeled O(log V) times over any sequence of insertions.
+    Removing an edge runs two searches, one from each endpoint, a vertex at a
+    time in turn. They stop as soon as one reaches the other (the component
+    is still whole) or one runs out of vertices, which are then the part cut
+    off. Either way the work is bounded by the smaller side, not by the size
+    of the component.
+    """
+
+    def __init__(self, vertex_ids, neighbors):
+        """
+        Label the components of a graph from scratch in O(V + E).
+
+        Parameters:
+        vertex_ids (iterable): The ids of every vertex in the graph.
+        neighbors (function): Takes a vertex id and returns the ids of its
+            neighbors in the graph's current state, along both edge directions.
+        """
+        self.__neighbors = neighbors
+        self.__labels = {}  # vertex id -> label
+        self.__members = {}  # label -> set of vertex ids
+        self.__next_label = 0
+        for vertex_id in vertex_ids:
+            if vertex_id in self.__labels:
+                continue
+            label = self.__new_label()
+            members = self.__members[label] = {vertex_id}
+            self.__labels[vertex_id] = label
+            stack = [vertex_id]
+            while stack:
+                for neighbor_id in neighbors(stack.pop()):
+                    if neighbor_id not in members:
+                        members.add(neighbor_id)
+                        self.__labels[neighbor_id] = label
+                        stack.append(neighbor_id)
+
+    def __new_label(self):
+        label = self.__next_label
+        self.__next_label += 1
+        return label
+
+    def __len__(self):
+        """Return the number of vertices."""
+        return len(self.__labels)
+
+    def get_component_count(self):
+        """Return the number of connected components."""
+        return len(self.__members)
+
+    def get_label(self, vertex_id):
+        """
+        Return the label of the component containing vertex_id. Labels are
+        only stable until the next change to the graph.
+
+        Raises:
+        KeyError: If the vertex is not in the graph.
+        """
+        return self.__labels[vertex_id]
+
+    def connected(self, vertex_id1, vertex_id2):
+        """Return True if the two vertices are in the same component."""
+        return self.__labels[vertex_id1] == self.__labels[vertex_id2]
+
+    def add_vertex(self, vertex_id):
+        """Record a new vertex, in a component of its own."""
+        if vertex_id not in self.__labels:
+            label = self.__new_label()
+            self.__labels[vertex_id] = label
+            self.__members[label] = {vertex_id}
+
+    def add_edge(self, vertex_id1, vertex_id2):
+        """Record a new edge, merging the smaller component into the larger."""
+        labels = self.__labels
+        label1, label2 = labels[vertex_id1], labels[vertex_id2]
+        if label1 == label2:
+            return
+        if len(self.__members[label1]) < len(self.__members[label2]):
+            label1, label2 = label2, label1
+        moved = self.__members.pop(label2)
+        for vertex_id in moved:
+            labels[vertex_id] = label1
+        self.__members[label1] |= moved
+
+    def remove_edge(self, vertex_id1, vertex_id2):
+        """
+        Record that an edge is gone, after it was removed from the graph,
+        splitting its component if nothing else connects the two ends.
+        """
+        if vertex_id1 == vertex_id2:
+            return
+        neighbors = self.__neighbors
+        seen = ({vertex_id1}, {vertex_id2})
+        stacks = ([vertex_id1], [vertex_id2])
+        while True:
+            for side in (0, 1):
+                stack = stacks[side]
+                if not stack:
+                    # this side was explored completely without meeting the other
+                    self.__split_off(seen[side])
+                    return
+                own, other = seen[side], seen[1 - side]
+                for neighbor_id in neighbors(stack.pop()):
+                    if neighbor_id in other:
+                        return  # the ends are still connected
+                    if neighbor_id not in own:
+                        own.add(neighbor_id)
+                        stack.append(neighbor_id)
+
+    def __split_off(self, vertex_ids):
+        """Move a set of vertices out of their component into a new one."""
+        old_label = self.__labels[next(iter(vertex_ids))]
+        self.__members[old_label] -= vertex_ids
+        label = self.__new_label()
+        self.__members[label] = vertex_ids
+        for vertex_id in vertex_ids:
+            self.__labels[vertex_id] = label
+
+    def remove_vertex(self, vertex_id):
+        """
+        Forget a vertex, after it was removed from the graph. Its edges must
+        have been reported to remove_edge first.
+        """
+        label = self.__labels.pop(vertex_id)
+        members = self.__members[label]
+        members.discard(vertex_id)
+        if not members:
+            del self.__members[label]
+
+    def get_dense_labels(self, vertex_ids):
+        """
+        Renumber the components 0, 1, ... in order of their first vertex in
+        `vertex_ids`, like `graphs.components.weakly_connected_components`.
+
+        Parameters:
+        vertex_ids (iterable): Every vertex id of the graph, in index order.
+
+        Returns:
+        tuple(array, array): The component label of every vertex, in the order
+        of `vertex_ids`, and the number of vertices in each component.
+        """
+        dense = {}  # label -> dense label
+        labels = array(LABEL_TYPECODE)
+        sizes = array('q')
+        for vertex_id in vertex_ids:
+            label = self.__labels[vertex_id]
+            if label not in dense:
+                dense[label] = len(sizes)
+                sizes.append(len(self.__members[label]))
+            labels.append(dense[label])
+        return labels, sizes
@@ -0,0 +1,110 @@
+from array import array
+
+from graphs.shortest_paths import NO_VERTEX
+
+# Direction-optimizing BFS thresholds (Beamer et al.): switch to bottom-up once
+# the frontier's edges exceed 1/ALPHA of the unexplored edges, and back to
+# top-down once the frontier holds fewer than 1/BETA of the vertices.
+ALPHA = 14
+BETA = 24
+
+
+def top_down_levels(source, neighbors, parents):
+    """
+    Level-synchronous breadth-first search over hashable vertex ids.
+
+    Only parent pointers are stored, never whole paths; each level is
+    expanded in one pass into the next frontier.
+
+    Parameters:
+    source (hashable): The start vertex.
+    neighbors (function): Returns the neighbors of a vertex.
+    parents (dict): Filled with vertex -> parent vertex (None for the source)
+        for every vertex reached so far.
+
+    Yields:
+    list: Each frontier, starting with [source] at depth 0. When a frontier is
+    yielded, `parents` covers exactly the vertices at or above its depth.
+    """
+    parents[source] = None
+    frontier = [source]
+    while frontier:
+        yield frontier
+        next_frontier = []
+        for vertex in frontier:
+            for neighbor in neighbors(vertex):
+                if neighbor not in parents:
+                    parents[neighbor] = vertex
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+
+
+def direction_optimizing_levels(csr, source, parents, alpha=ALPHA, beta=BETA):
+    """
+    Level-synchronous breadth-first search over a CSRAdjacency that switches
+    between top-down and bottom-up steps.
+
+    Top-down steps scan the edges out of the frontier. When the frontier gets
+    large, a bottom-up step instead scans each unvisited vertex's incoming
+    edges and stops at the first parent found in the frontier, which touches
+    far fewer edges on low-diameter graphs.
+
+    Parameters:
+    csr (CSRAdjacency): The adjacency to search.
+    source (integer): The index of the start vertex.
+    parents (array): `len(csr)` entries set to NO_VERTEX, filled with the
+        parent index of every vertex reached (the source is its own parent).
+    alpha (number): Top-down to bottom-up switch threshold.
+    beta (number): Bottom-up to top-down switch threshold.
+
+    Yields:
+    list<integer>: Each frontier of vertex indices, starting with [source].
+    """
+    vertex_count = len(csr)
+    offsets, targets = csr.offsets, csr.targets
+    reverse = csr.transpose()
+    reverse_offsets, reverse_targets = reverse.offsets, reverse.targets
+
+    parents[source] = source
+    frontier = [source]
+    unexplored_edges = csr.edge_count() - csr.degree(source)
+    bottom_up = False
+
+    while frontier:
+        yield frontier
+
+        if bottom_up:
+            bottom_up = len(frontier) >= vertex_count / beta
+        else:
+            frontier_edges = sum(offsets[v + 1] - offsets[v] for v in frontier)
+            bottom_up = frontier_edges > unexplored_edges / alpha
+
+        next_frontier = []
+        if bottom_up:
+            in_frontier = bytearray(vertex_count)
+            for vertex in frontier:
+                in_frontier[vertex] = 1
+            for vertex in range(vertex_count):
+                if parents[vertex] != NO_VERTEX:
+                    continue
+                for edge in range(reverse_offsets[vertex], reverse_offsets[vertex + 1]):
+                    parent = reverse_targets[edge]
+                    if in_frontier[parent]:
+                        parents[vertex] = parent
+                        next_frontier.append(vertex)
+                        break
+        else:
+            for vertex in frontier:
+                for edge in range(offsets[vertex], offsets[vertex + 1]):
+                    neighbor = targets[edge]
+                    if parents[neighbor] == NO_VERTEX:
+                        parents[neighbor] = vertex
+                        next_frontier.append(neighbor)
+
+        unexplored_edges -= sum(offsets[v + 1] - offsets[v] for v in next_frontier)
+        frontier = next_frontier
+
+
+def new_parent_array(vertex_count):
+    """Return a parent array for `direction_optimizing_levels`."""
+    return array('q', [NO_VERTEX]) * vertex_count
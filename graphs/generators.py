@@ -0,0 +1,164 @@
+from math import isqrt, log
+from random import Random
+
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+
+
+def _new_graph(vertex_count, is_directed, weighted):
+    """Create a Graph or WeightedGraph with integer vertex ids 0..n-1."""
+    graph = WeightedGraph(is_directed) if weighted else Graph(is_directed)
+    graph.add_vertices_from(range(vertex_count))
+    return graph
+
+
+def _add_edge(graph, vertex_id1, vertex_id2, rng, weighted, weight_range):
+    if weighted:
+        graph.add_edge(vertex_id1, vertex_id2, rng.randint(*weight_range))
+    else:
+        graph.add_edge(vertex_id1, vertex_id2)
+
+
+def _with_weights(pairs, rng, weighted, weight_range):
+    """Yield the edges for add_edges_from, drawing a weight after each pair."""
+    if not weighted:
+        yield from pairs
+        return
+    for vertex_id1, vertex_id2 in pairs:
+        yield vertex_id1, vertex_id2, rng.randint(*weight_range)
+
+
+def _sample_indices(total, probability, rng):
+    """
+    Yield each index in range(total) independently with the given probability.
+
+    Skips ahead by geometrically distributed gaps, so the cost is proportional
+    to the number of indices produced rather than to `total`.
+    """
+    if probability <= 0:
+        return
+    if probability >= 1:
+        yield from range(total)
+        return
+    log_miss = log(1 - probability)
+    index = -1
+    while True:
+        index += 1 + int(log(1 - rng.random()) / log_miss)
+        if index >= total:
+            return
+        yield index
+
+
+def _random_pairs(vertex_count, probability, rng, ordered):
+    """
+    Yield each candidate pair of distinct vertices independently with the given
+    probability: every (i, j) if `ordered`, otherwise every {i, j} once as
+    (i, j) with i > j.
+    """
+    if ordered:
+        others = vertex_count - 1
+        for index in _sample_indices(vertex_count * others, probability, rng):
+            source, target = divmod(index, others)
+            yield source, target if target < source else target + 1
+    else:
+        total = vertex_count * (vertex_count - 1) // 2
+        for index in _sample_indices(total, probability, rng):
+            source = (1 + isqrt(1 + 8 * index)) // 2
+            yield source, index - source * (source - 1) // 2
+
+
+def erdos_renyi_graph(vertex_count, probability, seed=None, is_directed=False,
+                      weighted=False, weight_range=(1, 10)):
+    """
+    Return a G(n, p) random graph: every possible edge is present
+    independently with the given probability.
+
+    Parameters:
+    vertex_count (integer): Number of vertices, with ids 0..n-1.
+    probability (float): Probability of each edge.
+    seed (integer): Seed for the random number generator.
+    is_directed (boolean): Whether to create a directed graph.
+    weighted (boolean): Whether to create a WeightedGraph.
+    weight_range (tuple): Inclusive range of the random integer weights.
+    """
+    rng = Random(seed)
+    graph = _new_graph(vertex_count, is_directed, weighted)
+    pairs = _random_pairs(vertex_count, probability, rng, ordered=is_directed)
+    graph.add_edges_from(_with_weights(pairs, rng, weighted, weight_range))
+    return graph
+
+
+def grid_graph(rows, columns, seed=None, weighted=False, weight_range=(1, 10)):
+    """
+    Return an undirected rows x columns grid, where vertex `r * columns + c`
+    is joined to its right and lower neighbors. Road-network-like.
+    """
+    rng = Random(seed)
+    graph = _new_graph(rows * columns, False, weighted)
+    for row in range(rows):
+        for column in range(columns):
+            vertex_id = row * columns + column
+            if column + 1 < columns:
+                _add_edge(graph, vertex_id, vertex_id + 1, rng, weighted, weight_range)
+            if row + 1 < rows:
+                _add_edge(graph, vertex_id, vertex_id + columns, rng, weighted,
+                          weight_range)
+    return graph
+
+
+def power_law_graph(vertex_count, edges_per_vertex, seed=None, weighted=False,
+                    weight_range=(1, 10)):
+    """
+    Return an undirected Barabasi-Albert preferential attachment graph, whose
+    degrees follow a power law like social networks.
+
+    Parameters:
+    vertex_count (integer): Number of vertices, with ids 0..n-1.
+    edges_per_vertex (integer): Edges each new vertex attaches with.
+    """
+    rng = Random(seed)
+    graph = _new_graph(vertex_count, False, weighted)
+    # every edge endpoint, so a uniform pick is a degree-proportional pick
+    endpoints = list(range(min(edges_per_vertex, vertex_count)))
+    for vertex_id in range(len(endpoints), vertex_count):
+        targets = set()
+        while len(targets) < min(edges_per_vertex, vertex_id):
+            targets.add(rng.choice(endpoints))
+        for target_id in targets:
+            _add_edge(graph, vertex_id, target_id, rng, weighted, weight_range)
+            endpoints.append(target_id)
+            endpoints.append(vertex_id)
+    return graph
+
+
+def random_dag(vertex_count, probability, seed=None, weighted=False,
+               weight_range=(1, 10)):
+    """
+    Return a random directed acyclic graph: each edge i -> j with i < j is
+    present independently with the given probability.
+    """
+    rng = Random(seed)
+    graph = _new_graph(vertex_count, True, weighted)
+    pairs = ((vertex_id2, vertex_id1) for vertex_id1, vertex_id2
+             in _random_pairs(vertex_count, probability, rng, ordered=False))
+    graph.add_edges_from(_with_weights(pairs, rng, weighted, weight_range))
+    return graph
+
+
+def bipartite_graph(left_count, right_count, probability, seed=None,
+                    weighted=False, weight_range=(1, 10)):
+    """
+    Return an undirected random bipartite graph. Vertices 0..left_count-1 form
+    one side and the rest the other; each cross edge is present independently
+    with the given probability.
+    """
+    rng = Random(seed)
+    graph = _new_graph(left_count + right_count, False, weighted)
+
+    def cross_pairs():
+        for index in _sample_indices(left_count * right_count, probability, rng):
+            left_id, right_offset = divmod(index, right_count)
+            yield left_id, left_count + right_offset
+
+    graph.add_edges_from(_with_weights(cross_pairs(), rng, weighted, weight_range))
+    return graph
@@ -1,5 +1,21 @@
+import gc
 from collections import deque
-from random import choice
+from itertools import chain, filterfalse
+from operator import attrgetter
+
+from graphs.coloring import greedy_coloring_csr, two_coloring_csr
+from graphs.components import (group_ids, strongly_connected_components,
+                               weakly_connected_components)
+from graphs.csr import CSRAdjacency
+from graphs.cycles import CycleError, dfs_order_csr, find_cycle_csr, kahn_order_csr
+from graphs.disjoint_set import DisjointSet
+from graphs.dynamic_components import DynamicComponents
+from graphs.frontier import top_down_levels
+from graphs.query_cache import QueryCache
+
+# Events reported by Graph.dfs_events
+PRE_ORDER = 'pre'
+POST_ORDER = 'post'
 
 
 class Vertex(object):
@@ -7,6 +23,12 @@ class Vertex(object):
     Defines a single vertex and its neighbors.
     """
 
+    # shared with subclasses, which keep their neighbors in the same slot
+    __slots__ = ('_id', '_neighbors_dict')
+
+    # Returns the neighbors dictionary itself, for bulk updates by the graph
+    NEIGHBOR_DICT = attrgetter('_neighbors_dict')
+
     def __init__(self, vertex_id):
         """
         Initialize a vertex and its neighbors dictionary.
@@ -14,8 +36,8 @@ class Vertex(object):
         Parameters:
         vertex_id (string): A unique identifier to identify this vertex.
         """
-        self.__id = vertex_id
-        self.__neighbors_dict = {}  # id -> object
+        self._id = vertex_id
+        self._neighbors_dict = {}  # id -> object
 
     def add_neighbor(self, vertex_obj):
         """
@@ -24,12 +46,24 @@ class Vertex(object):
         Parameters:
         vertex_obj (Vertex): An instance of Vertex to be stored as a neighbor.
         """
-        self.__neighbors_dict[vertex_obj.__id] = vertex_obj
+        self._neighbors_dict[vertex_obj._id] = vertex_obj
+
+    def remove_neighbor(self, vertex_id):
+        """
+        Remove a neighbor from the neighbors dictionary.
+
+        Parameters:
+        vertex_id (string): The id of the neighbor to remove.
+
+        Returns:
+        boolean: True if it was a neighbor, False otherwise.
+        """
+        return self._neighbors_dict.pop(vertex_id, None) is not None
 
     def __str__(self):
         """Output the list of neighbors of this vertex."""
-        neighbor_ids = list(self.__neighbors_dict.keys())
-        return f'{self.__id} adjacent to {neighbor_ids}'
+        neighbor_ids = list(self._neighbors_dict.keys())
+        return f'{self._id} adjacent to {neighbor_ids}'
 
     def __repr__(self):
         """Output the list of neighbors of this vertex."""
@@ -37,11 +71,49 @@ class Vertex(object):
 
     def get_neighbors(self):
         """Return the neighbors of this vertex."""
-        return list(self.__neighbors_dict.values())
+        return list(self._neighbors_dict.values())
+
+    def iter_neighbors(self):
+        """Return a live, non-copying view of the neighbors of this vertex."""
+        return self._neighbors_dict.values()
+
+    def iter_neighbor_ids(self):
+        """Return a live, non-copying view of the ids of this vertex's neighbors."""
+        return self._neighbors_dict.keys()
 
     def get_id(self):
         """Return the id of this vertex."""
-        return self.__id
+        return self._id
+
+
+def _copy_result(result):
+    """Copy the lists in a cached result, so callers cannot change the cache."""
+    if isinstance(result, list):
+        return [_copy_result(item) for item in result]
+    if isinstance(result, tuple):
+        return tuple(_copy_result(item) for item in result)
+    return result
+
+
+def build_path(vertex_to_parent, target_id):
+    """
+    Walk parent pointers back from target_id and return the path they encode.
+
+    Parameters:
+    vertex_to_parent (dict): Maps vertex id -> previous vertex id on the path,
+        with None for the start vertex.
+    target_id (string): The id of the last vertex on the path.
+
+    Returns:
+    list<string>: The vertex ids on the path, from start to target.
+    """
+    path = []
+    current_id = target_id
+    while current_id is not None:
+        path.append(current_id)
+        current_id = vertex_to_parent[current_id]
+    path.reverse()
+    return path
 
 
 class Graph:
@@ -50,6 +122,9 @@ class Graph:
     Represents a directed or undirected graph.
     """
 
+    # The class of the vertex objects the graph creates
+    VERTEX_CLASS = Vertex
+
     def __init__(self, is_directed=True):
         """
         Initialize a graph object with an empty vertex dictionary.
@@ -59,27 +134,34 @@ class Graph:
         """
         self.__vertex_dict = {}  # id -> object
         self.__is_directed = is_directed
+        self.__connectivity = None  # DisjointSet, built on first use
+        self.__predecessors = None  # id -> {predecessor id -> weight}, built on first use
+        self.__version = 0  # bumped by every change to the graph
+        self.__query_cache = None  # QueryCache, once enabled
+        self.__components = None  # DynamicComponents, once enabled
 
     def add_vertex(self, vertex_id):
         """
-        Add a new vertex object to the graph with the given key and return the vertex.
+        Add a new vertex object to the graph with the given key and return the
+        vertex. If the vertex is already in the graph, it is left unchanged,
+        edges and all.
 
         Parameters:
         vertex_id (string): The unique identifier for the new vertex.
 
         Returns:
-        Vertex: The new vertex object.
+        Vertex: The new vertex object, or the existing one.
         """
-        self.__vertex_dict[vertex_id] = Vertex(vertex_id)
-        return self.__vertex_dict[vertex_id]
+        vertex_obj = self.__vertex_dict.get(vertex_id)
+        if vertex_obj is not None:
+            return vertex_obj  # it's already there
+        vertex_obj = self.__vertex_dict[vertex_id] = self.VERTEX_CLASS(vertex_id)
+        self._vertex_added(vertex_id)
+        return vertex_obj
 
     def get_vertex(self, vertex_id):
         """Return the vertex if it exists."""
-        if vertex_id not in self.__vertex_dict:
-            return None
-
-        vertex_obj = self.__vertex_dict[vertex_id]
-        return vertex_obj
+        return self.__vertex_dict.get(vertex_id)
 
     def add_edge(self, vertex_id1, vertex_id2):
         """
@@ -94,6 +176,338 @@ class Graph:
         if not self.__is_directed:
             self.__vertex_dict[vertex_id2].add_neighbor(
                 self.__vertex_dict[vertex_id1])
+        self._edge_added(vertex_id1, vertex_id2)
+
+    def add_vertices_from(self, vertex_ids):
+        """
+        Add many vertices at once, skipping ids that are already in the graph.
+
+        Parameters:
+        vertex_ids (iterable): The unique identifiers of the new vertices.
+        """
+        self._add_vertices_in_bulk(vertex_ids)
+
+    def add_edges_from(self, edges, build_reverse=False, pause_gc=False):
+        """
+        Add many edges at once, several times faster than calling add_edge for
+        each. Missing vertices are created and duplicate edges are skipped.
+        The cost is proportional to the number of edges added, not to the
+        size of the graph, so large graphs can be loaded in batches.
+
+        Parameters:
+        edges (iterable): (vertex_id1, vertex_id2) pairs, each an edge from
+            vertex_id1 to vertex_id2.
+        build_reverse (boolean): For directed graphs, also build the reverse
+            adjacency used by get_predecessor_ids while adding the edges,
+            instead of with a separate pass on first use.
+        pause_gc (boolean): Pause the cyclic garbage collector while adding
+            the edges. This makes loading millions of edges much faster, but
+            the collector is paused for the whole process, other threads
+            included.
+        """
+        self._add_edges_in_bulk(edges, False, build_reverse, pause_gc)
+
+    def remove_edge(self, vertex_id1, vertex_id2):
+        """
+        Remove the edge from vertex with id `vertex_id1` to vertex with id
+        `vertex_id2`, or the undirected edge between them.
+
+        Parameters:
+        vertex_id1 (string): The unique identifier of the first vertex.
+        vertex_id2 (string): The unique identifier of the second vertex.
+
+        Returns:
+        boolean: True if the edge was removed, False if there was no such edge.
+
+        Raises:
+        KeyError: If either vertex is not in the graph.
+        """
+        return self._remove_edge(vertex_id1, vertex_id2)
+
+    def remove_vertex(self, vertex_id):
+        """
+        Remove a vertex together with every edge into and out of it.
+
+        For directed graphs, the edges into the vertex are found through the
+        reverse adjacency, which the first removal builds in O(V + E) and later
+        changes keep up to date, so each removal costs O(degree).
+
+        Parameters:
+        vertex_id (string): The unique identifier of the vertex.
+
+        Raises:
+        KeyError: If the vertex is not in the graph.
+        """
+        self._remove_vertex(vertex_id)
+
+    def _remove_edge(self, vertex_id1, vertex_id2):
+        """Remove an edge, updating every derived structure."""
+        vertex_obj1 = self.__vertex_dict.get(vertex_id1)
+        vertex_obj2 = self.__vertex_dict.get(vertex_id2)
+        if vertex_obj1 is None or vertex_obj2 is None:
+            raise KeyError("One or both vertices are not in the graph!")
+        if not vertex_obj1.remove_neighbor(vertex_id2):
+            return False
+        if not self.__is_directed:
+            vertex_obj2.remove_neighbor(vertex_id1)
+        self._edge_removed(vertex_id1, vertex_id2)
+        return True
+
+    def _remove_vertex(self, vertex_id):
+        """Remove a vertex and all of its edges, updating every derived structure."""
+        vertex_obj = self.__vertex_dict.get(vertex_id)
+        if vertex_obj is None:
+            raise KeyError("Vertex is not in the graph!")
+        # one edge at a time, so every derived structure sees a valid graph
+        for neighbor_id in list(vertex_obj.iter_neighbor_ids()):
+            self._remove_edge(vertex_id, neighbor_id)
+        if self.__is_directed:
+            for predecessor_id in list(self.__get_predecessors()[vertex_id]):
+                self._remove_edge(predecessor_id, vertex_id)
+        del self.__vertex_dict[vertex_id]
+        self._vertex_removed(vertex_id)
+
+    def _add_vertices_in_bulk(self, vertex_ids):
+        """Add the missing vertices, in order."""
+        self.__version += 1
+        vertex_dict = self.__vertex_dict
+        new_ids = list(filterfalse(vertex_dict.__contains__, dict.fromkeys(vertex_ids)))
+        vertex_dict.update(zip(new_ids, map(self.VERTEX_CLASS, new_ids)))
+        if self.__connectivity is not None:
+            for vertex_id in new_ids:
+                self.__connectivity.add(vertex_id)
+        if self.__predecessors is not None:
+            for vertex_id in new_ids:
+                self.__predecessors[vertex_id] = {}
+        if self.__components is not None:
+            for vertex_id in new_ids:
+                self.__components.add_vertex(vertex_id)
+
+    def _add_edges_in_bulk(self, edges, weighted, build_reverse, pause_gc):
+        """
+        Add edges, creating missing vertices. The first weight of a duplicate
+        edge wins, as with add_edge.
+
+        The loop writes the neighbor dictionaries directly instead of going
+        through add_edge and its lookups. With `pause_gc`, the cyclic garbage
+        collector is paused meanwhile: otherwise it keeps rescanning the
+        growing graph as millions of new objects are created, which costs
+        more than the insertions themselves.
+        """
+        self.__version += 1
+        if build_reverse and self.__is_directed:
+            self.__get_predecessors()
+        connectivity, predecessors = self.__connectivity, self.__predecessors
+        components = self.__components
+        is_directed = self.__is_directed
+        vertex_dict, vertex_class = self.__vertex_dict, self.VERTEX_CLASS
+        neighbor_dict = vertex_class.NEIGHBOR_DICT
+
+        def new_vertex(vertex_id):
+            vertex = vertex_dict[vertex_id] = vertex_class(vertex_id)
+            if connectivity is not None:
+                connectivity.add(vertex_id)
+            if predecessors is not None:
+                predecessors[vertex_id] = {}
+            if components is not None:
+                components.add_vertex(vertex_id)
+            return vertex
+
+        get_vertex = vertex_dict.get
+        gc_was_enabled = gc.isenabled()
+        if pause_gc:
+            gc.disable()
+        try:
+            weight = 1
+            for edge in edges:
+                if weighted:
+                    vertex_id1, vertex_id2, weight = edge
+                else:
+                    vertex_id1, vertex_id2 = edge
+                vertex1 = get_vertex(vertex_id1) or new_vertex(vertex_id1)
+                vertex2 = get_vertex(vertex_id2) or new_vertex(vertex_id2)
+
+                neighbors = neighbor_dict(vertex1)
+                if vertex_id2 in neighbors:
+                    continue  # duplicate
+                neighbors[vertex_id2] = (vertex2, weight) if weighted else vertex2
+                if not is_directed:
+                    neighbors = neighbor_dict(vertex2)
+                    if vertex_id1 not in neighbors:
+                        neighbors[vertex_id1] = (vertex1, weight) if weighted else vertex1
+                if connectivity is not None:
+                    connectivity.union(vertex_id1, vertex_id2)
+                if predecessors is not None:
+                    predecessors[vertex_id2].setdefault(vertex_id1, weight)
+                if components is not None:
+                    components.add_edge(vertex_id1, vertex_id2)
+        finally:
+            if pause_gc and gc_was_enabled:
+                gc.enable()
+
+    def _vertex_added(self, vertex_id):
+        """Update the structures derived from the graph after add_vertex."""
+        self.__version += 1
+        if self.__connectivity is not None:
+            self.__connectivity.add(vertex_id)
+        if self.__predecessors is not None:
+            self.__predecessors.setdefault(vertex_id, {})
+        if self.__components is not None:
+            self.__components.add_vertex(vertex_id)
+
+    def _edge_added(self, vertex_id1, vertex_id2, weight=1):
+        """Update the structures derived from the graph after add_edge."""
+        self.__version += 1
+        if self.__connectivity is not None:
+            self.__connectivity.union(vertex_id1, vertex_id2)
+        if self.__predecessors is not None:
+            self.__predecessors[vertex_id2].setdefault(vertex_id1, weight)
+        if self.__components is not None:
+            self.__components.add_edge(vertex_id1, vertex_id2)
+
+    def _vertex_removed(self, vertex_id):
+        """Update the structures derived from the graph after remove_vertex."""
+        self.__version += 1
+        self.__connectivity = None  # a disjoint set cannot forget an item
+        if self.__predecessors is not None:
+            del self.__predecessors[vertex_id]
+        if self.__components is not None:
+            self.__components.remove_vertex(vertex_id)
+
+    def _edge_removed(self, vertex_id1, vertex_id2):
+        """Update the structures derived from the graph after remove_edge."""
+        self.__version += 1
+        self.__connectivity = None  # a disjoint set cannot split a set
+        if self.__predecessors is not None:
+            self.__predecessors[vertex_id2].pop(vertex_id1, None)
+        if self.__components is not None:
+            self.__components.remove_edge(vertex_id1, vertex_id2)
+
+    def enable_incremental_components(self):
+        """
+        Keep the connected components (ignoring edge direction) up to date as
+        the graph changes, instead of relabeling every vertex on each query.
+        Adding an edge costs O(log V) amortized per vertex and removing one
+        searches the smaller of the parts it might split.
+
+        While enabled, get_connected_components, get_component_labels (weak
+        components) and are_connected read the maintained labels, and
+        directed graphs keep their reverse adjacency too.
+        """
+        if self.__is_directed:
+            self.__get_predecessors()
+        self.__components = DynamicComponents(self.get_vertex_ids(),
+                                              self.__undirected_neighbor_ids)
+
+    def disable_incremental_components(self):
+        """Stop maintaining the connected components and free them."""
+        self.__components = None
+
+    def __undirected_neighbor_ids(self, vertex_id):
+        """Return the ids of the vertices joined to vertex_id by an edge either way."""
+        neighbor_ids = self.get_vertex(vertex_id).iter_neighbor_ids()
+        if not self.__is_directed:
+            return neighbor_ids
+        return chain(neighbor_ids, self.__predecessors[vertex_id])
+
+    def get_out_degree(self, vertex_id):
+        """
+        Return the number of edges out of vertex_id, in O(1).
+
+        Raises:
+        KeyError: If the vertex is not in the graph.
+        """
+        vertex = self.get_vertex(vertex_id)
+        if vertex is None:
+            raise KeyError("Vertex is not in the graph!")
+        return len(vertex.iter_neighbor_ids())
+
+    def get_in_degree(self, vertex_id):
+        """
+        Return the number of edges into vertex_id. For directed graphs the
+        first call builds the reverse adjacency in O(V + E); after that it is
+        O(1), kept up to date by every change to the graph.
+
+        Raises:
+        KeyError: If the vertex is not in the graph.
+        """
+        if not self.contains_id(vertex_id):
+            raise KeyError("Vertex is not in the graph!")
+        return len(self.get_predecessor_ids(vertex_id))
+
+    def get_version(self):
+        """Return a counter that changes whenever the graph is modified."""
+        return self.__version
+
+    def enable_query_cache(self, maxsize=1024):
+        """
+        Cache the results of find_shortest_path, find_vertices_n_away and
+        get_connected_components, so repeating a query on an unchanged graph
+        costs a dictionary lookup. Any change to the graph drops the cache.
+
+        Parameters:
+        maxsize (integer): The most results kept, least recently used first out.
+        """
+        self.__query_cache = QueryCache(maxsize)
+
+    def disable_query_cache(self):
+        """Stop caching query results and free the cache."""
+        self.__query_cache = None
+
+    def get_query_cache_stats(self):
+        """Return the query cache statistics, or None if caching is off."""
+        if self.__query_cache is None:
+            return None
+        return self.__query_cache.get_stats()
+
+    def _cached_query(self, method, *arguments):
+        """
+        Return method(*arguments), answered from the query cache when enabled.
+        Callers get their own copy of any lists in the result.
+        """
+        if self.__query_cache is None:
+            return method(*arguments)
+        result = self.__query_cache.get(self.__version, (method.__name__,) + arguments,
+                                        lambda: method(*arguments))
+        return _copy_result(result)
+
+    def __get_predecessors(self):
+        """Return the reverse adjacency of a directed graph, building it once."""
+        if self.__predecessors is None:
+            predecessors = {vertex_id: {} for vertex_id in self.get_vertex_ids()}
+            for vertex in self.get_vertices():
+                vertex_id = vertex.get_id()
+                if hasattr(vertex, 'iter_neighbor_ids_with_weights'):
+                    for neighbor_id, weight in vertex.iter_neighbor_ids_with_weights():
+                        predecessors[neighbor_id].setdefault(vertex_id, weight)
+                else:
+                    for neighbor_id in vertex.iter_neighbor_ids():
+                        predecessors[neighbor_id][vertex_id] = 1
+            self.__predecessors = predecessors
+        return self.__predecessors
+
+    def get_predecessor_ids(self, vertex_id):
+        """
+        Return the ids of the vertices with an edge into vertex_id.
+
+        For directed graphs, the first call builds a reverse adjacency in
+        O(V + E), which every later change to the graph keeps up to date.
+        """
+        if not self.is_directed_graph():
+            return self.get_vertex(vertex_id).iter_neighbor_ids()
+        return self.__get_predecessors()[vertex_id].keys()
+
+    def get_predecessor_ids_with_weights(self, vertex_id):
+        """
+        Return (predecessor id, weight) tuples for the edges into vertex_id.
+        Unweighted graphs report a weight of 1.
+        """
+        if not self.is_directed_graph():
+            vertex = self.get_vertex(vertex_id)
+            if hasattr(vertex, 'iter_neighbor_ids_with_weights'):
+                return vertex.iter_neighbor_ids_with_weights()
+            return ((neighbor_id, 1) for neighbor_id in vertex.iter_neighbor_ids())
+        return self.__get_predecessors()[vertex_id].items()
 
     def get_vertices(self):
         """
@@ -104,9 +518,69 @@ class Graph:
         """
         return list(self.__vertex_dict.values())
 
+    def get_vertex_ids(self):
+        """
+        Return the ids of all vertices in the graph, in insertion order.
+
+        Returns:
+        List<string>: The vertex ids contained in the graph.
+        """
+        return list(self.__vertex_dict.keys())
+
+    def get_edge_count(self):
+        """Return the number of edges, counting each undirected edge once."""
+        entries = loops = 0
+        for vertex_id, vertex_obj in self.__vertex_dict.items():
+            neighbor_ids = vertex_obj.iter_neighbor_ids()
+            entries += len(neighbor_ids)
+            loops += vertex_id in neighbor_ids
+        return entries if self.__is_directed else (entries + loops) // 2
+
     def contains_id(self, vertex_id):
         return vertex_id in self.__vertex_dict
 
+    def is_directed_graph(self):
+        """Return True if the graph is directed."""
+        return self.__is_directed
+
+    def to_csr(self):
+        """
+        Return a compressed sparse row snapshot of the graph's adjacency.
+
+        Returns:
+        CSRAdjacency: The adjacency, with vertex ids interned to dense indices.
+        """
+        return CSRAdjacency.from_graph(self)
+
+    def are_connected(self, vertex_id1, vertex_id2):
+        """
+        Return True if there is a path between the two vertices, ignoring edge
+        direction.
+
+        The first call indexes the graph into a disjoint set in O(V + E). After
+        that, every query and every add_vertex/add_edge updates it in
+        near-constant time. Removals drop the index, to be rebuilt by the next
+        query, unless enable_incremental_components is on.
+
+        Parameters:
+        vertex_id1 (string): The id of the first vertex.
+        vertex_id2 (string): The id of the second vertex.
+        """
+        if not self.contains_id(vertex_id1) or not self.contains_id(vertex_id2):
+            raise KeyError("One or both vertices are not in the graph!")
+
+        if self.__components is not None:
+            return self.__components.connected(vertex_id1, vertex_id2)
+        if self.__connectivity is None:
+            connectivity = DisjointSet(self.get_vertex_ids())
+            for vertex in self.get_vertices():
+                vertex_id = vertex.get_id()
+                for neighbor_id in vertex.iter_neighbor_ids():
+                    connectivity.union(vertex_id, neighbor_id)
+            self.__connectivity = connectivity
+
+        return self.__connectivity.connected(vertex_id1, vertex_id2)
+
     def __str__(self):
         """Return a string representation of the graph."""
         return f'Graph with vertices: {self.get_vertices()}'
@@ -115,9 +589,24 @@ class Graph:
         """Return a string representation of the graph."""
         return self.__str__()
 
-    def bfs_traversal(self, start_id):
+    def bfs_traversal(self, start_id, max_depth=None, visitor=None):
         """
-        Traverse the graph using breadth-first search.
+        Traverse the graph using breadth-first search, lazily.
+
+        Vertices are yielded as they are reached, so the caller can stop at any
+        point simply by no longer iterating.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        max_depth (integer): If given, do not go further than this many edges
+            from the start vertex.
+        visitor (function): Called as `visitor(vertex_id, depth)` for each
+            vertex reached. If it returns False, that vertex's neighbors are
+            not explored.
+
+        Yields:
+        tuple(string, integer): Each reachable vertex id and its depth (number
+        of edges from the start vertex), in breadth-first order.
         """
         if not self.contains_id(start_id):
             raise KeyError("One or both vertices are not in the graph!")
@@ -128,22 +617,47 @@ class Graph:
 
         # Keep a queue so that we visit vertices in the appropriate order
         queue = deque()
-        queue.append(self.get_vertex(start_id))
+        queue.append((start_id, 0))
 
         while queue:
-            current_vertex_obj = queue.pop()
-            current_vertex_id = current_vertex_obj.get_id()
+            current_vertex_id, depth = queue.popleft()
 
             # Process current node
-            print('Processing vertex {}'.format(current_vertex_id))
+            yield current_vertex_id, depth
+            if visitor is not None and visitor(current_vertex_id, depth) is False:
+                continue
+            if depth == max_depth:
+                continue
 
             # Add its neighbors to the queue
-            for neighbor in current_vertex_obj.get_neighbors():
-                if neighbor.get_id() not in seen:
-                    seen.add(neighbor.get_id())
-                    queue.append(neighbor)
+            current_vertex_obj = self.get_vertex(current_vertex_id)
+            for neighbor_id in current_vertex_obj.iter_neighbor_ids():
+                if neighbor_id not in seen:
+                    seen.add(neighbor_id)
+                    queue.append((neighbor_id, depth + 1))
 
-        return  # everything has been processed
+    def bfs_levels(self, start_id, parents=None):
+        """
+        Run a level-synchronous breadth-first search, one frontier at a time.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        parents (dict): If given, filled with vertex id -> parent vertex id
+            (None for the start vertex) for every vertex reached. When a
+            frontier is yielded it covers every vertex up to that depth.
+
+        Returns:
+        generator<list<string>>: The vertex ids at depth 0, 1, 2, ...
+        """
+        if not self.contains_id(start_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        if parents is None:
+            parents = {}
+
+        get_vertex = self.get_vertex
+        return top_down_levels(
+            start_id, lambda vertex_id: get_vertex(vertex_id).iter_neighbor_ids(),
+            parents)
 
     def find_shortest_path(self, start_id, target_id):
         """
@@ -156,40 +670,70 @@ class Graph:
         Returns:
         list<string>: A list of all vertex ids in the shortest path, from start to end.
         """
+        return self._cached_query(self.__find_shortest_path, start_id, target_id)
+
+    def __find_shortest_path(self, start_id, target_id):
         if not self.contains_id(start_id) or not self.contains_id(target_id):
             raise KeyError("One or both vertices are not in the graph!")
 
-        # vertex keys we've seen before and their paths from the start vertex
-        vertex_id_to_path = {
-            start_id: [start_id]  # only one thing in the path
-        }
+        # parent pointers of every vertex seen, instead of a path per vertex
+        vertex_to_parent = {}
+        for _ in self.bfs_levels(start_id, vertex_to_parent):
+            if target_id in vertex_to_parent:
+                return build_path(vertex_to_parent, target_id)
 
-        # queue of vertices to visit next
-        queue = deque()
-        queue.append(self.get_vertex(start_id))
+        return None  # path not found
 
-        # while queue is not empty
-        while queue:
-            current_vertex_obj = queue.popleft()  # vertex obj to visit next
-            current_vertex_id = current_vertex_obj.get_id()
-
-            if (current_vertex_id == target_id):
-                return vertex_id_to_path[target_id]
-
-            neighbors = current_vertex_obj.get_neighbors()
-            for neighbor in neighbors:
-                if neighbor.get_id() not in vertex_id_to_path:
-                    current_path = vertex_id_to_path[current_vertex_id]
-                    # extend the path by 1 vertex
-                    next_path = current_path + [neighbor.get_id()]
-                    vertex_id_to_path[neighbor.get_id()] = next_path
-                    queue.append(neighbor)
-                    # print(vertex_id_to_path)
-
-        if target_id not in vertex_id_to_path:  # path not found
-            return None
+    def find_shortest_path_bidirectional(self, start_id, target_id):
+        """
+        Find the shortest path from start_id to target_id by searching forward
+        from the start and backward from the target at the same time, always
+        expanding the smaller frontier, until the two searches meet.
 
-        return vertex_id_to_path[target_id]
+        Returns the same kind of result as `find_shortest_path`.
+        """
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        if start_id == target_id:
+            return [start_id]
+
+        get_vertex = self.get_vertex
+        forward = (lambda vertex_id: get_vertex(vertex_id).iter_neighbor_ids(),
+                   {start_id: None}, [start_id])
+        backward = (self.get_predecessor_ids, {target_id: None}, [target_id])
+
+        while forward[2] and backward[2]:
+            # expand the smaller side by one whole level
+            if len(forward[2]) <= len(backward[2]):
+                side, other = forward, backward
+            else:
+                side, other = backward, forward
+            neighbors, parents, frontier = side
+            other_parents = other[1]
+
+            next_frontier = []
+            meeting_id = None
+            for vertex_id in frontier:
+                for neighbor_id in neighbors(vertex_id):
+                    if neighbor_id in parents:
+                        continue
+                    parents[neighbor_id] = vertex_id
+                    next_frontier.append(neighbor_id)
+                    if meeting_id is None and neighbor_id in other_parents:
+                        meeting_id = neighbor_id
+            frontier[:] = next_frontier
+
+            # every meeting vertex found in this level gives a path of the
+            # same length, so the first one is a shortest path
+            if meeting_id is not None:
+                path = build_path(forward[1], meeting_id)
+                vertex_id = backward[1][meeting_id]
+                while vertex_id is not None:
+                    path.append(vertex_id)
+                    vertex_id = backward[1][vertex_id]
+                return path
+
+        return None  # path not found
 
     def find_vertices_n_away(self, start_id, target_distance):
         """
@@ -202,115 +746,100 @@ class Graph:
         Returns:
         list<string>: All vertex ids that are `target_distance` away from the start vertex
         """
-        vertice_distance = {start_id: 0}
-
-        results = []
-        seen = set()
-        seen.add(start_id)
-
-        queue = deque()
-        queue.append(self.get_vertex(start_id))
+        return self._cached_query(self.__find_vertices_n_away, start_id, target_distance)
 
-        pause = False
+    def __find_vertices_n_away(self, start_id, target_distance):
+        for distance, frontier in enumerate(self.bfs_levels(start_id)):
+            if distance == target_distance:
+                return frontier
+        return []
 
-        while queue:
-            vertex = queue.popleft()
-            vertex_id = vertex.get_id()
+    def get_distances(self, start_id, max_distance=None):
+        """
+        Return the number of edges on the shortest path from start_id to every
+        vertex it can reach.
 
-            neighbors = vertex.get_neighbors()
+        Arguments:
+        start_id (string): The id of the start vertex.
+        max_distance (integer): If given, only include vertices this close.
 
-            if vertice_distance[vertex_id] == target_distance + 1:
-                pause = True
+        Returns:
+        dict: Vertex id -> distance from the start vertex.
+        """
+        vertex_to_distance = {}
+        for distance, frontier in enumerate(self.bfs_levels(start_id)):
+            for vertex_id in frontier:
+                vertex_to_distance[vertex_id] = distance
+            if distance == max_distance:
                 break
+        return vertex_to_distance
 
-            for n in neighbors:
-                neighbor_id = n.get_id()
-                if neighbor_id not in seen:
-                    if neighbor_id not in vertice_distance:
-                        vertice_distance[neighbor_id] = vertice_distance[vertex_id]
-                    vertice_distance[neighbor_id] += 1
-                    if vertice_distance[neighbor_id] == target_distance:
-                        results.append(neighbor_id)
-                    seen.add(neighbor_id)
-                    queue.append(n)
-        return results
+    def get_bipartition(self):
+        """
+        Split the vertices into two sides with every edge going between them,
+        checking every component in O(V + E). Edge directions are ignored.
+
+        Returns:
+        tuple(dict, list): If the graph is bipartite, vertex id -> side (0 or
+        1, with the first vertex of each component on side 0) and None.
+        Otherwise None and the vertex ids of a short odd cycle, in order around
+        the cycle, which proves that no such split exists.
+        """
+        csr = self.to_csr()
+        sides, odd_cycle = two_coloring_csr(csr)
+        if sides is None:
+            return None, [csr.ids[vertex] for vertex in odd_cycle]
+        return dict(zip(csr.ids, sides)), None
 
     def is_bipartite(self):
         """
         Return True if the graph is bipartite, and False otherwise.
         """
+        return self.get_bipartition()[1] is None
 
-        start_id = choice(list(self.__vertex_dict.keys()))
-
-        queue = deque()
-        queue.append(self.get_vertex(start_id))
-
-        all_colors = {
-            start_id: "red"
-        }
-
-        while queue:
-            vertex_object = queue.pop()
-            vertex_id = vertex_object.get_id()
+    def get_component_labels(self, strong=False):
+        """
+        Label the connected components of the graph in O(V + E).
 
-            neighbors = vertex_object.get_neighbors()
+        Parameters:
+        strong (boolean): Label strongly connected components, where every
+            vertex can reach every other along edge directions, instead of
+            ignoring direction. The same thing for undirected graphs.
 
-            for n in neighbors:
-                n_id = n.get_id()
-                if n_id not in all_colors:
-                    all_colors[n_id] = "blue" if all_colors[vertex_id] == "red" else "red"
-                    queue.appendleft(n)
-                else:
-                    if all_colors[n_id] == all_colors[vertex_id]:
-                        return False
-        return True
+        Returns:
+        tuple(array, array): The component label of every vertex, indexed like
+        `to_csr().ids` (insertion order), and the size of each component.
+        Labels are deterministic; see `graphs.components` for their order.
+        """
+        if not strong and self.__components is not None:
+            return self.__components.get_dense_labels(self.get_vertex_ids())
+        csr = self.to_csr()
+        if strong and csr.is_directed:
+            return strongly_connected_components(csr)
+        return weakly_connected_components(csr)
 
     def get_connected_components(self):
         """
         Return a list of all connected components, with each connected component
-        represented as a list of vertex ids.
-        """
-        start_id = choice(list(self.__vertex_dict.keys()))
-
-        # must be a list, can't be a set because random.choice does not it
-        ids_left = list(self.__vertex_dict.keys())
-        ids_left.remove(start_id)
-
-        seen = set()
-        seen.add(start_id)
+        represented as a list of vertex ids. Edge directions are ignored.
 
-        queue = deque()
-        queue.append(self.get_vertex(start_id))
+        Components are ordered by their first vertex in insertion order, and
+        each lists its vertex ids in insertion order.
+        """
+        return self._cached_query(self.__get_connected_components)
 
-        components = []
-        com = []
-        while queue:
-            vertex_oject = queue.pop()
-            vertex_id = vertex_oject.get_id()
-            com.append(vertex_id)
-
-            neighbors = vertex_oject.get_neighbors()
-
-            for n in neighbors:
-                n_id = n.get_id()
-                if n_id not in seen:
-                    seen.add(n_id)
-                    queue.appendleft(n)
-                    ids_left.remove(n_id)
-
-            # if there is no vertex left in the queue
-            if len(queue) == 0:
-                components.append(com)
-                # if there are no more components left to traverse through
-                if len(ids_left) == 0:
-                    break
-                com = []
-                new_start = choice(ids_left)
-                seen.add(new_start)
-                queue.appendleft(self.get_vertex(new_start))
-                ids_left.remove(new_start)
+    def __get_connected_components(self):
+        labels, sizes = self.get_component_labels()
+        return group_ids(self.get_vertex_ids(), labels, sizes)
 
-        return components
+    def get_strongly_connected_components(self):
+        """
+        Return the strongly connected components as lists of vertex ids. For
+        directed graphs they come in reverse topological order: no edge leads
+        from a component to a later one.
+        """
+        labels, sizes = self.get_component_labels(strong=True)
+        return group_ids(self.get_vertex_ids(), labels, sizes)
 
     def find_path_dfs_iter(self, start_id, target_id):
         """
@@ -324,144 +853,161 @@ class Graph:
         }
 
         stack = deque()
-        stack.append(self.get_vertex(start_id))
+        stack.append(start_id)
 
         while stack:
-            vertex_object = stack.pop()
-            vertex_id = vertex_object.get_id()
-
-            neighbors = vertex_object.get_neighbors()
+            vertex_id = stack.pop()
 
-            for n in neighbors:
-                n_id = n.get_id()
+            for n_id in self.get_vertex(vertex_id).iter_neighbor_ids():
                 if n_id not in paths:
                     current_path = paths[vertex_id]
                     next_path = current_path + [n_id]
                     if n_id == target_id:
                         return next_path
                     paths[n_id] = next_path
-                    stack.append(n)
+                    stack.append(n_id)
         return paths
 
-    def dfs_traversal(self, start_id):
-        """Visit each vertex, starting with start_id, in DFS order."""
+    def dfs_events(self, start_id, max_depth=None, visitor=None):
+        """
+        Traverse the graph using iterative depth-first search, lazily, reporting
+        both when a vertex is entered and when it is finished.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        max_depth (integer): If given, do not go further than this many edges
+            from the start vertex.
+        visitor (function): Called as `visitor(vertex_id, depth)` when a vertex
+            is entered. If it returns False, its neighbors are not explored.
+
+        Yields:
+        tuple(string, string): (PRE_ORDER, vertex_id) when a vertex is first
+        entered and (POST_ORDER, vertex_id) once all of its descendants are done.
+        """
+        if not self.contains_id(start_id):
+            raise KeyError("One or both vertices are not in the graph!")
 
         visited = set()  # set of vertices we've visited so far
+        visited.add(start_id)
 
-        def dfs_traversal_recursive(start_vertex):
-            print(f'Visiting vertex {start_vertex.get_id()}')
+        # stack of (vertex id, iterator over its unexplored neighbor ids)
+        stack = []
 
-            # recurse for each vertex in neighbors
-            for neighbor in start_vertex.get_neighbors():
-                if neighbor.get_id() not in visited:
-                    visited.add(neighbor.get_id())
-                    dfs_traversal_recursive(neighbor)
-            return
+        def enter(vertex_id):
+            depth = len(stack)
+            if visitor is not None and visitor(vertex_id, depth) is False:
+                neighbor_ids = iter(())
+            elif depth == max_depth:
+                neighbor_ids = iter(())
+            else:
+                neighbor_ids = iter(self.get_vertex(vertex_id).iter_neighbor_ids())
+            stack.append((vertex_id, neighbor_ids))
 
-        visited.add(start_id)
-        start_vertex = self.get_vertex(start_id)
-        dfs_traversal_recursive(start_vertex)
+        yield PRE_ORDER, start_id
+        enter(start_id)
 
-    def contains_cycle(self):
+        while stack:
+            vertex_id, neighbor_ids = stack[-1]
+            for neighbor_id in neighbor_ids:
+                if neighbor_id not in visited:
+                    visited.add(neighbor_id)
+                    yield PRE_ORDER, neighbor_id
+                    enter(neighbor_id)
+                    break
+            else:
+                stack.pop()
+                yield POST_ORDER, vertex_id
+
+    def dfs_traversal(self, start_id, max_depth=None, visitor=None):
         """
-        Return True if the directed graph contains a cycle, False otherwise.
-        """
-        def dfs_cycle(vertex, visited, recursion_stack):
-            vertex_id = vertex.get_id()
-            visited.append(vertex_id)
-            neighbors = vertex.get_neighbors()
-            for n in neighbors:
-                n_id = n.get_id()
-                if n_id in visited:
-                    recursion_stack.append(True)
-                    return
-                else:
-                    recursion_stack.append(False)
-                    dfs_cycle(n, visited, recursion_stack)
-            return recursion_stack[-1]
+        Visit each vertex, starting with start_id, in DFS order, lazily.
+
+        Takes the same parameters as `dfs_events`.
+
+        Yields:
+        string: Each reachable vertex id, in depth-first (pre-)order.
+        """
+        for event, vertex_id in self.dfs_events(start_id, max_depth, visitor):
+            if event == PRE_ORDER:
+                yield vertex_id
+
+    def find_cycle(self):
+        """
+        Find a cycle with an iterative three-color depth-first search from
+        every vertex, in O(V + E). In an undirected graph a cycle needs at
+        least three vertices (or a self-loop).
 
-        start_id = list(self.__vertex_dict.keys())[0]
-        start_obj = self.get_vertex(start_id)
-        visited, recursion_stack = [start_id], []
-        is_cycle = dfs_cycle(start_obj, visited, recursion_stack)
-        return is_cycle
+        Returns:
+        list<string>: The vertex ids of a cycle, in edge order, or None if the
+        graph has no cycle.
+        """
+        csr = self.to_csr()
+        cycle = find_cycle_csr(csr)
+        if cycle is None:
+            return None
+        return [csr.ids[vertex] for vertex in cycle]
 
-    def topological_sort(self):
+    def contains_cycle(self):
+        """
+        Return True if the graph contains a cycle, False otherwise.
+        """
+        return self.find_cycle() is not None
+
+    def topological_sort(self, method='kahn'):
         """
         Return a valid ordering of vertices in a directed acyclic graph.
         If the graph contains a cycle, throw a ValueError.
 
+        Parameters:
+        method (string): 'kahn' to repeatedly take vertices with no incoming
+            edges, in insertion order, or 'dfs' for the reverse depth-first
+            finishing order. Both are O(V + E) and do not recurse.
+
+        Returns:
+        list<string>: The vertex ids, each before all the vertices it has an
+        edge to.
+
+        Raises:
+        CycleError: A ValueError whose `cycle` is a cycle in the graph.
         """
-        # TODO: Create a stack to hold the vertex ordering.
-        # TODO: For each unvisited vertex, execute a DFS from that vertex.
-        # TODO: On the way back up the recursion tree (that is, after visiting a
-        # vertex's neighbors), add the vertex to the stack.
-        # TODO: Reverse the contents of the stack and return it as a valid ordering.
-
-        vertexes = self.get_vertices()
-        indegree_dict = {}
-        for vert in vertexes:
-            if vert.get_id() not in indegree_dict:
-                indegree_dict[vert.get_id()] = 0
-            for neighbor in vert.get_neighbors():
-                neighbor_id = neighbor.get_id()
-                if neighbor_id in indegree_dict:
-                    indegree_dict[neighbor_id] += 1
-                else:
-                    indegree_dict[neighbor_id] = 1
-
-        indeg0 = []
-        for vertex_id, indegree in indegree_dict.items():
-            if indegree == 0:
-                indeg0.append(vertex_id)
-
-        sorted_list = []
-
-        while len(indeg0) > 0:
-            current_id = indeg0.pop()
-            sorted_list.append(current_id)
-            current_vertex = self.get_vertex(current_id)
-            for neighbor in current_vertex.get_neighbors():
-                neighbor_id = neighbor.get_id()
-                indegree_dict[neighbor_id] -= 1
-                if indegree_dict[neighbor_id] == 0:
-                    indeg0.append(neighbor_id)
-        return sorted_list
+        if not self.is_directed_graph():
+            raise ValueError('Topological sort needs a directed graph')
+        if method == 'kahn':
+            order_csr = kahn_order_csr
+        elif method == 'dfs':
+            order_csr = dfs_order_csr
+        else:
+            raise ValueError(f'Unknown topological sort method {method!r}')
+
+        csr = self.to_csr()
+        try:
+            order = order_csr(csr)
+        except CycleError as error:
+            raise CycleError([csr.ids[vertex] for vertex in error.cycle]) from None
+        return [csr.ids[vertex] for vertex in order]
 
     def find_connected_components(self):
-        all_ids = set(self.__vertex_dict.keys())
-
-        components = []
-
-        while len(all_ids) > 0:
-            start_id = list(all_ids).pop()
-            all_ids.remove(start_id)
-            start_vertex = self.get_vertex(start_id)
-            seen = set()
-            quene = [start_id]
-            seen.add(start_id)
-            while len(quene) > 0:
-                current_id = quene.pop(0)
-                current_vertex = self.get_vertex(current_id)
-                for neighbor in current_vertex.get_neighbors():
-                    neighbor_id = neighbor.get_id()
-                    if neighbor_id in all_ids:
-                        all_ids.remove(neighbor_id)
-                    if neighbor_id not in seen:
-                        quene.append(neighbor_id)
-                        seen.add(neighbor_id)
-            components.append(list(seen))
-        return(components)
-
-    def greedy_coloring(self):
-        """Return a dictionary of vertex id -> color."""
-        vertex_id_color = {}
-
-        # TODO: Fill in the dictionary by visiting each vertex and checking the
-        # colors of its neighbors, then assigning the “smallest” color which has
-        # not yet been assigned.
-
-        return vertex_id_color
+        """Return the connected components, the same as get_connected_components."""
+        return self.get_connected_components()
+
+    def greedy_coloring(self, strategy='insertion'):
+        """
+        Color the vertices so that no two neighbors share a color, visiting
+        each vertex and giving it the smallest color its neighbors do not
+        have yet. Edge directions are ignored.
+
+        Parameters:
+        strategy (string): The visiting order: 'insertion', 'largest_first'
+            (Welsh-Powell), 'smallest_last' or 'dsatur', which usually needs
+            the fewest colors.
+
+        Returns:
+        tuple(dict, integer): Vertex id -> color (0, 1, ...), and the number of
+        colors used.
+        """
+        csr = self.to_csr()
+        colors, color_count = greedy_coloring_csr(csr, strategy)
+        return dict(zip(csr.ids, colors)), color_count
 
 
 if __name__ == "__main__":
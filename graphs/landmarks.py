@@ -0,0 +1,166 @@
+import struct
+
+from graphs.shortest_paths import INFINITY, dijkstra_csr
+from util.binary_graph import (FLAG_DIRECTED, align, as_le_bytes, map_header,
+                               pack_ids, typed_view, unpack_ids, write_aligned,
+                               write_atomically)
+
+MAGIC = b'LMRK'
+VERSION = 1
+
+# magic, version, flags, vertex count, landmark count, id table size in bytes
+HEADER = struct.Struct('<4sHHqqq')
+
+
+class Landmarks(object):
+    """
+    Precomputed landmark distances for ALT (A*, Landmarks, Triangle
+    inequality) shortest path queries.
+
+    For a landmark L and any vertices v and t, the triangle inequality gives
+    d(v, t) >= d(L, t) - d(L, v) and d(v, t) >= d(v, L) - d(t, L), so the
+    largest of these bounds over all landmarks is a consistent A* heuristic.
+    """
+
+    def __init__(self, vertex_ids, landmark_ids, from_landmarks, to_landmarks):
+        """
+        Parameters:
+        vertex_ids (list): Vertex ids, where `vertex_ids[i]` has index `i`.
+        landmark_ids (list): The ids of the landmark vertices.
+        from_landmarks (list<array>): Per landmark, the distance from it to
+            every vertex index.
+        to_landmarks (list<array>): Per landmark, the distance from every
+            vertex index to it. The `from_landmarks` list itself for
+            undirected graphs.
+        """
+        self.vertex_ids = vertex_ids
+        self.index = {vertex_id: i for i, vertex_id in enumerate(vertex_ids)}
+        self.landmark_ids = landmark_ids
+        self.from_landmarks = from_landmarks
+        self.to_landmarks = to_landmarks
+
+    @classmethod
+    def build(cls, graph, count=8, seed_id=None):
+        """
+        Choose landmarks by farthest-point selection and compute their
+        distance tables.
+
+        The first landmark is the vertex farthest from `seed_id`; each next one
+        is the vertex farthest from all landmarks chosen so far, so they end
+        up spread around the edges of the graph where their bounds are
+        tightest. Vertices no landmark reaches count as infinitely far, so
+        every component gets a landmark before any gets a second.
+
+        Parameters:
+        graph (WeightedGraph): The graph to build landmarks for. Edge weights
+            must not be negative.
+        count (integer): Number of landmarks, at most the vertex count.
+        seed_id (string): Where selection starts, default the first vertex.
+
+        Returns:
+        Landmarks: The landmark tables.
+        """
+        csr = graph.to_csr()
+        vertex_count = len(csr)
+        count = min(count, vertex_count)
+        reverse = csr.transpose()
+
+        if seed_id is None:
+            seed = 0
+        elif seed_id in csr.index:
+            seed = csr.index[seed_id]
+        else:
+            raise KeyError(f'Vertex {seed_id!r} is not in the graph!')
+
+        landmarks, from_landmarks, to_landmarks = [], [], []
+        # distance from the nearest landmark to every vertex, or from the seed
+        # before the first landmark is chosen
+        nearest = dijkstra_csr(csr, seed)[0] if count else None
+        for _ in range(count):
+            landmark = max(range(vertex_count), key=nearest.__getitem__)
+            landmarks.append(landmark)
+            distances = dijkstra_csr(csr, landmark)[0]
+            from_landmarks.append(distances)
+            if reverse is not csr:
+                to_landmarks.append(dijkstra_csr(reverse, landmark)[0])
+            nearest = distances if len(landmarks) == 1 else list(map(min, nearest, distances))
+
+        if reverse is csr:
+            to_landmarks = from_landmarks
+        return cls(csr.ids, [csr.ids[i] for i in landmarks],
+                   from_landmarks, to_landmarks)
+
+    def heuristic(self, vertex_id, target_id):
+        """
+        Return a lower bound on the distance from vertex_id to target_id, for
+        use with `WeightedGraph.find_shortest_path_astar`.
+        """
+        vertex, target = self.index[vertex_id], self.index[target_id]
+        bound = 0
+        for from_row, to_row in zip(self.from_landmarks, self.to_landmarks):
+            # an infinite bound means the target cannot be reached at all;
+            # two infinities say nothing and are skipped
+            landmark_to_target, landmark_to_vertex = from_row[target], from_row[vertex]
+            if landmark_to_vertex != INFINITY and landmark_to_target - landmark_to_vertex > bound:
+                bound = landmark_to_target - landmark_to_vertex
+            vertex_to_landmark, target_to_landmark = to_row[vertex], to_row[target]
+            if target_to_landmark != INFINITY and vertex_to_landmark - target_to_landmark > bound:
+                bound = vertex_to_landmark - target_to_landmark
+        return bound
+
+    def save(self, filename):
+        """
+        Write the landmark tables to a binary file, to be kept alongside the
+        graph file and mapped back in by `Landmarks.load`.
+
+        The file holds a fixed header, the vertex id table, the landmark
+        indices (int64) and then one float64 distance row per landmark for the
+        from-landmark table and, for directed graphs, the to-landmark table.
+        """
+        id_flags, id_table = pack_ids(self.vertex_ids)
+        is_directed = self.to_landmarks is not self.from_landmarks
+        flags = id_flags | (FLAG_DIRECTED if is_directed else 0)
+
+        with write_atomically(filename) as f:
+            f.write(HEADER.pack(MAGIC, VERSION, flags, len(self.vertex_ids),
+                                len(self.landmark_ids), len(id_table)))
+            write_aligned(f, id_table)
+            write_aligned(f, as_le_bytes([self.index[landmark_id]
+                                          for landmark_id in self.landmark_ids], 'q'))
+            tables = [self.from_landmarks]
+            if is_directed:
+                tables.append(self.to_landmarks)
+            for table in tables:
+                for row in table:
+                    write_aligned(f, as_le_bytes(row, 'd'))
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Load landmark tables saved by `save`. The distance rows are used in
+        place from a read-only memory map.
+
+        Raises:
+        ValueError: If the file is not a landmark file of a supported version.
+        """
+        buffer, (flags, vertex_count, landmark_count, id_bytes) = \
+            map_header(filename, HEADER, MAGIC, VERSION, 'landmark')
+
+        position = align(HEADER.size)
+        vertex_ids = unpack_ids(buffer[position:position + id_bytes], vertex_count, flags)
+        position = align(position + id_bytes)
+        landmarks, position = typed_view(buffer, position, landmark_count, 'q')
+
+        from_landmarks = []
+        for _ in range(landmark_count):
+            row, position = typed_view(buffer, position, vertex_count, 'd')
+            from_landmarks.append(row)
+        to_landmarks = from_landmarks
+        if flags & FLAG_DIRECTED:
+            to_landmarks = []
+            for _ in range(landmark_count):
+                row, position = typed_view(buffer, position, vertex_count, 'd')
+                to_landmarks.append(row)
+
+        return cls(vertex_ids, [vertex_ids[i] for i in landmarks],
+                   from_landmarks, to_landmarks)
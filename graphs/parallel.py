@@ -0,0 +1,152 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from graphs.compact_graph import CompactGraph, CompactWeightedGraph
+from graphs.csr import CSRAdjacency
+from graphs.shortest_paths import bfs_csr, dijkstra_csr
+from util.binary_graph import load_graph_binary, save_graph_binary
+
+# The CSRAdjacency each worker process maps in once, by its initializer
+_worker_csr = None
+
+
+def _init_worker(snapshot_path):
+    """Map the shared graph snapshot into this worker process."""
+    global _worker_csr
+    _worker_csr = load_graph_binary(snapshot_path).to_csr()
+
+
+def _run_chunk(task, source_indices):
+    """Run `task` against the worker's graph for a chunk of sources."""
+    return task(_worker_csr, source_indices)
+
+
+def _run_each(task, csr, source_indices):
+    """Run `task` for every source in a chunk, pairing results with sources."""
+    return [(source, task(csr, source)) for source in source_indices]
+
+
+def _index_graph(csr):
+    """
+    Return a frozen graph with the adjacency of `csr`, whose vertex ids are
+    the vertex indices. Workers only use indices, and any hashable ids can
+    be saved this way, not just strings or integers.
+    """
+    indexed = CSRAdjacency(list(range(len(csr))), csr.offsets, csr.targets,
+                           csr.weights, csr.is_directed)
+    if indexed.is_weighted():
+        return CompactWeightedGraph(indexed)
+    return CompactGraph(indexed)
+
+
+def map_source_chunks(graph, source_ids, task, max_workers=None, chunk_size=16,
+                      snapshot_path=None):
+    """
+    Run `task(csr, source_indices)` for chunks of the source vertices across
+    a pool of worker processes, yielding one result per chunk as they arrive.
+
+    The graph is shared read-only: it is saved once as a binary snapshot that
+    every worker memory-maps when it starts, so only the small chunks of
+    source indices and the results cross process boundaries. Tasks that can
+    combine their per-source results, like summing them, should do it within
+    the chunk to keep what is sent back small.
+
+    Parameters:
+    graph (Graph): The Graph or WeightedGraph to run on.
+    source_ids (iterable): The ids of the source vertices.
+    task (function): A module-level function (or a functools.partial of one)
+        taking a CSRAdjacency and a list of source vertex indices.
+    max_workers (integer): Number of worker processes, default one per core.
+    chunk_size (integer): Number of sources handed to a worker at once.
+    snapshot_path (string): An existing `save_graph_binary` file of `graph` to
+        share. By default a temporary snapshot, with the vertex indices as
+        ids, is written and removed after.
+
+    Yields:
+    The task results, in the order of the chunks.
+    """
+    csr = graph.to_csr()
+    sources = []
+    for source_id in source_ids:
+        if source_id not in csr.index:
+            raise KeyError(f'Vertex {source_id!r} is not in the graph!')
+        sources.append(csr.index[source_id])
+    chunks = [sources[i:i + chunk_size] for i in range(0, len(sources), chunk_size)]
+
+    owns_snapshot = snapshot_path is None
+    if owns_snapshot:
+        handle, snapshot_path = tempfile.mkstemp(suffix='.csrg')
+        os.close(handle)
+        save_graph_binary(_index_graph(csr), snapshot_path)
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_worker,
+                                 initargs=(snapshot_path,)) as executor:
+            yield from executor.map(_run_chunk, [task] * len(chunks), chunks)
+    finally:
+        if owns_snapshot:
+            os.remove(snapshot_path)
+
+
+def map_sources(graph, source_ids, task, max_workers=None, chunk_size=16,
+                snapshot_path=None):
+    """
+    Run `task(csr, source_index)` for every source vertex across a pool of
+    worker processes, yielding results as they arrive. Takes the same
+    parameters as `map_source_chunks`, except that `task` gets one source
+    vertex index at a time.
+
+    Yields:
+    tuple: (source_id, task result), in the order of `source_ids`.
+    """
+    ids = graph.to_csr().ids
+    for results in map_source_chunks(graph, source_ids, partial(_run_each, task),
+                                     max_workers, chunk_size, snapshot_path):
+        for source, result in results:
+            yield ids[source], result
+
+
+def _shortest_paths(csr, source):
+    """
+    Distances and predecessors from one source: Dijkstra if weighted, BFS
+    hop counts if not.
+    """
+    if csr.is_weighted():
+        return dijkstra_csr(csr, source)
+    return bfs_csr(csr, source)
+
+
+def _shortest_path_distances(csr, source):
+    """Distances from one source, without sending the predecessors back."""
+    return _shortest_paths(csr, source)[0]
+
+
+def multi_source_shortest_paths(graph, source_ids, max_workers=None, chunk_size=16,
+                                predecessors=False):
+    """
+    Compute shortest path distances from many sources in parallel.
+
+    WeightedGraphs use Dijkstra's Algorithm; unweighted Graphs count edges,
+    matching `find_shortest_path` of each class.
+
+    Parameters:
+    graph (Graph): The Graph or WeightedGraph to run on.
+    source_ids (iterable): The ids of the source vertices.
+    max_workers (integer): Number of worker processes, default one per core.
+    chunk_size (integer): Number of sources handed to a worker at once.
+    predecessors (boolean): If True, also return each source's shortest path
+        tree, doubling the data sent back by the workers.
+
+    Yields:
+    tuple(string, array): Each source id and its distance to every vertex, as
+    an array indexed like `graph.to_csr().ids` (INFINITY if unreachable).
+    With `predecessors`, the array is replaced by a tuple of the distances
+    and the predecessor index of every vertex on a shortest path from the
+    source (NO_VERTEX for the source and unreachable vertices).
+    """
+    task = _shortest_paths if predecessors else _shortest_path_distances
+    return map_sources(graph, source_ids, task,
+                       max_workers=max_workers, chunk_size=chunk_size)
@@ -0,0 +1,83 @@
+from collections import OrderedDict
+
+
+class QueryCache(object):
+    """
+    A bounded least-recently-used cache of query results for one graph.
+
+    Every entry belongs to one version of the graph. When the graph's version
+    counter moves on, the whole cache is dropped on the next lookup, since
+    any answer may have changed.
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        Parameters:
+        maxsize (integer): The most results kept before the least recently
+            used one is evicted.
+        """
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.maxsize = maxsize
+        self.version = None
+        self.__entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, version, key, compute):
+        """
+        Return the cached result for key, calling compute() to produce and
+        store it on a miss.
+
+        Parameters:
+        version (integer): The graph's current version.
+        key (hashable): Identifies the query and its arguments.
+        compute (function): Produces the result.
+        """
+        if version != self.version:
+            if self.__entries:
+                self.invalidations += 1
+                self.__entries.clear()
+            self.version = version
+
+        entries = self.__entries
+        if key in entries:
+            self.hits += 1
+            entries.move_to_end(key)
+            return entries[key]
+
+        self.misses += 1
+        result = compute()
+        entries[key] = result
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def clear(self):
+        """Drop every entry, keeping the statistics."""
+        self.__entries.clear()
+
+    def get_stats(self):
+        """
+        Return the cache statistics.
+
+        Returns:
+        dict: hits, misses, evictions, invalidations (times the cache was
+        dropped because the graph changed), size, maxsize and hit_rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'size': len(self.__entries),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
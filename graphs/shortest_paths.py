@@ -0,0 +1,212 @@
+from array import array
+from heapq import heappop, heappush
+from itertools import repeat
+from operator import add
+
+INFINITY = float('inf')
+NO_VERTEX = -1
+
+
+class ShortestPathMatrix(object):
+    """
+    All-pairs shortest path distances over dense vertex indices.
+
+    `distances[i][j]` is the length of the shortest path from vertex index `i`
+    to vertex index `j` (INFINITY if unreachable). When predecessors were
+    computed, `predecessors[i][j]` is the index of the vertex just before `j`
+    on that path, or NO_VERTEX.
+    """
+
+    def __init__(self, vertex_ids, distances, predecessors=None):
+        """
+        Parameters:
+        vertex_ids (list): Vertex ids, where `vertex_ids[i]` has index `i`.
+        distances (list<array>): One row of distances per vertex.
+        predecessors (list<array>): One row of predecessor indices per vertex,
+            or None.
+        """
+        self.vertex_ids = vertex_ids
+        self.index = {vertex_id: i for i, vertex_id in enumerate(vertex_ids)}
+        self.distances = distances
+        self.predecessors = predecessors
+
+    def get_distance(self, start_id, target_id):
+        """Return the shortest distance from start_id to target_id."""
+        return self.distances[self.index[start_id]][self.index[target_id]]
+
+    def get_path(self, start_id, target_id):
+        """
+        Return the vertex ids on a shortest path from start_id to target_id, or
+        None if the target cannot be reached.
+
+        Raises:
+        ValueError: If the matrix was computed without predecessors.
+        """
+        if self.predecessors is None:
+            raise ValueError('Predecessors were not computed')
+
+        start, target = self.index[start_id], self.index[target_id]
+        if self.distances[start][target] == INFINITY:
+            return None
+
+        row = self.predecessors[start]
+        path = [target]
+        while path[-1] != start:
+            path.append(row[path[-1]])
+        path.reverse()
+        return [self.vertex_ids[i] for i in path]
+
+
+def bfs_csr(csr, source):
+    """
+    Run breadth-first search over a CSRAdjacency from one source index,
+    ignoring edge weights.
+
+    Returns:
+    tuple(array, array): The number of edges to every vertex index (INFINITY
+    if not reached) and the predecessor index of every vertex (NO_VERTEX if
+    none).
+    """
+    vertex_count = len(csr)
+    offsets, targets = csr.offsets, csr.targets
+    distances = array('d', [INFINITY]) * vertex_count
+    predecessors = array('q', [NO_VERTEX]) * vertex_count
+
+    distances[source] = 0
+    frontier = [source]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for vertex in frontier:
+            for edge in range(offsets[vertex], offsets[vertex + 1]):
+                neighbor = targets[edge]
+                if distances[neighbor] == INFINITY:
+                    distances[neighbor] = depth
+                    predecessors[neighbor] = vertex
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+
+    return distances, predecessors
+
+
+def dijkstra_csr(csr, source, target=NO_VERTEX):
+    """
+    Run Dijkstra's Algorithm over a CSRAdjacency from one source index.
+
+    Parameters:
+    csr (CSRAdjacency): The adjacency. Unweighted edges have weight 1.
+    source (integer): The index of the start vertex.
+    target (integer): If given, stop once this index is settled.
+
+    Returns:
+    tuple(array, array): The distance to every vertex index (INFINITY if not
+    reached) and the predecessor index of every vertex (NO_VERTEX if none).
+    """
+    vertex_count = len(csr)
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    distances = array('d', [INFINITY]) * vertex_count
+    predecessors = array('q', [NO_VERTEX]) * vertex_count
+    settled = bytearray(vertex_count)
+
+    distances[source] = 0
+    heap = [(0.0, source)]
+    while heap:
+        distance, vertex = heappop(heap)
+        if settled[vertex]:
+            continue  # stale entry
+        settled[vertex] = 1
+        if vertex == target:
+            break
+
+        for edge in range(offsets[vertex], offsets[vertex + 1]):
+            neighbor = targets[edge]
+            new_distance = distance + (1 if weights is None else weights[edge])
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                predecessors[neighbor] = vertex
+                heappush(heap, (new_distance, neighbor))
+
+    return distances, predecessors
+
+
+def floyd_warshall_csr(csr, with_predecessors=False):
+    """
+    Run the Floyd-Warshall Algorithm over a CSRAdjacency.
+
+    The distances are kept as one `array` row per vertex, and each step of the
+    k-loop relaxes a whole row at once (row_i = min(row_i, dist[i][k] + row_k))
+    with a C-level `map` feeding a comprehension, rather than indexing every
+    dist[i][j] from Python. Rows whose dist[i][k] is infinite are skipped.
+
+    Returns:
+    ShortestPathMatrix: The distances, and predecessors if requested.
+
+    Raises:
+    ValueError: If the graph contains a negative-weight cycle.
+    """
+    vertex_count = len(csr)
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+
+    distances = []
+    predecessors = [] if with_predecessors else None
+    for i in range(vertex_count):
+        row = array('d', [INFINITY]) * vertex_count
+        pred_row = array('q', [NO_VERTEX]) * vertex_count
+        for edge in range(offsets[i], offsets[i + 1]):
+            j = targets[edge]
+            weight = 1 if weights is None else weights[edge]
+            if weight < row[j]:
+                row[j] = weight
+                pred_row[j] = i
+        if row[i] > 0:
+            row[i] = 0
+            pred_row[i] = NO_VERTEX
+        distances.append(row)
+        if with_predecessors:
+            predecessors.append(pred_row)
+
+    for k in range(vertex_count):
+        row_k = distances[k]
+        for i in range(vertex_count):
+            row_i = distances[i]
+            distance_ik = row_i[k]
+            if distance_ik == INFINITY or i == k:
+                continue
+
+            through_k = map(add, repeat(distance_ik), row_k)
+            if not with_predecessors:
+                distances[i] = array('d', [current if current <= candidate else candidate
+                                           for current, candidate in zip(row_i, through_k)])
+                continue
+
+            pred_i, pred_k = predecessors[i], predecessors[k]
+            for j, candidate in enumerate(through_k):
+                if candidate < row_i[j]:
+                    row_i[j] = candidate
+                    pred_i[j] = pred_k[j]
+
+    for i in range(vertex_count):
+        if distances[i][i] < 0:
+            raise ValueError('Graph contains a negative-weight cycle')
+
+    return ShortestPathMatrix(list(csr.ids), distances, predecessors)
+
+
+def repeated_dijkstra_csr(csr, with_predecessors=False):
+    """
+    Compute all-pairs shortest paths by running Dijkstra from every vertex,
+    which is much faster than Floyd-Warshall on large sparse graphs. Edge
+    weights must not be negative.
+
+    Returns:
+    ShortestPathMatrix: The distances, and predecessors if requested.
+    """
+    distances = []
+    predecessors = [] if with_predecessors else None
+    for source in range(len(csr)):
+        row, pred_row = dijkstra_csr(csr, source)
+        distances.append(row)
+        if with_predecessors:
+            predecessors.append(pred_row)
+    return ShortestPathMatrix(list(csr.ids), distances, predecessors)
@@ -1,17 +1,19 @@
-from graphs.graph import Graph, Vertex
+from heapq import heappop, heappush
+from itertools import count
+from math import log2
+from operator import itemgetter
 
+from graphs.disjoint_set import DisjointSet
+from graphs.graph import Graph, Vertex, build_path
+from graphs.shortest_paths import floyd_warshall_csr, repeated_dijkstra_csr
 
-class WeightedVertex(Vertex):
 
-    def __init__(self, vertex_id):
-        """
-        Initialize a vertex and its neighbors dictionary.
+class WeightedVertex(Vertex):
+    """
+    A vertex whose neighbors dictionary maps id -> (obj, weight).
+    """
 
-        Parameters:
-        vertex_id (string): A unique identifier to identify this vertex.
-        """
-        self.id = vertex_id
-        self.neighbors_dict = {}  # id -> (obj, weight)
+    __slots__ = ()
 
     def add_neighbor(self, vertex_obj, weight):
         """
@@ -20,59 +22,50 @@ class WeightedVertex(Vertex):
         vertex_obj (Vertex): An instance of Vertex to be stored as a neighbor.
         weight (number): The weight of this edge.
         """
-        if vertex_obj.get_id() in self.neighbors_dict.keys():
-            return  # it's already a neighbor
-
-        self.neighbors_dict[vertex_obj.get_id()] = (vertex_obj, weight)
+        self._neighbors_dict.setdefault(vertex_obj._id, (vertex_obj, weight))
 
     def get_neighbors(self):
         """Return the neighbors of this vertex."""
-        return [neighbor for (neighbor, weight) in self.neighbors_dict.values()]
+        return [neighbor for (neighbor, weight) in self._neighbors_dict.values()]
 
     def get_neighbors_with_weights(self):
         """Return the neighbors of this vertex."""
-        return list(self.neighbors_dict.values())
+        return list(self._neighbors_dict.values())
+
+    def iter_neighbors(self):
+        """Iterate over the neighbors of this vertex without copying them."""
+        return (neighbor for (neighbor, weight) in self._neighbors_dict.values())
+
+    def iter_neighbors_with_weights(self):
+        """Return a live, non-copying view of the (neighbor, weight) tuples."""
+        return self._neighbors_dict.values()
 
-    def get_id(self):
-        """Return the id of this vertex."""
-        return self.id
+    def iter_neighbor_ids_with_weights(self):
+        """Iterate over (neighbor id, weight) tuples without copying them."""
+        return ((neighbor_id, weight) for neighbor_id, (neighbor, weight)
+                in self._neighbors_dict.items())
 
 
 class WeightedGraph(Graph):
 
     INFINITY = float('inf')
 
-    def __init__(self, is_directed=True):
-        """
-        Initialize a graph object with an empty vertex dictionary.
-        Parameters:
-        is_directed (boolean): Whether the graph is directed (edges go in only one direction).
-        """
-        self.vertex_dict = {}
-        self.is_directed = is_directed
+    VERTEX_CLASS = WeightedVertex
 
     def add_vertex(self, vertex_id):
         """
-        Add a new vertex object to the graph with the given key and return the vertex.
+        Add a new vertex object to the graph with the given key.
 
         Parameters:
         vertex_id (string): The unique identifier for the new vertex.
         Returns:
-        Vertex: The new vertex object.
+        boolean: True if the vertex was added, False if it was already there.
         """
-        if vertex_id in self.vertex_dict.keys():
+        if self.contains_id(vertex_id):
             return False  # it's already there
-        vertex_obj = WeightedVertex(vertex_id)
-        self.vertex_dict[vertex_id] = vertex_obj
+        super().add_vertex(vertex_id)
         return True
 
-    def get_vertex(self, vertex_id):
-        """Return the vertex if it exists."""
-        if vertex_id not in self.vertex_dict.keys():
-            return None
-        vertex_obj = self.vertex_dict[vertex_id]
-        return vertex_obj
-
     def add_edge(self, vertex_id1, vertex_id2, weight):
         """
         Add an edge from vertex with id `vertex_id1` to vertex with id `vertex_id2`.
@@ -81,185 +74,374 @@ class WeightedGraph(Graph):
         vertex_id2 (string): The unique identifier of the second vertex.
         weight (number): The edge weight.
         """
-        all_ids = self.vertex_dict.keys()
-        if vertex_id1 not in all_ids or vertex_id2 not in all_ids:
-            return False
         vertex_obj1 = self.get_vertex(vertex_id1)
         vertex_obj2 = self.get_vertex(vertex_id2)
+        if vertex_obj1 is None or vertex_obj2 is None:
+            return False
         vertex_obj1.add_neighbor(vertex_obj2, weight)
-        if not self.is_directed:
+        if not self.is_directed_graph():
             vertex_obj2.add_neighbor(vertex_obj1, weight)
+        self._edge_added(vertex_id1, vertex_id2, weight)
 
-    def get_vertices(self):
-        """Return all the vertices in the graph"""
-        return list(self.vertex_dict.values())
+    def add_edges_from(self, edges, build_reverse=False, pause_gc=False):
+        """
+        Add many weighted edges at once, several times faster than calling
+        add_edge for each. Missing vertices are created, and for duplicate
+        edges the first weight is kept, as with add_edge. The cost is
+        proportional to the number of edges added, not to the size of the
+        graph.
+
+        Parameters:
+        edges (iterable): (vertex_id1, vertex_id2, weight) triples, each an
+            edge from vertex_id1 to vertex_id2.
+        build_reverse (boolean): For directed graphs, also build the reverse
+            adjacency used by get_predecessor_ids while adding the edges.
+        pause_gc (boolean): Pause the cyclic garbage collector while adding
+            the edges. This makes loading millions of edges much faster, but
+            the collector is paused for the whole process, other threads
+            included.
+        """
+        self._add_edges_in_bulk(edges, True, build_reverse, pause_gc)
 
     def __iter__(self):
         """Iterate over the vertex objects in the graph, to use sytax:
         for vertex in graph"""
-        return iter(self.vertex_dict.values())
-
-    def union(self, parent_map, vertex_id1, vertex_id2):
-        """Combine vertex_id1 and vertex_id2 into the same group."""
-        vertex1_root = self.find(parent_map, vertex_id1)
-        vertex2_root = self.find(parent_map, vertex_id2)
-        parent_map[vertex1_root] = vertex2_root
-
-    def find(self, parent_map, vertex_id):
-        """Get the root (or, group label) for vertex_id."""
-        if (parent_map[vertex_id] == vertex_id):
-            return vertex_id
-        return self.find(parent_map, parent_map[vertex_id])
+        return iter(self.get_vertices())
 
     def minimum_spanning_tree_kruskal(self):
         """
-        Use Kruskal's Algorithm to return a list of edges, as tuples of 
+        Use Kruskal's Algorithm to return a list of edges, as tuples of
         (start_id, dest_id, weight) in the graph's minimum spanning tree.
+
+        If the graph is disconnected, the edges of a minimum spanning forest
+        (one tree per connected component) are returned instead.
         """
-        # Create a list of all edges in the graph, sort them by weight
-        # from smallest to largest
+        # Create a list of all edges in the graph, each undirected edge once,
+        # and sort them by weight from smallest to largest
+        vertex_ids = self.get_vertex_ids()
+        order = {vertex_id: i for i, vertex_id in enumerate(vertex_ids)}
         edges = list()
-        seen_edges = set()
         for vertex_obj in self.get_vertices():
-            for neighbor_obj in vertex_obj.get_neighbors_with_weights():
-                neighbor, weight = neighbor_obj
-                vertex_id = vertex_obj.get_id()
-                neighbor_id = neighbor.get_id()
-                if (vertex_id, neighbor_id) not in seen_edges and (neighbor_id, vertex_id) not in seen_edges:
+            vertex_id = vertex_obj.get_id()
+            for neighbor_id, weight in vertex_obj.iter_neighbor_ids_with_weights():
+                if self.is_directed_graph() or order[vertex_id] < order[neighbor_id]:
                     edges.append((weight, vertex_id, neighbor_id))
-                    seen_edges.add((vertex_id, neighbor_id))
-        edges = sorted(edges)
+        edges.sort(key=itemgetter(0))
 
-        # Create a dictionary `parent_map` to map vertex -> its "parent".
-        # Initialize it so that each vertex is its own parent.
-        parent_map = dict()
-        for vertex in self.vertex_dict:
-            parent_map[vertex] = vertex
+        # Every vertex starts out in a set of its own
+        groups = DisjointSet(vertex_ids)
 
-        # Create an empty list to hold the solution (i.e. all edges in the
-        # final spanning tree)
+        # Take edges from smallest to largest. If the two vertices connected
+        # by the edge are in different sets, it will not create a cycle, so add
+        # it to the solution and merge the sets. Stop once a single set is
+        # left or the edges run out.
         spanning_tree = list()
-
-        # While the spanning tree holds < V-1 edges, get the smallest
-        # edge. If the two vertices connected by the edge are in different sets
-        # (i.e. calling `find()` gets two different roots), then it will not
-        # create a cycle, so add it to the solution set and call `union()` on
-        # the two vertices.
-        index = 0
-        while len(spanning_tree) < len(self.get_vertices()) - 1:
-            weight, v1, v2 = edges[index]
-            if self.find(parent_map, v1) != self.find(parent_map, v2):
+        for weight, v1, v2 in edges:
+            if groups.get_set_count() == 1:
+                break
+            if groups.union(v1, v2):
                 spanning_tree.append((v1, v2, weight))
-                self.union(parent_map, v1, v2)
-            else:
-                index += 1
 
         # Return the solution list.
         return spanning_tree
 
-    def minimum_spanning_tree_prim(self):
-        vertex_to_weight = {}
-        vertices = self.vertex_dict
-        for vertex in vertices:
-            vertex_to_weight[vertex] = WeightedGraph.INFINITY
+    def minimum_spanning_tree_prim(self, start_id=None, forest=False):
+        """
+        Use Prim's Algorithm with a binary heap to find a minimum spanning tree.
 
-        current_id = list(self.vertex_dict.keys())[0]
-        vertex_to_weight[current_id] = 0
+        Like Kruskal's Algorithm, this ignores edge direction: on a directed
+        graph the tree grows along edges into a vertex as well as out of it,
+        and tree edges are reported in their own direction.
 
-        mst_weight = 0
+        Parameters:
+        start_id (string): The vertex to grow the tree from. Defaults to the
+            first vertex added to the graph.
+        forest (boolean): If True, keep growing new trees from unreached
+            vertices until every vertex is covered, giving a minimum spanning
+            forest of a disconnected graph. Otherwise only the component of
+            `start_id` is spanned.
 
-        while len(vertex_to_weight)-1 > 0:
-            current_obj = self.get_vertex(current_id)
-            neighbors = current_obj.get_neighbors_with_weights()
-            vertex_to_weight.pop(current_id)
-
-            for neighbor in neighbors:
-                neighbor_id, neighbor_weight = neighbor[0].get_id(
-                ), neighbor[1]
-                if neighbor_id in vertex_to_weight:
-                    if neighbor_weight < vertex_to_weight[neighbor_id]:
+        Returns:
+        tuple(list, number): The tree edges, as tuples of
+        (start_id, dest_id, weight), and their total weight.
+        """
+        vertex_ids = self.get_vertex_ids()
+        if not vertex_ids:
+            return [], 0
+        if start_id is None:
+            start_id = vertex_ids[0]
+        elif not self.contains_id(start_id):
+            raise KeyError("Vertex is not in the graph!")
+
+        is_directed = self.is_directed_graph()
+        in_tree = set()
+        # cheapest known edge weight into each vertex outside the tree, to
+        # skip pushing heap entries that could never be used
+        vertex_to_weight = {}
+        spanning_tree = []
+        mst_weight = 0
+        counter = count()
+
+        roots = [start_id] + vertex_ids if forest else [start_id]
+        for root_id in roots:
+            if root_id in in_tree:
+                continue
+
+            # (edge weight, tie breaker, vertex id, edge joining it to the tree)
+            heap = [(0, next(counter), root_id, None)]
+            while heap:
+                weight, _, current_id, edge = heappop(heap)
+                if current_id in in_tree:
+                    continue  # stale entry
+                in_tree.add(current_id)
+                if edge is not None:
+                    spanning_tree.append(edge)
+                    mst_weight += weight
+
+                current_obj = self.get_vertex(current_id)
+                for neighbor_id, neighbor_weight in current_obj.iter_neighbor_ids_with_weights():
+                    if neighbor_id in in_tree:
+                        continue
+                    if neighbor_weight < vertex_to_weight.get(neighbor_id, WeightedGraph.INFINITY):
                         vertex_to_weight[neighbor_id] = neighbor_weight
+                        heappush(heap, (neighbor_weight, next(counter), neighbor_id,
+                                        (current_id, neighbor_id, neighbor_weight)))
+                if not is_directed:
+                    continue
+                for predecessor_id, predecessor_weight in \
+                        self.get_predecessor_ids_with_weights(current_id):
+                    if predecessor_id in in_tree:
+                        continue
+                    if predecessor_weight < vertex_to_weight.get(predecessor_id,
+                                                                 WeightedGraph.INFINITY):
+                        vertex_to_weight[predecessor_id] = predecessor_weight
+                        heappush(heap, (predecessor_weight, next(counter), predecessor_id,
+                                        (predecessor_id, current_id, predecessor_weight)))
+
+        return spanning_tree, mst_weight
+
+    def minimum_spanning_tree(self):
+        """
+        Return a minimum spanning forest, picking Prim's or Kruskal's Algorithm
+        by graph density. Kruskal's sort runs in C and wins on sparse graphs,
+        while heap-based Prim avoids sorting every edge of dense graphs. Both
+        ignore edge direction, so they give forests of the same weight.
 
-            # get min weight and it's key from vertex_to_weight
-            min_weight = WeightedGraph.INFINITY
-            min_id = None
-            for v_id, v_weight in zip(vertex_to_weight.keys(), vertex_to_weight.values()):
-                v_weight = vertex_to_weight[v_id]
-                if v_weight < min_weight:
-                    min_weight = v_weight
-                    min_id = v_id
-            mst_weight += min_weight
-            current_id = min_id
+        Returns:
+        tuple(list, number): The forest edges, as tuples of
+        (start_id, dest_id, weight), and their total weight.
+        """
+        vertex_count = len(self.get_vertex_ids())
+        if vertex_count < 2:
+            return [], 0
 
-        return mst_weight
+        if self.get_edge_count() >= vertex_count * log2(vertex_count):
+            return self.minimum_spanning_tree_prim(forest=True)
 
-    def find_shortest_path(self, start_id, target_id):
+        spanning_tree = self.minimum_spanning_tree_kruskal()
+        return spanning_tree, sum(weight for _, _, weight in spanning_tree)
+
+    def _dijkstra(self, start_id, target_id=None, heuristic=None):
         """
-        Use Dijkstra's Algorithm to return the total weight of the shortest path
-        from a start vertex to a destination.
+        Run Dijkstra's Algorithm from start_id using a binary heap with lazy
+        deletion of stale entries.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): If given, stop as soon as this vertex is settled.
+        heuristic (function): If given, run A* instead: vertices are settled in
+            order of distance plus `heuristic(vertex_id, target_id)`.
+
+        Returns:
+        tuple(dict, dict): Maps of vertex id -> distance from the start vertex
+        and vertex id -> previous vertex id on the shortest path, for every
+        vertex reached.
         """
-        # Create a dictionary `vertex_to_distance` and initialize all
-        # vertices to INFINITY - hint: use `float('inf')`
-        vertex_to_distance = {}
-        vertices = self.vertex_dict
-        for vertex in vertices:
-            vertex_to_distance[vertex] = WeightedGraph.INFINITY
-
-        min_distance = 0
-        current_id = start_id
-        vertex_to_distance[current_id] = 0
-
-        # While `vertex_to_distance` is not empty:
-        # 1. Get the minimum-distance remaining vertex, remove it from the
-        #    dictionary. If it is the target vertex, return its distance.
-        # 2. Update that vertex's neighbors by adding the edge weight to the
-        #    vertex's distance, if it is lower than previous.
-        while len(vertex_to_distance) > 0:
-            current_obj = self.get_vertex(current_id)
-            neighbors = current_obj.get_neighbors_with_weights()
-            current_vertex_dist = vertex_to_distance.pop(current_id)
-
-            for neighbor in neighbors:
-                neighbor_id, neighbor_dist = neighbor[0].get_id(), neighbor[1]
-                if neighbor_id in vertex_to_distance:
-                    new_dist = current_vertex_dist + neighbor_dist
-                    if new_dist < vertex_to_distance[neighbor_id]:
-                        vertex_to_distance[neighbor_id] = new_dist
-
-            min_dist = WeightedGraph.INFINITY
-            min_id = None
-            for v_id, v_dist in zip(vertex_to_distance.keys(), vertex_to_distance.values()):
-                v_weight = vertex_to_distance[v_id]
-                if v_dist < min_dist:
-                    min_dist = v_dist
-                    min_id = v_id
-            min_distance = min_dist
-
-            current_id = min_id
+        vertex_to_distance = {start_id: 0}
+        vertex_to_parent = {start_id: None}
+        vertex_to_estimate = {}  # cached heuristic values
+        settled = set()
+
+        # (priority, tie breaker, vertex id); the counter keeps ids of
+        # unorderable types from ever being compared
+        counter = count()
+        heap = [(0, next(counter), start_id)]
+
+        while heap:
+            _, _, current_id = heappop(heap)
+            if current_id in settled:
+                continue  # stale entry, a shorter distance was already found
+            settled.add(current_id)
             if current_id == target_id:
-                print(min_distance)
-                return min_distance
+                break
 
-        # Return None if target vertex not found.
-        return None
+            current_dist = vertex_to_distance[current_id]
+            current_obj = self.get_vertex(current_id)
+            for neighbor_id, weight in current_obj.iter_neighbor_ids_with_weights():
+                if neighbor_id in settled:
+                    continue
+                new_dist = current_dist + weight
+                if new_dist < vertex_to_distance.get(neighbor_id, WeightedGraph.INFINITY):
+                    vertex_to_distance[neighbor_id] = new_dist
+                    vertex_to_parent[neighbor_id] = current_id
+                    priority = new_dist
+                    if heuristic is not None:
+                        if neighbor_id not in vertex_to_estimate:
+                            vertex_to_estimate[neighbor_id] = heuristic(neighbor_id, target_id)
+                        priority += vertex_to_estimate[neighbor_id]
+                    heappush(heap, (priority, next(counter), neighbor_id))
+
+        return vertex_to_distance, vertex_to_parent
 
-    def floyd_warshall(self):
+    def find_shortest_path(self, start_id, target_id):
         """
-        Return the All-Pairs-Shortest-Paths dictionary, containing the shortest
-        paths from each vertex to each other vertex.
+        Use Dijkstra's Algorithm to find the shortest path from a start vertex
+        to a destination.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target (end) vertex.
+
+        Returns:
+        tuple(number, list<string>): The total weight of the shortest path and
+        the vertex ids along it, from start to end. If the target cannot be
+        reached, returns (INFINITY, None).
         """
-        dist = {}
-        vertices = self.vertex_dict
+        return self._cached_query(self.find_shortest_path_astar, start_id, target_id, None)
 
-        for v1 in vertices:
-            dist[v1] = dict()
-            for v2 in vertices:
-                dist[v1][v2] = WeightedGraph.INFINITY
-            dist[v1][v1] = 0
+    def find_shortest_path_astar(self, start_id, target_id, heuristic):
+        """
+        Use A* search to find the shortest path from a start vertex to a
+        destination. A good heuristic steers the search towards the target, so
+        far fewer vertices are settled than with plain Dijkstra.
+
+        The heuristic must be consistent: h(u) <= weight(u, v) + h(v) for every
+        edge, and h(target) == 0. `Landmarks.heuristic` (ALT) always is.
 
-        vertices = self.get_vertices()
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target (end) vertex.
+        heuristic (function): Takes a vertex id and the target id and returns
+            a lower bound on the distance between them. None means Dijkstra.
 
-        for i in vertices:
-            for j in vertices:
-                for k in vertices:
-                    dist[i][j] = min(dist[i][j], dist[i][k] + dist[k][j])
+        Returns:
+        The same result as `find_shortest_path`.
+        """
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+
+        vertex_to_distance, vertex_to_parent = self._dijkstra(start_id, target_id,
+                                                              heuristic)
+        if target_id not in vertex_to_distance:  # path not found
+            return WeightedGraph.INFINITY, None
+
+        return vertex_to_distance[target_id], build_path(vertex_to_parent, target_id)
+
+    def find_shortest_path_bidirectional(self, start_id, target_id):
+        """
+        Use bidirectional Dijkstra to find the shortest path from start_id to
+        target_id: one search runs forward from the start and one backward
+        from the target (over the reverse edges), always advancing the side
+        with the smaller tentative distance. The search stops once the two
+        heap minimums add up to at least the best path seen where they meet.
+
+        Returns the same result as `find_shortest_path`.
+        """
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        if start_id == target_id:
+            return 0, [start_id]
+
+        get_vertex = self.get_vertex
+        counter = count()
+        # per side: neighbor function, distances, parents, settled ids, heap
+        forward = (lambda vertex_id: get_vertex(vertex_id).iter_neighbor_ids_with_weights(),
+                   {start_id: 0}, {start_id: None}, set(), [(0, next(counter), start_id)])
+        backward = (self.get_predecessor_ids_with_weights,
+                    {target_id: 0}, {target_id: None}, set(), [(0, next(counter), target_id)])
+
+        best_distance = WeightedGraph.INFINITY
+        meeting_id = None
+        while forward[4] and backward[4]:
+            if forward[4][0][0] + backward[4][0][0] >= best_distance:
+                break
+
+            if forward[4][0][0] <= backward[4][0][0]:
+                side, other = forward, backward
+            else:
+                side, other = backward, forward
+            neighbors, distances, parents, settled, heap = side
+            other_distances = other[1]
+
+            current_dist, _, current_id = heappop(heap)
+            if current_id in settled:
+                continue  # stale entry
+            settled.add(current_id)
+
+            for neighbor_id, weight in neighbors(current_id):
+                new_dist = current_dist + weight
+                if new_dist < distances.get(neighbor_id, WeightedGraph.INFINITY):
+                    distances[neighbor_id] = new_dist
+                    parents[neighbor_id] = current_id
+                    heappush(heap, (new_dist, next(counter), neighbor_id))
+                if neighbor_id in other_distances:
+                    total = distances[neighbor_id] + other_distances[neighbor_id]
+                    if total < best_distance:
+                        best_distance, meeting_id = total, neighbor_id
+
+        if meeting_id is None:  # path not found
+            return WeightedGraph.INFINITY, None
+
+        path = build_path(forward[2], meeting_id)
+        vertex_id = backward[2][meeting_id]
+        while vertex_id is not None:
+            path.append(vertex_id)
+            vertex_id = backward[2][vertex_id]
+        return best_distance, path
+
+    def floyd_warshall(self, with_predecessors=False):
+        """
+        Return the All-Pairs-Shortest-Paths matrix, containing the shortest
+        distances from each vertex to each other vertex. Negative edge weights
+        are allowed.
+
+        Parameters:
+        with_predecessors (boolean): Also compute the predecessor matrix, so
+            that paths can be recovered with `get_path`.
+
+        Returns:
+        ShortestPathMatrix: The distances, indexed by dense vertex index.
+
+        Raises:
+        ValueError: If the graph contains a negative-weight cycle.
+        """
+        return floyd_warshall_csr(self.to_csr(), with_predecessors)
+
+    def all_pairs_shortest_paths(self, with_predecessors=False, method=None):
+        """
+        Return the All-Pairs-Shortest-Paths matrix using the faster algorithm
+        for this graph.
+
+        Floyd-Warshall costs V^3 no matter how many edges there are, while
+        running Dijkstra from every vertex costs about V * E * log V, so sparse
+        graphs without negative weights use repeated Dijkstra.
+
+        Parameters:
+        with_predecessors (boolean): Also compute the predecessor matrix.
+        method (string): 'floyd_warshall' or 'dijkstra' to force an algorithm.
+
+        Returns:
+        ShortestPathMatrix: The distances, indexed by dense vertex index.
+        """
+        csr = self.to_csr()
+        if method is None:
+            vertex_count = len(csr)
+            has_negative_weight = any(weight < 0 for weight in csr.weights)
+            is_sparse = csr.edge_count() * log2(max(vertex_count, 2)) < vertex_count ** 2
+            method = 'dijkstra' if is_sparse and not has_negative_weight else 'floyd_warshall'
+
+        if method == 'floyd_warshall':
+            return floyd_warshall_csr(csr, with_predecessors)
+        if method == 'dijkstra':
+            return repeated_dijkstra_csr(csr, with_predecessors)
+        raise ValueError(f'Unknown shortest path method {method!r}')
@@ -0,0 +1,196 @@
+import unittest
+from graphs.analytics import (ConvergenceError, betweenness_centrality,
+                              closeness_centrality, degree_centrality,
+                              eigenvector_centrality, pagerank, pagerank_csr)
+from graphs.compact_graph import freeze
+from graphs.generators import erdos_renyi_graph
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+
+
+class TestPageRank(unittest.TestCase):
+
+    def test_cycle_is_uniform(self):
+        graph = Graph(is_directed=True)
+        graph.add_edges_from([('A', 'B'), ('B', 'C'), ('C', 'A')])
+
+        scores = pagerank(graph)
+        for score in scores.values():
+            self.assertAlmostEqual(score, 1 / 3)
+
+    def test_dangling_vertex(self):
+        # B has no outgoing edges, so its score is spread over every vertex
+        graph = Graph(is_directed=True)
+        graph.add_edges_from([('A', 'B')])
+
+        scores = pagerank(graph, tolerance=1e-12)
+
+        # a = 0.075 + 0.425 b with a + b = 1
+        self.assertAlmostEqual(scores['A'], 0.5 / 1.425)
+        self.assertAlmostEqual(scores['B'], 1 - 0.5 / 1.425)
+
+    def test_weights_steer_the_surfer(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_edges_from([('A', 'B', 9), ('A', 'C', 1), ('B', 'A', 1), ('C', 'A', 1)])
+
+        weighted = pagerank(graph)
+        unweighted = pagerank(graph, weighted=False)
+
+        self.assertGreater(weighted['B'], weighted['C'])
+        self.assertAlmostEqual(unweighted['B'], unweighted['C'])
+
+    def test_warm_start(self):
+        graph = erdos_renyi_graph(300, 0.02, seed=5, is_directed=True)
+        csr = graph.to_csr()
+        scores, cold_iterations = pagerank_csr(csr, tolerance=1e-10)
+        warm_scores, warm_iterations = pagerank_csr(csr, tolerance=1e-10, initial=scores)
+
+        self.assertLessEqual(warm_iterations, 2)
+        self.assertLess(warm_iterations, cold_iterations)
+        for score, warm_score in zip(scores, warm_scores):
+            self.assertAlmostEqual(score, warm_score)
+
+    def test_not_converged(self):
+        graph = erdos_renyi_graph(100, 0.05, seed=1, is_directed=True)
+
+        with self.assertRaises(ConvergenceError) as context:
+            pagerank(graph, tolerance=1e-15, max_iterations=2)
+        self.assertEqual(set(context.exception.scores), set(graph.get_vertex_ids()))
+
+    def test_invalid_arguments(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_edges_from([('A', 'B', -1)])
+
+        with self.assertRaises(ValueError):
+            pagerank(graph)
+        with self.assertRaises(ValueError):
+            pagerank(graph, damping=1.5, weighted=False)
+        self.assertEqual(pagerank(Graph()), {})
+
+    def test_compact_graph(self):
+        graph = erdos_renyi_graph(50, 0.1, seed=2)
+        self.assertEqual(pagerank(freeze(graph)), pagerank(graph))
+
+
+class TestCentrality(unittest.TestCase):
+
+    def setUp(self):
+        # a star: A in the middle, joined to B, C and D
+        self.graph = Graph(is_directed=False)
+        self.graph.add_edges_from([('A', 'B'), ('A', 'C'), ('A', 'D')])
+
+    def test_degree_centrality(self):
+        self.assertEqual(degree_centrality(self.graph),
+                         {'A': 1.0, 'B': 1 / 3, 'C': 1 / 3, 'D': 1 / 3})
+
+    def test_directed_degree_centrality(self):
+        graph = Graph(is_directed=True)
+        graph.add_edges_from([('A', 'B'), ('A', 'C'), ('B', 'C')])
+
+        self.assertEqual(degree_centrality(graph, 'in'), {'A': 0, 'B': 0.5, 'C': 1})
+        self.assertEqual(degree_centrality(graph, 'out'), {'A': 1, 'B': 0.5, 'C': 0})
+        self.assertEqual(degree_centrality(graph), {'A': 1, 'B': 1, 'C': 1})
+        with self.assertRaises(ValueError):
+            degree_centrality(graph, 'sideways')
+
+    def test_eigenvector_centrality(self):
+        # the star is bipartite; the leading eigenvector is (sqrt(3), 1, 1, 1)
+        scores = eigenvector_centrality(self.graph, tolerance=1e-10, max_iterations=1000)
+
+        self.assertAlmostEqual(scores['A'], 0.5 ** 0.5)
+        for leaf_id in ['B', 'C', 'D']:
+            self.assertAlmostEqual(scores[leaf_id], (1 / 6) ** 0.5)
+
+    def test_eigenvector_warm_start(self):
+        scores = eigenvector_centrality(self.graph, tolerance=1e-10, max_iterations=1000)
+        again = eigenvector_centrality(self.graph, tolerance=1e-8, max_iterations=1,
+                                       initial=scores)
+
+        self.assertAlmostEqual(again['A'], scores['A'])
+
+
+class TestBetweenness(unittest.TestCase):
+
+    def setUp(self):
+        # A - B - C - D with a shortcut B - D, and E hanging off D
+        self.graph = Graph(is_directed=False)
+        self.graph.add_edges_from([('A', 'B'), ('B', 'C'), ('C', 'D'), ('B', 'D'), ('D', 'E')])
+
+    def test_exact(self):
+        scores, error = betweenness_centrality(self.graph, normalized=False)
+
+        self.assertEqual(error, 0)
+        # B is on every path from A; D on every path to E; C on none
+        self.assertEqual(scores, {'A': 0, 'B': 3, 'C': 0, 'D': 3, 'E': 0})
+
+        normalized, _ = betweenness_centrality(self.graph)
+        self.assertAlmostEqual(normalized['B'], 3 / 6)
+
+    def test_directed_and_weighted(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_edges_from([('A', 'B', 1), ('B', 'C', 1), ('A', 'C', 5)])
+
+        weighted, _ = betweenness_centrality(graph, normalized=False)
+        unweighted, _ = betweenness_centrality(graph, normalized=False, weighted=False)
+
+        self.assertEqual(weighted['B'], 1)
+        self.assertEqual(unweighted['B'], 0)
+
+    def test_sampled_within_error_bound(self):
+        graph = erdos_renyi_graph(120, 0.04, seed=8)
+        exact, _ = betweenness_centrality(graph)
+        estimate, error = betweenness_centrality(graph, samples=30, seed=1)
+
+        self.assertGreater(error, 0)
+        for vertex_id, score in exact.items():
+            self.assertLessEqual(abs(estimate[vertex_id] - score), error)
+        self.assertEqual(betweenness_centrality(graph, samples=500), (exact, 0.0))
+
+    def test_parallel_matches_serial(self):
+        graph = erdos_renyi_graph(60, 0.08, seed=3, is_directed=True, weighted=True)
+        serial, _ = betweenness_centrality(graph, samples=20, seed=2)
+        parallel, _ = betweenness_centrality(graph, samples=20, seed=2,
+                                             max_workers=2, chunk_size=4)
+
+        for vertex_id, score in serial.items():
+            self.assertAlmostEqual(parallel[vertex_id], score)
+
+    def test_invalid_samples(self):
+        with self.assertRaises(ValueError):
+            betweenness_centrality(self.graph, samples=0)
+
+
+class TestCloseness(unittest.TestCase):
+
+    def test_undirected_path(self):
+        graph = Graph(is_directed=False)
+        graph.add_edges_from([('A', 'B'), ('B', 'C')])
+
+        scores, error = closeness_centrality(graph)
+
+        self.assertEqual(error, 0)
+        self.assertEqual(scores, {'A': 2 / 3, 'B': 1, 'C': 2 / 3})
+
+    def test_directed_counts_incoming_distances(self):
+        graph = Graph(is_directed=True)
+        graph.add_edges_from([('A', 'B'), ('B', 'C')])
+
+        scores, _ = closeness_centrality(graph)
+
+        # nobody reaches A; only A reaches B, from 1 away, out of 2 others
+        self.assertEqual(scores, {'A': 0, 'B': 0.5, 'C': 2 / 3})
+
+    def test_sampled_and_parallel(self):
+        graph = erdos_renyi_graph(150, 0.05, seed=4, weighted=True)
+        exact, _ = closeness_centrality(graph)
+        parallel, _ = closeness_centrality(graph, max_workers=2, chunk_size=32)
+        estimate, error = closeness_centrality(graph, samples=40, seed=5)
+
+        self.assertGreater(error, 0)
+        for vertex_id, score in exact.items():
+            self.assertAlmostEqual(parallel[vertex_id], score)
+            self.assertAlmostEqual(estimate[vertex_id], score, delta=0.2 * score)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from graphs.compact_graph import CompactGraph, CompactWeightedGraph
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+from util.binary_graph import load_graph_binary, save_graph_binary
+from util.file_reader import read_graph_from_file
+
+
+class TestBinaryGraph(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.filename = tempfile.mkstemp(suffix='.csrg')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_round_trip_graph(self):
+        graph = read_graph_from_file('test_files/graph_medium_undirected.txt')
+        save_graph_binary(graph, self.filename)
+        loaded = load_graph_binary(self.filename)
+
+        self.assertIsInstance(loaded, CompactGraph)
+        self.assertFalse(loaded.is_directed_graph())
+        self.assertEqual(loaded.get_vertex_ids(), graph.get_vertex_ids())
+        self.assertEqual(loaded.find_shortest_path('A', 'F'),
+                         graph.find_shortest_path('A', 'F'))
+
+    def test_round_trip_weighted_graph(self):
+        graph = read_graph_from_file('test_files/graph_small_weighted.txt')
+        save_graph_binary(graph, self.filename)
+        loaded = load_graph_binary(self.filename)
+
+        self.assertIsInstance(loaded, CompactWeightedGraph)
+        self.assertEqual(loaded.find_shortest_path('A', 'D'),
+                         (4, ['A', 'B', 'C', 'D']))
+
+    def test_integer_ids(self):
+        graph = Graph(is_directed=True)
+        for vertex_id in range(3):
+            graph.add_vertex(vertex_id)
+        graph.add_edge(0, 2)
+        save_graph_binary(graph, self.filename)
+        loaded = load_graph_binary(self.filename)
+
+        self.assertEqual(loaded.get_vertex_ids(), [0, 1, 2])
+        self.assertEqual(loaded.find_shortest_path(0, 2), [0, 2])
+
+    def test_round_trip_empty_graphs(self):
+        for graph, compact_class in [(Graph(), CompactGraph),
+                                     (WeightedGraph(), CompactWeightedGraph)]:
+            self.assertEqual(graph.to_csr().is_weighted(), isinstance(graph, WeightedGraph))
+            save_graph_binary(graph, self.filename)
+            loaded = load_graph_binary(self.filename)
+
+            self.assertIs(type(loaded), compact_class)
+            self.assertEqual(loaded.get_vertex_ids(), [])
+
+    def test_save_over_loaded_file(self):
+        graph = read_graph_from_file('test_files/graph_small_weighted.txt')
+        save_graph_binary(graph, self.filename)
+        loaded = load_graph_binary(self.filename)
+
+        # the loaded graph reads from a mapping of the file it is saved over
+        save_graph_binary(loaded, self.filename)
+
+        self.assertEqual(loaded.find_shortest_path('A', 'D'),
+                         (4, ['A', 'B', 'C', 'D']))
+        self.assertEqual(load_graph_binary(self.filename).find_shortest_path('A', 'D'),
+                         (4, ['A', 'B', 'C', 'D']))
+
+    def test_rejects_other_files(self):
+        with open(self.filename, 'wb') as f:
+            f.write(b'G\n1,2\n(1,2)\n' * 4)
+
+        with self.assertRaises(ValueError):
+            load_graph_binary(self.filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+from graphs.coloring import STRATEGIES
+from graphs.generators import bipartite_graph, erdos_renyi_graph, grid_graph
+from graphs.graph import Graph
+
+
+class TestColoring(unittest.TestCase):
+
+    def assert_proper(self, graph, coloring, color_count):
+        self.assertEqual(set(coloring), set(graph.get_vertex_ids()))
+        self.assertEqual(set(coloring.values()), set(range(color_count)))
+        for vertex in graph.get_vertices():
+            for neighbor_id in vertex.iter_neighbor_ids():
+                if neighbor_id != vertex.get_id():
+                    self.assertNotEqual(coloring[vertex.get_id()], coloring[neighbor_id])
+
+    def test_all_strategies_are_proper(self):
+        for graph in [erdos_renyi_graph(150, 0.05, seed=1),
+                      erdos_renyi_graph(150, 0.05, seed=2, is_directed=True),
+                      grid_graph(8, 9, seed=3)]:
+            for strategy in STRATEGIES:
+                coloring, color_count = graph.greedy_coloring(strategy)
+                self.assert_proper(graph, coloring, color_count)
+
+    def test_insertion_order(self):
+        graph = Graph(is_directed=False)
+        for vertex_id in ['A', 'B', 'C', 'D']:
+            graph.add_vertex(vertex_id)
+        for vertex_id1, vertex_id2 in [('A', 'B'), ('B', 'C'), ('C', 'A'), ('C', 'D')]:
+            graph.add_edge(vertex_id1, vertex_id2)
+
+        self.assertEqual(graph.greedy_coloring(),
+                         ({'A': 0, 'B': 1, 'C': 2, 'D': 0}, 3))
+
+    def test_crown_graph(self):
+        # insertion order alternates sides of a crown graph and needs n colors,
+        # while the smarter orderings find its two colors
+        graph = Graph(is_directed=False)
+        for i in range(5):
+            graph.add_vertex(('left', i))
+            graph.add_vertex(('right', i))
+        for i in range(5):
+            for j in range(5):
+                if i != j:
+                    graph.add_edge(('left', i), ('right', j))
+
+        self.assertEqual(graph.greedy_coloring('insertion')[1], 5)
+        self.assertEqual(graph.greedy_coloring('dsatur')[1], 2)
+        self.assertEqual(graph.greedy_coloring('smallest_last')[1], 2)
+
+    def test_bipartite_with_dsatur(self):
+        graph = bipartite_graph(40, 60, 0.1, seed=5)
+
+        self.assertLessEqual(graph.greedy_coloring('dsatur')[1], 2)
+
+    def test_self_loop_and_empty(self):
+        graph = Graph(is_directed=True)
+        self.assertEqual(graph.greedy_coloring('dsatur'), ({}, 0))
+
+        graph.add_vertex('A')
+        graph.add_edge('A', 'A')
+        self.assertEqual(graph.greedy_coloring('smallest_last'), ({'A': 0}, 1))
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            Graph().greedy_coloring('rainbow')
+
+
+class TestBipartite(unittest.TestCase):
+
+    def test_bipartition(self):
+        graph = bipartite_graph(30, 20, 0.2, seed=6)
+        sides, odd_cycle = graph.get_bipartition()
+
+        self.assertIsNone(odd_cycle)
+        self.assertTrue(graph.is_bipartite())
+        for vertex in graph.get_vertices():
+            for neighbor_id in vertex.iter_neighbor_ids():
+                self.assertNotEqual(sides[vertex.get_id()], sides[neighbor_id])
+
+    def test_checks_every_component(self):
+        # a bipartite path first, then a triangle in another component
+        graph = Graph(is_directed=False)
+        for vertex_id in ['A', 'B', 'C', 'X', 'Y', 'Z']:
+            graph.add_vertex(vertex_id)
+        for vertex_id1, vertex_id2 in [('A', 'B'), ('B', 'C'),
+                                       ('X', 'Y'), ('Y', 'Z'), ('Z', 'X')]:
+            graph.add_edge(vertex_id1, vertex_id2)
+
+        sides, odd_cycle = graph.get_bipartition()
+        self.assertIsNone(sides)
+        self.assertEqual(odd_cycle, ['X', 'Y', 'Z'])
+        self.assertFalse(graph.is_bipartite())
+
+    def test_odd_cycle_is_a_cycle(self):
+        graph = grid_graph(6, 6, seed=1)
+        graph.add_edge(0, 14)  # joins two vertices an even distance apart
+        odd_cycle = graph.get_bipartition()[1]
+
+        self.assertEqual(len(odd_cycle) % 2, 1)
+        for vertex_id, next_id in zip(odd_cycle, odd_cycle[1:] + odd_cycle[:1]):
+            self.assertIn(next_id, graph.get_vertex(vertex_id).iter_neighbor_ids())
+
+    def test_directed_ignores_direction(self):
+        graph = Graph(is_directed=True)
+        for vertex_id in ['A', 'B', 'C']:
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A', 'B')
+        graph.add_edge('C', 'B')
+
+        self.assertEqual(graph.get_bipartition(), ({'A': 0, 'B': 1, 'C': 0}, None))
+        graph.add_edge('C', 'A')
+        self.assertFalse(graph.is_bipartite())
+
+    def test_self_loop(self):
+        graph = Graph(is_directed=False)
+        graph.add_vertex('A')
+        graph.add_edge('A', 'A')
+
+        self.assertEqual(graph.get_bipartition(), (None, ['A']))
+
+
+if __name__ == '__main__':
+    unittest.main()
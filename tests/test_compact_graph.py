@@ -0,0 +1,86 @@
+import unittest
+from graphs.compact_graph import CompactGraph, CompactWeightedGraph, freeze
+from graphs.weighted_graph import WeightedGraph
+from util.file_reader import read_graph_from_file
+
+
+class TestCompactGraph(unittest.TestCase):
+
+    def test_freeze_graph(self):
+        filename = 'test_files/graph_small_directed.txt'
+        graph = freeze(read_graph_from_file(filename))
+
+        self.assertIsInstance(graph, CompactGraph)
+        self.assertEqual(len(graph.get_vertices()), 4)
+        self.assertEqual(graph.get_vertex_ids(), ['1', '2', '3', '4'])
+        self.assertIsNone(graph.get_vertex('5'))
+
+        vertex2 = graph.get_vertex('2')
+        self.assertEqual(vertex2.get_id(), '2')
+        self.assertEqual([n.get_id() for n in vertex2.get_neighbors()], ['4'])
+        self.assertEqual(len(graph.get_vertex('4').get_neighbors()), 0)
+
+    def test_compact_graph_is_read_only(self):
+        filename = 'test_files/graph_small_undirected.txt'
+        graph = freeze(read_graph_from_file(filename))
+
+        with self.assertRaises(TypeError):
+            graph.add_vertex('5')
+        with self.assertRaises(TypeError):
+            graph.add_edge('1', '3')
+        with self.assertRaises(TypeError):
+            graph.remove_vertex('1')
+        self.assertEqual(graph.get_out_degree('1'),
+                         graph.get_in_degree('1'))
+
+    def test_find_shortest_path(self):
+        filename = 'test_files/graph_medium_undirected.txt'
+        graph = read_graph_from_file(filename)
+        compact = freeze(graph)
+
+        self.assertEqual(compact.find_shortest_path('A', 'F'),
+                         graph.find_shortest_path('A', 'F'))
+        self.assertEqual(sorted(compact.find_vertices_n_away('A', 2)),
+                         ['D', 'E'])
+
+    def test_transpose(self):
+        filename = 'test_files/graph_small_directed.txt'
+        csr = read_graph_from_file(filename).to_csr()
+        reverse = csr.transpose()
+
+        self.assertEqual(reverse.edge_count(), csr.edge_count())
+        self.assertEqual(list(reverse.neighbors(csr.index['4'])),
+                         [csr.index['2'], csr.index['3']])
+        self.assertIs(reverse.transpose(), csr)
+
+
+class TestCompactWeightedGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = WeightedGraph(is_directed=False)
+        for vertex_id in ['A', 'B', 'C', 'D']:
+            self.graph.add_vertex(vertex_id)
+        self.graph.add_edge('A', 'B', 1)
+        self.graph.add_edge('B', 'C', 2)
+        self.graph.add_edge('A', 'C', 5)
+        self.graph.add_edge('C', 'D', 1)
+
+    def test_freeze_weighted_graph(self):
+        compact = freeze(self.graph)
+
+        self.assertIsInstance(compact, CompactWeightedGraph)
+        neighbors = compact.get_vertex('A').get_neighbors_with_weights()
+        self.assertEqual([(n.get_id(), w) for n, w in neighbors],
+                         [('B', 1), ('C', 5)])
+
+    def test_weighted_algorithms(self):
+        compact = freeze(self.graph)
+
+        self.assertEqual(compact.find_shortest_path('A', 'D'),
+                         self.graph.find_shortest_path('A', 'D'))
+        self.assertEqual(compact.minimum_spanning_tree_prim(),
+                         self.graph.minimum_spanning_tree_prim())
+
+
+if __name__ == '__main__':
+    unittest.main()
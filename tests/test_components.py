@@ -0,0 +1,72 @@
+import unittest
+from graphs.compact_graph import freeze
+from graphs.components import strongly_connected_components
+from graphs.generators import erdos_renyi_graph
+from graphs.graph import Graph
+
+
+class TestComponents(unittest.TestCase):
+
+    def setUp(self):
+        # A -> B -> C -> A is a cycle, C -> D -> E -> D, and F stands alone
+        self.graph = Graph(is_directed=True)
+        for vertex_id in ['A', 'B', 'C', 'D', 'E', 'F']:
+            self.graph.add_vertex(vertex_id)
+        for vertex_id1, vertex_id2 in [('A', 'B'), ('B', 'C'), ('C', 'A'),
+                                       ('C', 'D'), ('D', 'E'), ('E', 'D')]:
+            self.graph.add_edge(vertex_id1, vertex_id2)
+
+    def test_connected_components(self):
+        self.assertEqual(self.graph.get_connected_components(),
+                         [['A', 'B', 'C', 'D', 'E'], ['F']])
+        self.assertEqual(self.graph.find_connected_components(),
+                         [['A', 'B', 'C', 'D', 'E'], ['F']])
+
+    def test_component_labels(self):
+        labels, sizes = self.graph.get_component_labels()
+
+        self.assertEqual(list(labels), [0, 0, 0, 0, 0, 1])
+        self.assertEqual(list(sizes), [5, 1])
+
+    def test_strongly_connected_components(self):
+        # sinks first: {D, E} is completed before {A, B, C}
+        self.assertEqual(self.graph.get_strongly_connected_components(),
+                         [['D', 'E'], ['A', 'B', 'C'], ['F']])
+
+    def test_undirected_strong_is_weak(self):
+        graph = Graph(is_directed=False)
+        for vertex_id in ['A', 'B', 'C']:
+            graph.add_vertex(vertex_id)
+        graph.add_edge('C', 'B')
+
+        self.assertEqual(graph.get_strongly_connected_components(), [['A'], ['B', 'C']])
+        self.assertEqual(graph.get_connected_components(), [['A'], ['B', 'C']])
+
+    def test_reverse_topological_order(self):
+        graph = erdos_renyi_graph(200, 0.01, seed=4, is_directed=True)
+        csr = graph.to_csr()
+        labels, sizes = strongly_connected_components(csr)
+
+        self.assertEqual(sum(sizes), 200)
+        for vertex in range(len(csr)):
+            for neighbor in csr.neighbors(vertex):
+                self.assertGreaterEqual(labels[vertex], labels[neighbor])
+
+    def test_long_path_does_not_recurse(self):
+        graph = Graph(is_directed=True)
+        for vertex_id in range(5000):
+            graph.add_vertex(vertex_id)
+        for vertex_id in range(4999):
+            graph.add_edge(vertex_id, vertex_id + 1)
+        graph.add_edge(4999, 0)
+
+        labels, sizes = graph.get_component_labels(strong=True)
+        self.assertEqual(list(sizes), [5000])
+
+    def test_compact_graph(self):
+        self.assertEqual(freeze(self.graph).get_strongly_connected_components(),
+                         self.graph.get_strongly_connected_components())
+
+
+if __name__ == '__main__':
+    unittest.main()
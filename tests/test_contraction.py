@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+from graphs.contraction import ContractionHierarchy
+from graphs.generators import erdos_renyi_graph, grid_graph
+from graphs.weighted_graph import WeightedGraph
+
+
+class TestContractionHierarchy(unittest.TestCase):
+
+    def assert_valid_path(self, graph, path, distance):
+        """Check that the path follows edges of the graph and has the length."""
+        total = 0
+        for vertex_id, neighbor_id in zip(path, path[1:]):
+            weights = [weight for candidate_id, weight
+                       in graph.get_vertex(vertex_id).iter_neighbor_ids_with_weights()
+                       if candidate_id == neighbor_id]
+            self.assertTrue(weights, f'{vertex_id} -> {neighbor_id} is not an edge')
+            total += min(weights)
+        self.assertEqual(total, distance)
+
+    def test_find_shortest_path(self):
+        graph = WeightedGraph(is_directed=False)
+        for vertex_id in ['A', 'B', 'C', 'D', 'E']:
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A', 'B', 1)
+        graph.add_edge('B', 'C', 2)
+        graph.add_edge('A', 'C', 5)
+        graph.add_edge('C', 'D', 1)
+        hierarchy = ContractionHierarchy.build(graph)
+
+        self.assertEqual(hierarchy.find_shortest_path('A', 'D'), (4, ['A', 'B', 'C', 'D']))
+        self.assertEqual(hierarchy.find_shortest_path('D', 'D'), (0, ['D']))
+        self.assertEqual(hierarchy.find_shortest_path('A', 'E'),
+                         (WeightedGraph.INFINITY, None))
+        self.assertEqual(hierarchy.get_distance('D', 'A'), 4)
+        with self.assertRaises(KeyError):
+            hierarchy.get_distance('A', 'Z')
+
+    def test_matches_dijkstra(self):
+        for graph in [grid_graph(12, 12, seed=5, weighted=True),
+                      erdos_renyi_graph(120, 0.03, seed=6, weighted=True),
+                      erdos_renyi_graph(120, 0.03, seed=7, is_directed=True,
+                                        weighted=True)]:
+            hierarchy = ContractionHierarchy.build(graph)
+            vertex_ids = graph.get_vertex_ids()
+            for start_id in vertex_ids[::11]:
+                for target_id in vertex_ids[::7]:
+                    expected, _ = graph.find_shortest_path(start_id, target_id)
+                    distance, path = hierarchy.find_shortest_path(start_id, target_id)
+                    self.assertEqual(distance, expected)
+                    if path is not None:
+                        self.assertEqual(path[0], start_id)
+                        self.assertEqual(path[-1], target_id)
+                        self.assert_valid_path(graph, path, distance)
+
+    def test_negative_weight(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_vertex('A')
+        graph.add_vertex('B')
+        graph.add_edge('A', 'B', -1)
+
+        with self.assertRaises(ValueError):
+            ContractionHierarchy.build(graph)
+
+    def test_save_and_load(self):
+        graph = erdos_renyi_graph(80, 0.05, seed=8, is_directed=True, weighted=True)
+        hierarchy = ContractionHierarchy.build(graph)
+        handle, filename = tempfile.mkstemp(suffix='.chix')
+        os.close(handle)
+        try:
+            hierarchy.save(filename)
+            loaded = ContractionHierarchy.load(filename)
+
+            self.assertTrue(loaded.is_directed)
+            for start_id, target_id in [(0, 79), (12, 40), (63, 5)]:
+                self.assertEqual(loaded.find_shortest_path(start_id, target_id),
+                                 hierarchy.find_shortest_path(start_id, target_id))
+        finally:
+            os.remove(filename)
+
+    def test_save_over_loaded_file(self):
+        graph = erdos_renyi_graph(80, 0.05, seed=8, is_directed=True, weighted=True)
+        handle, filename = tempfile.mkstemp(suffix='.chix')
+        os.close(handle)
+        try:
+            ContractionHierarchy.build(graph).save(filename)
+            loaded = ContractionHierarchy.load(filename)
+            loaded.save(filename)
+
+            self.assertEqual(ContractionHierarchy.load(filename).find_shortest_path(0, 79),
+                             loaded.find_shortest_path(0, 79))
+        finally:
+            os.remove(filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+from graphs.cycles import CycleError
+from graphs.generators import random_dag
+from graphs.graph import Graph
+
+
+def make_graph(vertex_ids, edges, is_directed=True):
+    graph = Graph(is_directed=is_directed)
+    for vertex_id in vertex_ids:
+        graph.add_vertex(vertex_id)
+    for vertex_id1, vertex_id2 in edges:
+        graph.add_edge(vertex_id1, vertex_id2)
+    return graph
+
+
+class TestCycles(unittest.TestCase):
+
+    def assert_is_cycle(self, graph, cycle):
+        for vertex_id, next_id in zip(cycle, cycle[1:] + cycle[:1]):
+            self.assertIn(next_id, graph.get_vertex(vertex_id).iter_neighbor_ids())
+
+    def test_find_cycle_directed(self):
+        # the cycle is only reachable from D, not from the first vertex
+        graph = make_graph(['A', 'B', 'C', 'D', 'E'],
+                           [('A', 'B'), ('D', 'C'), ('C', 'E'), ('E', 'D')])
+        cycle = graph.find_cycle()
+
+        self.assertEqual(sorted(cycle), ['C', 'D', 'E'])
+        self.assert_is_cycle(graph, cycle)
+        self.assertTrue(graph.contains_cycle())
+
+    def test_diamond_is_not_a_cycle(self):
+        graph = make_graph(['A', 'B', 'C', 'D'],
+                           [('A', 'B'), ('A', 'C'), ('B', 'D'), ('C', 'D')])
+
+        self.assertIsNone(graph.find_cycle())
+        self.assertFalse(graph.contains_cycle())
+
+    def test_self_loop(self):
+        graph = make_graph(['A', 'B'], [('A', 'B'), ('B', 'B')])
+
+        self.assertEqual(graph.find_cycle(), ['B'])
+
+    def test_undirected(self):
+        tree = make_graph(['A', 'B', 'C', 'D'], [('A', 'B'), ('B', 'C'), ('B', 'D')],
+                          is_directed=False)
+        self.assertFalse(tree.contains_cycle())
+
+        tree.add_edge('C', 'D')
+        cycle = tree.find_cycle()
+        self.assertEqual(sorted(cycle), ['B', 'C', 'D'])
+        self.assert_is_cycle(tree, cycle)
+
+    def test_topological_sort(self):
+        graph = make_graph(['shirt', 'tie', 'jacket', 'belt', 'pants', 'shoes'],
+                           [('shirt', 'tie'), ('tie', 'jacket'), ('shirt', 'belt'),
+                            ('belt', 'jacket'), ('pants', 'belt'), ('pants', 'shoes')])
+
+        self.assertEqual(graph.topological_sort(),
+                         ['shirt', 'pants', 'tie', 'belt', 'shoes', 'jacket'])
+        self.assertEqual(graph.topological_sort(method='dfs'),
+                         ['pants', 'shoes', 'shirt', 'belt', 'tie', 'jacket'])
+
+    def test_topological_sort_is_valid(self):
+        graph = random_dag(300, 0.02, seed=9)
+        for method in ['kahn', 'dfs']:
+            position = {vertex_id: i for i, vertex_id
+                        in enumerate(graph.topological_sort(method=method))}
+            self.assertEqual(len(position), 300)
+            for vertex in graph.get_vertices():
+                for neighbor_id in vertex.iter_neighbor_ids():
+                    self.assertLess(position[vertex.get_id()], position[neighbor_id])
+
+    def test_topological_sort_reports_cycle(self):
+        graph = make_graph(['A', 'B', 'C', 'D'],
+                           [('A', 'B'), ('B', 'C'), ('C', 'D'), ('D', 'B')])
+        for method in ['kahn', 'dfs']:
+            with self.assertRaises(ValueError) as context:
+                graph.topological_sort(method=method)
+            self.assertIsInstance(context.exception, CycleError)
+            self.assertEqual(sorted(context.exception.cycle), ['B', 'C', 'D'])
+
+    def test_topological_sort_errors(self):
+        with self.assertRaises(ValueError):
+            make_graph(['A'], [], is_directed=False).topological_sort()
+        with self.assertRaises(ValueError):
+            make_graph(['A'], []).topological_sort(method='bogus')
+
+    def test_long_chain_does_not_recurse(self):
+        graph = make_graph(range(20000), [(i, i + 1) for i in range(19999)])
+
+        self.assertFalse(graph.contains_cycle())
+        self.assertEqual(graph.topological_sort(method='dfs'), list(range(20000)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from graphs.disjoint_set import DisjointSet
+
+
+class TestDisjointSet(unittest.TestCase):
+
+    def test_union_and_find(self):
+        groups = DisjointSet(['A', 'B', 'C', 'D'])
+
+        self.assertEqual(groups.get_set_count(), 4)
+        self.assertTrue(groups.union('A', 'B'))
+        self.assertTrue(groups.union('C', 'D'))
+        self.assertFalse(groups.union('B', 'A'))
+
+        self.assertEqual(groups.get_set_count(), 2)
+        self.assertEqual(groups.find('A'), groups.find('B'))
+        self.assertTrue(groups.connected('C', 'D'))
+        self.assertFalse(groups.connected('A', 'D'))
+
+    def test_long_chain(self):
+        groups = DisjointSet(range(100000))
+        for i in range(99999):
+            groups.union(i, i + 1)
+
+        self.assertEqual(groups.get_set_count(), 1)
+        self.assertTrue(groups.connected(0, 99999))
+
+    def test_unknown_item(self):
+        groups = DisjointSet()
+        groups.add('A')
+        groups.add('A')
+
+        self.assertEqual(len(groups), 1)
+        with self.assertRaises(KeyError):
+            groups.find('B')
+
+
+if __name__ == '__main__':
+    unittest.main()
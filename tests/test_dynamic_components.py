@@ -0,0 +1,113 @@
+import random
+import unittest
+from graphs.components import weakly_connected_components
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+
+
+class TestDynamicComponents(unittest.TestCase):
+
+    def setUp(self):
+        # A - B - C - D and E - F
+        self.graph = Graph(is_directed=False)
+        self.graph.add_edges_from([('A', 'B'), ('B', 'C'), ('C', 'D'), ('E', 'F')])
+        self.graph.enable_incremental_components()
+
+    def test_split_and_merge(self):
+        self.graph.remove_edge('B', 'C')
+
+        self.assertEqual(self.graph.get_connected_components(),
+                         [['A', 'B'], ['C', 'D'], ['E', 'F']])
+        self.assertFalse(self.graph.are_connected('A', 'D'))
+
+        self.graph.add_edge('D', 'E')
+
+        self.assertEqual(self.graph.get_connected_components(),
+                         [['A', 'B'], ['C', 'D', 'E', 'F']])
+        labels, sizes = self.graph.get_component_labels()
+        self.assertEqual(list(labels), [0, 0, 1, 1, 1, 1])
+        self.assertEqual(list(sizes), [2, 4])
+
+    def test_remove_edge_on_cycle_keeps_component(self):
+        self.graph.add_edge('D', 'A')
+        self.graph.remove_edge('B', 'C')
+
+        self.assertTrue(self.graph.are_connected('B', 'C'))
+        self.assertEqual(len(self.graph.get_connected_components()), 2)
+
+    def test_remove_vertex_splits(self):
+        self.graph.add_vertex('G')
+        self.graph.remove_vertex('B')
+
+        self.assertEqual(self.graph.get_connected_components(),
+                         [['A'], ['C', 'D'], ['E', 'F'], ['G']])
+
+    def test_directed_edges_connect_both_ways(self):
+        graph = Graph(is_directed=True)
+        graph.add_edges_from([('A', 'B'), ('B', 'A'), ('C', 'B')])
+        graph.enable_incremental_components()
+
+        graph.remove_edge('A', 'B')
+        self.assertTrue(graph.are_connected('A', 'C'))
+        graph.remove_edge('B', 'A')
+        self.assertFalse(graph.are_connected('A', 'C'))
+
+    def test_random_churn_matches_recomputation(self):
+        rng = random.Random(7)
+        for graph in [Graph(is_directed=True), WeightedGraph(is_directed=False)]:
+            graph.add_vertices_from(range(40))
+            graph.enable_incremental_components()
+            for step in range(1500):
+                vertex_id1, vertex_id2 = rng.randrange(50), rng.randrange(50)
+                choice = rng.random()
+                if choice < 0.1:
+                    if graph.contains_id(vertex_id1):
+                        graph.remove_vertex(vertex_id1)
+                elif not graph.contains_id(vertex_id1) or not graph.contains_id(vertex_id2):
+                    graph.add_vertices_from([vertex_id1, vertex_id2])
+                elif choice < 0.55:
+                    if isinstance(graph, WeightedGraph):
+                        graph.add_edge(vertex_id1, vertex_id2, 1)
+                    else:
+                        graph.add_edge(vertex_id1, vertex_id2)
+                else:
+                    graph.remove_edge(vertex_id1, vertex_id2)
+
+                if step % 100 == 0:
+                    labels, sizes = weakly_connected_components(graph.to_csr())
+                    maintained = graph.get_component_labels()
+                    self.assertEqual(list(maintained[0]), list(labels))
+                    self.assertEqual(list(maintained[1]), list(sizes))
+
+    def test_disable(self):
+        self.graph.disable_incremental_components()
+        self.graph.remove_edge('B', 'C')
+
+        self.assertFalse(self.graph.are_connected('A', 'D'))
+        self.assertEqual(len(self.graph.get_connected_components()), 3)
+
+
+class TestDegrees(unittest.TestCase):
+
+    def test_degrees_follow_changes(self):
+        graph = Graph(is_directed=True)
+        graph.add_edges_from([('A', 'B'), ('C', 'B'), ('B', 'A')])
+        self.assertEqual((graph.get_in_degree('B'), graph.get_out_degree('B')), (2, 1))
+
+        graph.remove_edge('C', 'B')
+        graph.add_edge('B', 'C')
+
+        self.assertEqual((graph.get_in_degree('B'), graph.get_out_degree('B')), (1, 2))
+        with self.assertRaises(KeyError):
+            graph.get_in_degree('Z')
+
+    def test_undirected_degrees(self):
+        graph = WeightedGraph(is_directed=False)
+        graph.add_edges_from([('A', 'B', 1), ('A', 'C', 2)])
+
+        self.assertEqual(graph.get_in_degree('A'), 2)
+        self.assertEqual(graph.get_out_degree('A'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from graphs.compact_graph import freeze
+from graphs.frontier import (direction_optimizing_levels, new_parent_array,
+                             top_down_levels)
+from graphs.generators import erdos_renyi_graph, power_law_graph
+
+
+class TestFrontierBFS(unittest.TestCase):
+
+    def test_top_down_levels(self):
+        adjacency = {1: [2, 3], 2: [4], 3: [4], 4: []}
+        parents = {}
+
+        levels = list(top_down_levels(1, adjacency.get, parents))
+        self.assertEqual(levels, [[1], [2, 3], [4]])
+        self.assertEqual(parents, {1: None, 2: 1, 3: 1, 4: 2})
+
+    def test_bottom_up_matches_top_down(self):
+        graph = erdos_renyi_graph(300, 0.02, seed=5, is_directed=True)
+        csr = graph.to_csr()
+
+        for alpha, beta in [(14, 24), (1e9, 1e-9), (1e-9, 1e9)]:
+            parents = new_parent_array(len(csr))
+            levels = list(direction_optimizing_levels(csr, 0, parents, alpha, beta))
+            expected = list(top_down_levels(0, lambda v: list(csr.neighbors(v)), {}))
+
+            self.assertEqual([sorted(level) for level in levels],
+                             [sorted(level) for level in expected])
+            for level in levels[1:]:
+                for vertex in level:
+                    self.assertIn(vertex, csr.neighbors(parents[vertex]))
+
+    def test_compact_graph_distances(self):
+        graph = power_law_graph(500, 3, seed=6)
+        compact = freeze(graph)
+
+        self.assertEqual(compact.get_distances(0), graph.get_distances(0))
+        self.assertEqual(len(compact.find_shortest_path(0, 499)),
+                         len(graph.find_shortest_path(0, 499)))
+
+    def test_get_distances(self):
+        graph = erdos_renyi_graph(50, 0.1, seed=7)
+        distances = graph.get_distances(0, max_distance=2)
+
+        self.assertEqual(distances[0], 0)
+        self.assertTrue(all(distance <= 2 for distance in distances.values()))
+        self.assertEqual(sorted(v for v, d in distances.items() if d == 2),
+                         sorted(graph.find_vertices_n_away(0, 2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
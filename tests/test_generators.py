@@ -0,0 +1,54 @@
+import unittest
+from graphs.generators import (bipartite_graph, erdos_renyi_graph, grid_graph,
+                               power_law_graph, random_dag)
+from graphs.weighted_graph import WeightedGraph
+
+
+def edge_list(graph):
+    return [(vertex.get_id(), neighbor_id) for vertex in graph.get_vertices()
+            for neighbor_id in vertex.iter_neighbor_ids()]
+
+
+class TestGenerators(unittest.TestCase):
+
+    def test_seeded_graphs_are_reproducible(self):
+        graph1 = erdos_renyi_graph(100, 0.05, seed=7)
+        graph2 = erdos_renyi_graph(100, 0.05, seed=7)
+        graph3 = erdos_renyi_graph(100, 0.05, seed=8)
+
+        self.assertEqual(edge_list(graph1), edge_list(graph2))
+        self.assertNotEqual(edge_list(graph1), edge_list(graph3))
+
+    def test_complete_graphs(self):
+        self.assertEqual(erdos_renyi_graph(6, 1.0).get_edge_count(), 15)
+        directed = erdos_renyi_graph(6, 1.0, is_directed=True)
+        self.assertEqual(directed.get_edge_count(), 30)
+        self.assertTrue(all(source != target for source, target in edge_list(directed)))
+
+    def test_grid_graph(self):
+        graph = grid_graph(3, 4)
+
+        self.assertEqual(len(graph.get_vertices()), 12)
+        self.assertEqual(graph.get_edge_count(), 17)
+
+    def test_power_law_graph(self):
+        graph = power_law_graph(500, 3, seed=1, weighted=True)
+
+        self.assertIsInstance(graph, WeightedGraph)
+        self.assertEqual(graph.get_edge_count(), 3 * (500 - 3))
+
+    def test_random_dag(self):
+        graph = random_dag(50, 0.2, seed=3)
+
+        self.assertTrue(all(source < target for source, target in edge_list(graph)))
+        self.assertEqual(len(graph.topological_sort()), 50)
+
+    def test_bipartite_graph(self):
+        graph = bipartite_graph(10, 15, 0.3, seed=4)
+
+        self.assertTrue(all((source < 10) != (target < 10)
+                            for source, target in edge_list(graph)))
+
+
+if __name__ == '__main__':
+    unittest.main()
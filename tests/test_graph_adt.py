@@ -1,6 +1,8 @@
+import gc
 import unittest
-from graphs.graph import Graph
-from util.file_reader import read_graph_from_file
+from graphs.graph import Graph, POST_ORDER, PRE_ORDER
+from graphs.weighted_graph import WeightedGraph
+from util.file_reader import read_graph_from_file, read_graph_from_lines
 
 
 class TestGraph(unittest.TestCase):
@@ -37,6 +39,166 @@ class TestGraph(unittest.TestCase):
         self.assertEqual(len(vertex_b.get_neighbors()), 2)
         self.assertEqual(len(vertex_c.get_neighbors()), 2)
 
+    def test_neighbor_views(self):
+        graph = Graph(is_directed=True)
+        vertex_a = graph.add_vertex('A')
+        graph.add_vertex('B')
+        graph.add_vertex('C')
+        neighbor_ids = vertex_a.iter_neighbor_ids()
+        graph.add_edge('A','B')
+        graph.add_edge('A','C')
+
+        # views reflect later edges without being rebuilt
+        self.assertEqual(list(neighbor_ids), ['B', 'C'])
+        self.assertEqual([n.get_id() for n in vertex_a.iter_neighbors()],
+                         ['B', 'C'])
+        self.assertFalse(hasattr(vertex_a, '__dict__'))
+
+    def test_add_existing_vertex(self):
+        graph = Graph(is_directed=True)
+        vertex_a = graph.add_vertex('A')
+        graph.add_vertex('B')
+        graph.add_edge('A', 'B')
+        self.assertTrue(graph.are_connected('A', 'B'))
+
+        # re-adding keeps the vertex and its edges
+        self.assertIs(graph.add_vertex('A'), vertex_a)
+        self.assertEqual(list(vertex_a.iter_neighbor_ids()), ['B'])
+        self.assertEqual(list(graph.get_predecessor_ids('B')), ['A'])
+        self.assertTrue(graph.are_connected('A', 'B'))
+        self.assertEqual(graph.get_vertex_ids(), ['A', 'B'])
+
+    def test_are_connected(self):
+        graph = Graph(is_directed=True)
+        for vertex_id in ['A', 'B', 'C', 'D']:
+            graph.add_vertex(vertex_id)
+        graph.add_edge('B', 'A')
+
+        self.assertTrue(graph.are_connected('A', 'B'))
+        self.assertFalse(graph.are_connected('A', 'C'))
+
+        # later edges and vertices are folded in incrementally
+        graph.add_edge('C', 'B')
+        graph.add_vertex('E')
+        self.assertTrue(graph.are_connected('A', 'C'))
+        self.assertFalse(graph.are_connected('D', 'E'))
+
+    def test_add_edges_from(self):
+        graph = Graph(is_directed=False)
+        graph.add_vertices_from(['A', 'B', 'A'])
+        graph.add_edges_from([('A', 'B'), ('B', 'C'), ('C', 'B'), ('A', 'B')])
+
+        self.assertEqual(graph.get_vertex_ids(), ['A', 'B', 'C'])
+        self.assertEqual(graph.get_edge_count(), 2)
+        self.assertEqual(sorted(graph.get_vertex('B').iter_neighbor_ids()), ['A', 'C'])
+
+    def test_add_edges_from_updates_derived(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertices_from(['A', 'B'])
+        self.assertFalse(graph.are_connected('A', 'B'))
+        version = graph.get_version()
+
+        graph.add_edges_from(iter([('A', 'B'), ('B', 'C')]), build_reverse=True)
+
+        self.assertGreater(graph.get_version(), version)
+        self.assertTrue(graph.are_connected('A', 'C'))
+        self.assertEqual(list(graph.get_predecessor_ids('C')), ['B'])
+        self.assertEqual(graph.find_shortest_path('A', 'C'), ['A', 'B', 'C'])
+
+    def test_add_edges_from_pause_gc(self):
+        graph = WeightedGraph(is_directed=False)
+        graph.add_edges_from([('A', 'B', 1)], pause_gc=True)
+        self.assertTrue(gc.isenabled())
+
+        # the collector comes back on even when an edge is malformed
+        with self.assertRaises(ValueError):
+            graph.add_edges_from([('B', 'C', 2), ('C', 'D')], pause_gc=True)
+        self.assertTrue(gc.isenabled())
+        self.assertEqual(graph.find_shortest_path('A', 'C'), (3, ['A', 'B', 'C']))
+
+    def test_remove_edge(self):
+        graph = Graph(is_directed=False)
+        graph.add_edges_from([('A', 'B'), ('B', 'C')])
+        self.assertTrue(graph.are_connected('A', 'C'))
+
+        self.assertTrue(graph.remove_edge('C', 'B'))
+        self.assertFalse(graph.remove_edge('B', 'C'))
+
+        self.assertEqual(list(graph.get_vertex('B').iter_neighbor_ids()), ['A'])
+        self.assertEqual(graph.get_edge_count(), 1)
+        self.assertFalse(graph.are_connected('A', 'C'))
+        with self.assertRaises(KeyError):
+            graph.remove_edge('A', 'Z')
+
+    def test_remove_vertex(self):
+        graph = Graph(is_directed=True)
+        graph.add_edges_from([('A', 'B'), ('B', 'C'), ('C', 'B'), ('C', 'C'), ('D', 'C')])
+        self.assertEqual(graph.get_in_degree('C'), 3)
+
+        graph.remove_vertex('C')
+
+        self.assertEqual(graph.get_vertex_ids(), ['A', 'B', 'D'])
+        self.assertEqual(graph.get_edge_count(), 1)
+        self.assertEqual(list(graph.get_predecessor_ids('B')), ['A'])
+        self.assertEqual(graph.get_out_degree('D'), 0)
+        self.assertEqual(graph.get_connected_components(), [['A', 'B'], ['D']])
+        with self.assertRaises(KeyError):
+            graph.remove_vertex('C')
+
+
+class TestTraversals(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = read_graph_from_file('test_files/graph_medium_undirected.txt')
+
+    def test_bfs_traversal(self):
+        visited = list(self.graph.bfs_traversal('A'))
+
+        self.assertEqual(visited, [('A', 0), ('B', 1), ('C', 1), ('D', 2),
+                                   ('E', 2), ('F', 3)])
+
+    def test_bfs_traversal_max_depth_and_visitor(self):
+        self.assertEqual([vertex_id for vertex_id, _ in
+                          self.graph.bfs_traversal('A', max_depth=1)],
+                         ['A', 'B', 'C'])
+
+        # not expanding C still reaches everything through B
+        visited = self.graph.bfs_traversal(
+            'A', visitor=lambda vertex_id, depth: vertex_id != 'C')
+        self.assertEqual([vertex_id for vertex_id, _ in visited],
+                         ['A', 'B', 'C', 'D', 'E', 'F'])
+        # expanding only A stops at its neighbors
+        visited = self.graph.bfs_traversal(
+            'A', visitor=lambda vertex_id, depth: vertex_id == 'A')
+        self.assertEqual([vertex_id for vertex_id, _ in visited], ['A', 'B', 'C'])
+
+    def test_dfs_traversal(self):
+        self.assertEqual(list(self.graph.dfs_traversal('A')),
+                         ['A', 'B', 'C', 'D', 'E', 'F'])
+        self.assertEqual(list(self.graph.dfs_traversal('A', max_depth=2)),
+                         ['A', 'B', 'C', 'D'])
+
+    def test_dfs_events(self):
+        graph = Graph(is_directed=True)
+        for vertex_id in ['A', 'B', 'C']:
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A', 'B')
+        graph.add_edge('A', 'C')
+
+        self.assertEqual(list(graph.dfs_events('A')), [
+            (PRE_ORDER, 'A'), (PRE_ORDER, 'B'), (POST_ORDER, 'B'),
+            (PRE_ORDER, 'C'), (POST_ORDER, 'C'), (POST_ORDER, 'A')])
+
+    def test_deep_dfs_does_not_recurse(self):
+        graph = Graph(is_directed=True)
+        for vertex_id in range(20000):
+            graph.add_vertex(vertex_id)
+            if vertex_id:
+                graph.add_edge(vertex_id - 1, vertex_id)
+
+        self.assertEqual(len(list(graph.dfs_traversal(0))), 20000)
+
+
 class TestReadGraphFromFile(unittest.TestCase):
     def test_read_directed_graph_from_file(self):
         filename = 'test_files/graph_small_directed.txt'
@@ -76,6 +238,29 @@ class TestReadGraphFromFile(unittest.TestCase):
         with self.assertRaises(ValueError) as error:
             graph = read_graph_from_file(filename)
 
+    def test_read_weighted_graph_from_file(self):
+        filename = 'test_files/graph_small_weighted.txt'
+        graph = read_graph_from_file(filename)
+
+        self.assertIsInstance(graph, WeightedGraph)
+        self.assertEqual(len(graph.get_vertices()), 4)
+        self.assertEqual(graph.find_shortest_path('A', 'D'),
+                         (4, ['A', 'B', 'C', 'D']))
+
+    def test_malformed_edge_reports_line_number(self):
+        lines = ['D', '1,2,3', '(1,2)', '', '(2;3)']
+
+        with self.assertRaises(ValueError) as error:
+            read_graph_from_lines(lines, source='edges.txt')
+        self.assertIn('edges.txt, line 5', str(error.exception))
+
+    def test_unknown_vertex_in_edge(self):
+        lines = ['G', '1,2', '(1,3)']
+
+        with self.assertRaises(ValueError) as error:
+            read_graph_from_lines(lines)
+        self.assertIn('line 3', str(error.exception))
+
     def test_find_shortest_path(self):
         filename = 'test_files/graph_medium_undirected.txt'
         graph = read_graph_from_file(filename)
@@ -84,6 +269,28 @@ class TestReadGraphFromFile(unittest.TestCase):
 
         self.assertEqual(len(path_from_A_to_F), 4)
 
+    def test_find_shortest_path_bidirectional(self):
+        filename = 'test_files/graph_medium_undirected.txt'
+        graph = read_graph_from_file(filename)
+
+        path_from_A_to_F = graph.find_shortest_path_bidirectional('A', 'F')
+        self.assertEqual(len(path_from_A_to_F), 4)
+        self.assertEqual((path_from_A_to_F[0], path_from_A_to_F[-1]), ('A', 'F'))
+
+    def test_find_shortest_path_bidirectional_directed(self):
+        filename = 'test_files/graph_small_directed.txt'
+        graph = read_graph_from_file(filename)
+
+        self.assertEqual(graph.find_shortest_path_bidirectional('1', '4'),
+                         ['1', '2', '4'])
+        self.assertIsNone(graph.find_shortest_path_bidirectional('4', '1'))
+
+        # the reverse adjacency follows edges added after it was built
+        graph.add_edge('4', '3')
+        self.assertEqual(sorted(graph.get_predecessor_ids('3')), ['4'])
+        self.assertEqual(graph.find_shortest_path_bidirectional('1', '3'),
+                         ['1', '2', '4', '3'])
+
     def test_get_all_vertices_n_away(self):
         filename = 'test_files/graph_medium_undirected.txt'
         graph = read_graph_from_file(filename)
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+from graphs.generators import erdos_renyi_graph, grid_graph
+from graphs.landmarks import Landmarks
+from graphs.weighted_graph import WeightedGraph
+
+
+class TestLandmarks(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = WeightedGraph(is_directed=False)
+        for vertex_id in ['A', 'B', 'C', 'D', 'E']:
+            self.graph.add_vertex(vertex_id)
+        self.graph.add_edge('A', 'B', 1)
+        self.graph.add_edge('B', 'C', 2)
+        self.graph.add_edge('A', 'C', 5)
+        self.graph.add_edge('C', 'D', 1)
+
+    def test_find_shortest_path_astar(self):
+        def zero(vertex_id, target_id):
+            return 0
+
+        self.assertEqual(self.graph.find_shortest_path_astar('A', 'D', zero),
+                         (4, ['A', 'B', 'C', 'D']))
+        self.assertEqual(self.graph.find_shortest_path_astar('A', 'E', zero),
+                         (WeightedGraph.INFINITY, None))
+        with self.assertRaises(KeyError):
+            self.graph.find_shortest_path_astar('A', 'Z', zero)
+
+    def test_farthest_point_selection(self):
+        landmarks = Landmarks.build(self.graph, count=3, seed_id='A')
+
+        # the unreachable E is farthest from A, then A's component gets one
+        # (A), then D is the farthest from both
+        self.assertEqual(landmarks.landmark_ids, ['E', 'A', 'D'])
+
+    def test_heuristic_is_lower_bound(self):
+        for is_directed in [False, True]:
+            graph = erdos_renyi_graph(60, 0.08, seed=7, is_directed=is_directed,
+                                      weighted=True)
+            landmarks = Landmarks.build(graph, count=4)
+            matrix = graph.all_pairs_shortest_paths()
+            for vertex_id in range(60):
+                for target_id in range(60):
+                    self.assertLessEqual(landmarks.heuristic(vertex_id, target_id),
+                                         matrix.get_distance(vertex_id, target_id))
+
+    def test_alt_matches_dijkstra(self):
+        for is_directed in [False, True]:
+            graph = erdos_renyi_graph(80, 0.05, seed=3, is_directed=is_directed,
+                                      weighted=True)
+            landmarks = Landmarks.build(graph, count=4)
+            for start_id, target_id in [(0, 79), (5, 40), (17, 2), (33, 33)]:
+                alt_distance, alt_path = graph.find_shortest_path_astar(
+                    start_id, target_id, landmarks.heuristic)
+                distance, path = graph.find_shortest_path(start_id, target_id)
+                self.assertEqual(alt_distance, distance)
+                self.assertEqual(path is None, alt_path is None)
+
+    def test_save_and_load(self):
+        graph = grid_graph(6, 6, seed=1, weighted=True)
+        landmarks = Landmarks.build(graph, count=3)
+        handle, filename = tempfile.mkstemp(suffix='.lmrk')
+        os.close(handle)
+        try:
+            landmarks.save(filename)
+            loaded = Landmarks.load(filename)
+
+            self.assertEqual(loaded.landmark_ids, landmarks.landmark_ids)
+            self.assertEqual(loaded.heuristic(0, 35), landmarks.heuristic(0, 35))
+            self.assertEqual(graph.find_shortest_path_astar(0, 35, loaded.heuristic),
+                             graph.find_shortest_path(0, 35))
+        finally:
+            os.remove(filename)
+
+    def test_save_over_loaded_file(self):
+        graph = grid_graph(6, 6, seed=1, weighted=True)
+        handle, filename = tempfile.mkstemp(suffix='.lmrk')
+        os.close(handle)
+        try:
+            Landmarks.build(graph, count=3).save(filename)
+            loaded = Landmarks.load(filename)
+            loaded.save(filename)
+
+            self.assertEqual(Landmarks.load(filename).heuristic(0, 35),
+                             loaded.heuristic(0, 35))
+        finally:
+            os.remove(filename)
+
+    def test_load_rejects_other_files(self):
+        handle, filename = tempfile.mkstemp()
+        os.write(handle, b'not a landmark file at all, no sir')
+        os.close(handle)
+        try:
+            with self.assertRaises(ValueError):
+                Landmarks.load(filename)
+        finally:
+            os.remove(filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
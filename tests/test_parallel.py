@@ -0,0 +1,69 @@
+import unittest
+from graphs.analytics import betweenness_centrality, closeness_centrality
+from graphs.graph import Graph
+from graphs.parallel import multi_source_shortest_paths
+from graphs.shortest_paths import NO_VERTEX
+from util.file_reader import read_graph_from_file
+
+
+class TestMultiSourceShortestPaths(unittest.TestCase):
+
+    def test_unweighted_graph(self):
+        graph = read_graph_from_file('test_files/graph_medium_undirected.txt')
+        ids = graph.to_csr().ids
+
+        results = list(multi_source_shortest_paths(
+            graph, ['A', 'F', 'C'], max_workers=2, chunk_size=1))
+
+        self.assertEqual([source_id for source_id, _ in results], ['A', 'F', 'C'])
+        distances_from_a = dict(zip(ids, results[0][1]))
+        self.assertEqual(distances_from_a['F'],
+                         len(graph.find_shortest_path('A', 'F')) - 1)
+
+    def test_weighted_graph(self):
+        graph = read_graph_from_file('test_files/graph_small_weighted.txt')
+        ids = graph.to_csr().ids
+
+        for source_id, distances in multi_source_shortest_paths(
+                graph, ids, max_workers=2):
+            for target_id, distance in zip(ids, distances):
+                self.assertEqual(
+                    distance, graph.find_shortest_path(source_id, target_id)[0])
+
+    def test_predecessors(self):
+        graph = read_graph_from_file('test_files/graph_small_weighted.txt')
+        csr = graph.to_csr()
+
+        for source_id, (distances, parents) in multi_source_shortest_paths(
+                graph, ['A', 'B'], max_workers=2, predecessors=True):
+            target = csr.index['D']
+            path = []
+            while target != NO_VERTEX:
+                path.append(csr.ids[target])
+                target = parents[target]
+            path.reverse()
+
+            self.assertEqual((distances[csr.index['D']], path),
+                             graph.find_shortest_path(source_id, 'D'))
+
+    def test_tuple_ids(self):
+        graph = Graph(is_directed=False)
+        graph.add_edges_from([((0, 0), (0, 1)), ((0, 1), (1, 1))])
+
+        results = dict(multi_source_shortest_paths(graph, [(0, 0)], max_workers=2))
+
+        self.assertEqual(list(results[(0, 0)]), [0, 1, 2])
+        self.assertEqual(betweenness_centrality(graph, max_workers=2),
+                         betweenness_centrality(graph))
+        self.assertEqual(closeness_centrality(graph, max_workers=2),
+                         closeness_centrality(graph))
+
+    def test_unknown_source(self):
+        graph = read_graph_from_file('test_files/graph_small_weighted.txt')
+
+        with self.assertRaises(KeyError):
+            list(multi_source_shortest_paths(graph, ['Z']))
+
+
+if __name__ == '__main__':
+    unittest.main()
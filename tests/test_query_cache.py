@@ -0,0 +1,100 @@
+import unittest
+from graphs.graph import Graph
+from graphs.query_cache import QueryCache
+from graphs.weighted_graph import WeightedGraph
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = QueryCache(maxsize=2)
+        cache.get(0, 'a', lambda: 1)
+        cache.get(0, 'b', lambda: 2)
+        cache.get(0, 'a', lambda: 1)  # 'b' is now the least recently used
+        cache.get(0, 'c', lambda: 3)
+
+        self.assertEqual(cache.get(0, 'a', lambda: -1), 1)
+        self.assertEqual(cache.get(0, 'b', lambda: -2), -2)
+        stats = cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions']), (2, 4, 2))
+
+    def test_version_change_drops_entries(self):
+        cache = QueryCache()
+        cache.get(0, 'a', lambda: 1)
+
+        self.assertEqual(cache.get(1, 'a', lambda: 2), 2)
+        self.assertEqual(cache.get_stats()['invalidations'], 1)
+        self.assertEqual(len(cache), 1)
+
+    def test_invalid_maxsize(self):
+        with self.assertRaises(ValueError):
+            QueryCache(maxsize=0)
+
+
+class TestGraphQueryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = Graph(is_directed=False)
+        for vertex_id in ['A', 'B', 'C', 'D']:
+            self.graph.add_vertex(vertex_id)
+        self.graph.add_edge('A', 'B')
+        self.graph.add_edge('B', 'C')
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(self.graph.get_query_cache_stats())
+        self.assertEqual(self.graph.find_shortest_path('A', 'C'), ['A', 'B', 'C'])
+
+    def test_repeat_queries_hit(self):
+        self.graph.enable_query_cache()
+        for _ in range(3):
+            self.assertEqual(self.graph.find_shortest_path('A', 'C'), ['A', 'B', 'C'])
+            self.assertEqual(self.graph.find_vertices_n_away('A', 2), ['C'])
+            self.assertEqual(len(self.graph.get_connected_components()), 2)
+
+        stats = self.graph.get_query_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (6, 3))
+
+    def test_results_are_copies(self):
+        self.graph.enable_query_cache()
+        self.graph.find_shortest_path('A', 'C').append('Z')
+
+        self.assertEqual(self.graph.find_shortest_path('A', 'C'), ['A', 'B', 'C'])
+
+    def test_mutation_invalidates(self):
+        self.graph.enable_query_cache()
+        version = self.graph.get_version()
+        self.assertIsNone(self.graph.find_shortest_path('A', 'D'))
+
+        self.graph.add_edge('C', 'D')
+
+        self.assertGreater(self.graph.get_version(), version)
+        self.assertEqual(self.graph.find_shortest_path('A', 'D'), ['A', 'B', 'C', 'D'])
+        self.assertEqual(self.graph.get_query_cache_stats()['invalidations'], 1)
+
+    def test_errors_are_not_cached(self):
+        self.graph.enable_query_cache()
+        with self.assertRaises(KeyError):
+            self.graph.find_shortest_path('A', 'Z')
+
+        self.assertEqual(self.graph.get_query_cache_stats()['size'], 0)
+
+    def test_weighted_graph(self):
+        graph = WeightedGraph(is_directed=False)
+        for vertex_id in ['A', 'B', 'C']:
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A', 'B', 1)
+        graph.add_edge('A', 'C', 5)
+        graph.enable_query_cache(maxsize=8)
+
+        self.assertEqual(graph.find_shortest_path('A', 'C'), (5, ['A', 'C']))
+        graph.add_edge('B', 'C', 1)
+        self.assertEqual(graph.find_shortest_path('A', 'C'), (2, ['A', 'B', 'C']))
+        self.assertEqual(graph.find_shortest_path('A', 'C'), (2, ['A', 'B', 'C']))
+        self.assertEqual(graph.get_query_cache_stats()['hits'], 1)
+
+        graph.disable_query_cache()
+        self.assertIsNone(graph.get_query_cache_stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
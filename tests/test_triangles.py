@@ -0,0 +1,73 @@
+import unittest
+from itertools import combinations
+from graphs.compact_graph import freeze
+from graphs.generators import erdos_renyi_graph, power_law_graph
+from graphs.graph import Graph
+from graphs.triangles import (average_clustering, clustering_coefficients,
+                              transitivity, triangle_counts)
+from graphs.weighted_graph import WeightedGraph
+
+
+class TestTriangles(unittest.TestCase):
+
+    def setUp(self):
+        # the triangle A, B, C with D hanging off C
+        self.graph = Graph(is_directed=False)
+        self.graph.add_edges_from([('A', 'B'), ('B', 'C'), ('C', 'A'), ('C', 'D')])
+
+    def test_triangle_counts(self):
+        self.assertEqual(triangle_counts(self.graph),
+                         ({'A': 1, 'B': 1, 'C': 1, 'D': 0}, 1))
+
+    def test_complete_graph(self):
+        graph = WeightedGraph(is_directed=False)
+        graph.add_edges_from((vertex_id1, vertex_id2, 1)
+                             for vertex_id1, vertex_id2 in combinations('ABCDE', 2))
+
+        counts, total = triangle_counts(graph)
+
+        self.assertEqual(total, 10)
+        self.assertEqual(set(counts.values()), {6})
+        self.assertEqual(transitivity(graph), 1)
+
+    def test_clustering(self):
+        self.assertEqual(clustering_coefficients(self.graph),
+                         {'A': 1, 'B': 1, 'C': 1 / 3, 'D': 0})
+        self.assertAlmostEqual(average_clustering(self.graph), 7 / 12)
+        # 3 * 1 triangle / 5 paths of length two
+        self.assertAlmostEqual(transitivity(self.graph), 0.6)
+
+    def test_direction_self_loops_and_empty_graph(self):
+        graph = Graph(is_directed=True)
+        graph.add_edges_from([('A', 'B'), ('B', 'A'), ('B', 'C'), ('A', 'C'), ('C', 'C')])
+
+        self.assertEqual(triangle_counts(graph), ({'A': 1, 'B': 1, 'C': 1}, 1))
+        self.assertEqual(triangle_counts(Graph()), ({}, 0))
+        self.assertEqual(transitivity(Graph()), 0)
+        self.assertEqual(average_clustering(Graph()), 0)
+
+    def test_matches_brute_force(self):
+        for graph in [erdos_renyi_graph(50, 0.2, seed=6), power_law_graph(80, 4, seed=2),
+                      erdos_renyi_graph(40, 0.2, seed=3, is_directed=True)]:
+            neighbors = {vertex_id: set() for vertex_id in graph.get_vertex_ids()}
+            for vertex in graph.get_vertices():
+                for neighbor_id in vertex.iter_neighbor_ids():
+                    neighbors[vertex.get_id()].add(neighbor_id)
+                    neighbors[neighbor_id].add(vertex.get_id())
+            expected = dict.fromkeys(neighbors, 0)
+            for triple in combinations(neighbors, 3):
+                if all(b in neighbors[a] for a, b in combinations(triple, 2)):
+                    for vertex_id in triple:
+                        expected[vertex_id] += 1
+
+            counts, total = triangle_counts(graph)
+            self.assertEqual(counts, expected)
+            self.assertEqual(total, sum(expected.values()) // 3)
+
+    def test_compact_graph(self):
+        graph = power_law_graph(100, 3, seed=1)
+        self.assertEqual(triangle_counts(freeze(graph)), triangle_counts(graph))
+
+
+if __name__ == '__main__':
+    unittest.main()
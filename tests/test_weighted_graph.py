@@ -0,0 +1,207 @@
+import sys
+import unittest
+from graphs.graph import Vertex
+from graphs.weighted_graph import WeightedGraph
+
+
+class TestWeightedGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = WeightedGraph(is_directed=False)
+        for vertex_id in ['A', 'B', 'C', 'D', 'E']:
+            self.graph.add_vertex(vertex_id)
+        self.graph.add_edge('A', 'B', 1)
+        self.graph.add_edge('B', 'C', 2)
+        self.graph.add_edge('A', 'C', 5)
+        self.graph.add_edge('C', 'D', 1)
+
+    def test_vertices_share_vertex_slots(self):
+        vertex_a = self.graph.get_vertex('A')
+
+        self.assertFalse(hasattr(vertex_a, '__dict__'))
+        self.assertEqual(sys.getsizeof(vertex_a), sys.getsizeof(Vertex('A')))
+        self.assertEqual([(n.get_id(), w) for n, w in vertex_a.iter_neighbors_with_weights()],
+                         [('B', 1), ('C', 5)])
+
+    def test_find_shortest_path(self):
+        distance, path = self.graph.find_shortest_path('A', 'D')
+
+        self.assertEqual(distance, 4)
+        self.assertEqual(path, ['A', 'B', 'C', 'D'])
+
+    def test_find_shortest_path_to_self(self):
+        self.assertEqual(self.graph.find_shortest_path('C', 'C'), (0, ['C']))
+
+    def test_find_shortest_path_unreachable(self):
+        distance, path = self.graph.find_shortest_path('A', 'E')
+
+        self.assertEqual(distance, WeightedGraph.INFINITY)
+        self.assertIsNone(path)
+
+    def test_find_shortest_path_missing_vertex(self):
+        with self.assertRaises(KeyError):
+            self.graph.find_shortest_path('A', 'Z')
+
+    def test_find_shortest_path_directed(self):
+        graph = WeightedGraph(is_directed=True)
+        for vertex_id in ['A', 'B', 'C']:
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A', 'B', 3)
+        graph.add_edge('B', 'C', 3)
+        graph.add_edge('C', 'A', 1)
+
+        self.assertEqual(graph.find_shortest_path('A', 'C'), (6, ['A', 'B', 'C']))
+        self.assertEqual(graph.find_shortest_path('C', 'B'), (4, ['C', 'A', 'B']))
+
+    def test_find_shortest_path_bidirectional(self):
+        self.assertEqual(self.graph.find_shortest_path_bidirectional('A', 'D'),
+                         (4, ['A', 'B', 'C', 'D']))
+        self.assertEqual(self.graph.find_shortest_path_bidirectional('A', 'E'),
+                         (WeightedGraph.INFINITY, None))
+
+    def test_find_shortest_path_bidirectional_directed(self):
+        graph = WeightedGraph(is_directed=True)
+        for vertex_id in ['A', 'B', 'C', 'D']:
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A', 'B', 1)
+        graph.add_edge('B', 'D', 5)
+        graph.add_edge('A', 'C', 2)
+        graph.add_edge('C', 'D', 2)
+        graph.add_edge('D', 'A', 1)
+
+        self.assertEqual(graph.find_shortest_path_bidirectional('A', 'D'),
+                         (4, ['A', 'C', 'D']))
+        self.assertEqual(graph.find_shortest_path_bidirectional('B', 'C'),
+                         (8, ['B', 'D', 'A', 'C']))
+
+    def test_add_edges_from(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_edges_from([('A', 'B', 4), ('B', 'C', 1), ('A', 'B', 9), ('C', 'A', 2)],
+                             build_reverse=True)
+
+        self.assertEqual(graph.get_vertex_ids(), ['A', 'B', 'C'])
+        self.assertEqual(graph.get_edge_count(), 3)
+        self.assertEqual(graph.find_shortest_path('A', 'C'), (5, ['A', 'B', 'C']))
+        self.assertEqual(list(graph.get_predecessor_ids_with_weights('B')), [('A', 4)])
+
+    def test_add_edges_from_undirected(self):
+        graph = WeightedGraph(is_directed=False)
+        graph.add_vertices_from(['A', 'B', 'C', 'D', 'E'])
+        graph.add_edges_from([('A', 'B', 1), ('B', 'C', 2), ('A', 'C', 5), ('C', 'D', 1)])
+
+        self.assertEqual(graph.get_edge_count(), self.graph.get_edge_count())
+        self.assertEqual(graph.find_shortest_path('D', 'A'),
+                         self.graph.find_shortest_path('D', 'A'))
+
+    def test_remove_edge(self):
+        self.assertTrue(self.graph.remove_edge('A', 'C'))
+
+        self.assertEqual(self.graph.find_shortest_path('A', 'C'), (3, ['A', 'B', 'C']))
+        self.assertFalse(self.graph.remove_edge('C', 'A'))
+
+    def test_remove_vertex(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_edges_from([('A', 'B', 1), ('B', 'C', 1), ('A', 'C', 5)])
+        graph.get_predecessor_ids('C')  # build the reverse adjacency
+
+        graph.remove_vertex('B')
+
+        self.assertEqual(graph.get_vertex_ids(), ['A', 'C'])
+        self.assertEqual(list(graph.get_predecessor_ids_with_weights('C')), [('A', 5)])
+        self.assertEqual(graph.find_shortest_path('A', 'C'), (5, ['A', 'C']))
+
+    def test_minimum_spanning_tree_kruskal(self):
+        tree = self.graph.minimum_spanning_tree_kruskal()
+
+        self.assertEqual(sorted(tree), [('A', 'B', 1), ('B', 'C', 2), ('C', 'D', 1)])
+
+    def test_minimum_spanning_forest_kruskal(self):
+        self.graph.add_vertex('F')
+        self.graph.add_edge('E', 'F', 7)
+        tree = self.graph.minimum_spanning_tree_kruskal()
+
+        self.assertEqual(len(tree), 4)
+        self.assertIn(('E', 'F', 7), tree)
+        self.assertEqual(sum(weight for _, _, weight in tree), 11)
+
+    def test_minimum_spanning_tree_prim(self):
+        tree, weight = self.graph.minimum_spanning_tree_prim()
+
+        self.assertEqual(tree, [('A', 'B', 1), ('B', 'C', 2), ('C', 'D', 1)])
+        self.assertEqual(weight, 4)
+
+    def test_minimum_spanning_tree_prim_start_and_forest(self):
+        self.graph.add_vertex('F')
+        self.graph.add_edge('E', 'F', 7)
+
+        tree, weight = self.graph.minimum_spanning_tree_prim(start_id='E')
+        self.assertEqual((tree, weight), ([('E', 'F', 7)], 7))
+
+        tree, weight = self.graph.minimum_spanning_tree_prim(forest=True)
+        self.assertEqual(len(tree), 4)
+        self.assertEqual(weight, 11)
+
+    def test_minimum_spanning_tree(self):
+        self.graph.add_vertex('F')
+        self.graph.add_edge('E', 'F', 7)
+        tree, weight = self.graph.minimum_spanning_tree()
+
+        self.assertEqual(len(tree), 4)
+        self.assertEqual(weight, 11)
+        self.assertEqual(self.graph.get_edge_count(), 5)
+
+    def test_minimum_spanning_tree_directed(self):
+        # every algorithm ignores direction: B is reached through edges into it
+        graph = WeightedGraph(is_directed=True)
+        graph.add_edges_from([('A', 'B', 1), ('C', 'B', 1), ('A', 'C', 5)])
+
+        tree, weight = graph.minimum_spanning_tree_prim(forest=True)
+        self.assertEqual(tree, [('A', 'B', 1), ('C', 'B', 1)])
+        self.assertEqual(weight, 2)
+        self.assertEqual(sorted(graph.minimum_spanning_tree_kruskal()), sorted(tree))
+
+        complete = WeightedGraph(is_directed=True)
+        complete.add_edges_from([(vertex_id1, vertex_id2, 1 if vertex_id1 < vertex_id2 else 10)
+                                 for vertex_id1 in 'ABCD' for vertex_id2 in 'ABCD'
+                                 if vertex_id1 != vertex_id2])
+        # dense enough for minimum_spanning_tree to pick Prim's Algorithm
+        self.assertEqual(complete.minimum_spanning_tree()[1], 3)
+        self.assertEqual(sum(weight for _, _, weight in complete.minimum_spanning_tree_kruskal()), 3)
+
+    def test_floyd_warshall(self):
+        matrix = self.graph.floyd_warshall(with_predecessors=True)
+
+        self.assertEqual(matrix.get_distance('A', 'D'), 4)
+        self.assertEqual(matrix.get_distance('D', 'A'), 4)
+        self.assertEqual(matrix.get_distance('A', 'E'), WeightedGraph.INFINITY)
+        self.assertEqual(matrix.get_path('A', 'D'), ['A', 'B', 'C', 'D'])
+        self.assertEqual(matrix.get_path('B', 'B'), ['B'])
+        self.assertIsNone(matrix.get_path('A', 'E'))
+
+    def test_all_pairs_shortest_paths_methods_agree(self):
+        floyd = self.graph.all_pairs_shortest_paths(method='floyd_warshall')
+        dijkstra = self.graph.all_pairs_shortest_paths(method='dijkstra')
+
+        self.assertEqual(floyd.vertex_ids, dijkstra.vertex_ids)
+        self.assertEqual([list(row) for row in floyd.distances],
+                         [list(row) for row in dijkstra.distances])
+
+    def test_floyd_warshall_negative_weights(self):
+        graph = WeightedGraph(is_directed=True)
+        for vertex_id in ['A', 'B', 'C']:
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A', 'B', 4)
+        graph.add_edge('A', 'C', 5)
+        graph.add_edge('C', 'B', -3)
+
+        matrix = graph.all_pairs_shortest_paths(with_predecessors=True)
+        self.assertEqual(matrix.get_distance('A', 'B'), 2)
+        self.assertEqual(matrix.get_path('A', 'B'), ['A', 'C', 'B'])
+
+        graph.add_edge('B', 'C', 1)
+        with self.assertRaises(ValueError):
+            graph.floyd_warshall()
+
+
+if __name__ == '__main__':
+    unittest.main()
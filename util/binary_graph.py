@@ -0,0 +1,230 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from contextlib import contextmanager
+
+from graphs.compact_graph import CompactGraph, CompactWeightedGraph
+from graphs.csr import CSRAdjacency
+
+MAGIC = b'CSRG'
+VERSION = 1
+
+FLAG_DIRECTED = 1
+FLAG_WEIGHTED = 2
+FLAG_INT_IDS = 4
+
+# magic, version, flags, vertex count, edge count, id table size in bytes
+HEADER = struct.Struct('<4sHHqqq')
+ALIGNMENT = 8
+
+
+def save_graph_binary(graph, filename):
+    """
+    Write a graph to a versioned binary file that `load_graph_binary` can map
+    straight into memory.
+
+    The file holds a fixed header, the vertex id table, then the CSR offsets
+    (int64), targets (int32) and, for weighted graphs, weights (float64), each
+    section 8-byte aligned and little-endian.
+
+    Arguments:
+    graph (Graph): The Graph or WeightedGraph to save. Vertex ids must be all
+        strings or all integers.
+    filename (string): The path of the file to write.
+    """
+    csr = graph.to_csr()
+    id_flags, id_table = pack_ids(csr.ids)
+
+    flags = id_flags
+    if csr.is_directed:
+        flags |= FLAG_DIRECTED
+    if csr.is_weighted():
+        flags |= FLAG_WEIGHTED
+
+    with write_atomically(filename) as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, len(csr), csr.edge_count(),
+                            len(id_table)))
+        write_aligned(f, id_table)
+        write_aligned(f, as_le_bytes(csr.offsets, CSRAdjacency.OFFSET_TYPECODE))
+        write_aligned(f, as_le_bytes(csr.targets, CSRAdjacency.TARGET_TYPECODE))
+        if csr.is_weighted():
+            write_aligned(f, as_le_bytes(csr.weights, CSRAdjacency.WEIGHT_TYPECODE))
+
+
+def load_graph_binary(filename):
+    """
+    Load a graph saved by `save_graph_binary`.
+
+    The file is memory-mapped read-only and the offsets, targets and weights
+    arrays are used in place, so loading is near-instant and processes that
+    load the same file share its pages through the OS page cache. Only the
+    vertex id table is decoded into Python objects.
+
+    Arguments:
+    filename (string): The path of the file to read.
+
+    Returns:
+    CompactGraph or CompactWeightedGraph: The frozen graph.
+
+    Raises:
+    ValueError: If the file is not a graph file of a supported version.
+    """
+    buffer, (flags, vertex_count, edge_count, id_bytes) = \
+        map_header(filename, HEADER, MAGIC, VERSION, 'binary graph')
+
+    position = align(HEADER.size)
+    ids = unpack_ids(buffer[position:position + id_bytes], vertex_count, flags)
+    position = align(position + id_bytes)
+
+    offsets, position = typed_view(buffer, position, vertex_count + 1,
+                                   CSRAdjacency.OFFSET_TYPECODE)
+    targets, position = typed_view(buffer, position, edge_count,
+                                   CSRAdjacency.TARGET_TYPECODE)
+    weights = None
+    if flags & FLAG_WEIGHTED:
+        weights, position = typed_view(buffer, position, edge_count,
+                                       CSRAdjacency.WEIGHT_TYPECODE)
+
+    csr = CSRAdjacency(ids, offsets, targets, weights,
+                       is_directed=bool(flags & FLAG_DIRECTED))
+    if weights is not None:
+        return CompactWeightedGraph(csr)
+    return CompactGraph(csr)
+
+
+@contextmanager
+def write_atomically(filename):
+    """
+    Open a temporary file next to `filename` for binary writing, and move it
+    over `filename` once the block completes. Readers that have the old file
+    memory-mapped keep seeing its contents instead of having it truncated
+    under them, and a failed write leaves the old file untouched.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    f = tempfile.NamedTemporaryFile(dir=directory, delete=False)
+    try:
+        with f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f.name, filename)
+    except BaseException:
+        os.remove(f.name)
+        raise
+
+
+def map_header(filename, header, magic, version, description):
+    """
+    Memory-map a file read-only and check its header, which starts with the
+    magic bytes and the format version.
+
+    Arguments:
+    filename (string): The path of the file to read.
+    header (struct.Struct): The header layout; its first two fields are the
+        magic bytes and the version.
+    magic (bytes): The expected magic bytes.
+    version (int): The supported format version.
+    description (string): What the file holds, for error messages.
+
+    Returns:
+    tuple(memoryview, tuple): The mapped file and the header fields that
+    follow the magic bytes and the version.
+
+    Raises:
+    ValueError: If the file is not a `description` file of a supported
+        version.
+    """
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < header.size:
+            raise ValueError(f'{filename} is not a {description} file')
+        buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    fields = header.unpack_from(buffer)
+    if fields[0] != magic:
+        raise ValueError(f'{filename} is not a {description} file')
+    if fields[1] != version:
+        raise ValueError(f'{filename} has unsupported version {fields[1]}')
+    return buffer, fields[2:]
+
+
+def pack_ids(ids):
+    """
+    Encode a vertex id table.
+
+    Returns:
+    tuple(int, bytes): The id flags (FLAG_INT_IDS or 0) and the encoded table:
+    int64 ids, or int64 string end offsets followed by the UTF-8 string data.
+    """
+    if all(type(vertex_id) is int for vertex_id in ids):
+        return FLAG_INT_IDS, as_le_bytes(ids, 'q')
+    if not all(isinstance(vertex_id, str) for vertex_id in ids):
+        raise TypeError('vertex ids must be all strings or all integers')
+
+    encoded = [vertex_id.encode('utf-8') for vertex_id in ids]
+    ends = array('q')
+    end = 0
+    for data in encoded:
+        end += len(data)
+        ends.append(end)
+    return 0, as_le_bytes(ends, 'q') + b''.join(encoded)
+
+
+def unpack_ids(table, vertex_count, flags):
+    """Decode an id table produced by `pack_ids` into a list of ids."""
+    ends = _from_le_bytes(table[:8 * vertex_count], 'q')
+    if flags & FLAG_INT_IDS:
+        return ends.tolist()
+
+    data = bytes(table[8 * vertex_count:])
+    ids = []
+    start = 0
+    for end in ends:
+        ids.append(data[start:end].decode('utf-8'))
+        start = end
+    return ids
+
+
+def typed_view(buffer, position, length, typecode):
+    """Return a typed view of `length` items at `position`, and the next section."""
+    itemsize = array(typecode).itemsize
+    end = position + length * itemsize
+    if end > len(buffer):
+        raise ValueError('binary graph file is truncated')
+    section = buffer[position:end]
+    if sys.byteorder == 'little':
+        values = section.cast(typecode)
+    else:
+        values = _from_le_bytes(section, typecode)  # must copy to swap bytes
+    return values, align(end)
+
+
+def as_le_bytes(values, typecode):
+    """Return the little-endian bytes of `values` stored with `typecode`."""
+    if not (isinstance(values, array) and values.typecode == typecode):
+        values = array(typecode, values)
+    if sys.byteorder != 'little':
+        values = array(typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le_bytes(data, typecode):
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+def align(position):
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+def write_aligned(f, data):
+    f.write(data)
+    padding = align(len(data)) - len(data)
+    if padding:
+        f.write(b'\0' * padding)
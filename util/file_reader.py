@@ -1,44 +1,137 @@
 from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
 
+# Large buffered reads keep the line loop off the syscall path on big files
+READ_BUFFER_SIZE = 1 << 20
 
-def read_graph_from_file(filename):
+
+def read_graph_from_file(filename, weighted=None):
     """
     Read in data from the specified filename, and create and return a graph
     object corresponding to that data.
 
+    The file is streamed line by line, so memory use stays proportional to the
+    graph being built rather than to the size of the file.
+
     Arguments:
     filename (string): The relative path of the file to be processed
+    weighted (boolean): Whether to build a WeightedGraph. By default this is
+    decided by the first edge line: `(a,b,w)` means weighted, `(a,b)` not.
+
+    Returns:
+    Graph: A directed or undirected Graph (or WeightedGraph) object containing
+    the specified vertices and edges
+    """
+    with open(filename, 'r', buffering=READ_BUFFER_SIZE) as lines:
+        return read_graph_from_lines(lines, source=filename, weighted=weighted)
+
+
+def read_graph_from_lines(lines, source='<lines>', weighted=None):
+    """
+    Build a graph from an iterable of lines in the graph file format:
+
+        G or D        (undirected or directed)
+        A,B,C         (comma-separated vertex ids)
+        (A,B)         (one edge per token, `(A,B,weight)` for weighted graphs)
+
+    Arguments:
+    lines (iterable<string>): The lines to parse, e.g. an open file.
+    source (string): A name for the input, used in error messages.
+    weighted (boolean): See `read_graph_from_file`.
 
     Returns:
-    Graph: A directed or undirected Graph object containing the specified
-    vertices and edges
+    Graph: The graph described by the lines.
+
+    Raises:
+    ValueError: If a line is malformed, naming the source and line number.
     """
+    is_directed = None
+    vertex_ids = None
+    graph_obj = None
 
-    # TODO: Use 'open' to open the file
-    f = open(filename, "r").read().split()
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
 
-    # TODO: Use the first line (G or D) to determine whether graph is directed
-    # and create a graph object
-    is_directed = True if f[0] == "D" else False
-    graph_obj = Graph(is_directed=is_directed)
+        # Use the first line (G or D) to determine whether graph is directed
+        if is_directed is None:
+            if line not in ('G', 'D'):
+                raise ValueError(
+                    f'{source}, line {line_number}: expected graph type G or D, '
+                    f'got {line!r}')
+            is_directed = line == 'D'
+            continue
 
-    # TODO: Use the second line to add the vertices to the graph
-    graph_vertices = f[1].split(',')
-    for vertice in graph_vertices:
-        graph_obj.add_vertex(vertice)
+        # Use the second line to list the vertices of the graph
+        if vertex_ids is None:
+            vertex_ids = [vertex_id.strip() for vertex_id in line.split(',')]
+            continue
 
-    # TODO: Use the 3rd+ line to add the edges to the graph
+        # Use the 3rd+ lines to add the edges to the graph
+        for token in line.split():
+            if not (token.startswith('(') and token.endswith(')')):
+                raise _edge_error(source, line_number, token)
+            parts = token[1:-1].split(',')
 
-    edges = f[2:]
-    for e in edges:
-        # FIXME: Issue might be here.
-        print(type(e))
-        v1, v2 = e.strip(')(').split(',')
-        graph_obj.add_edge(v1, v2)
+            if graph_obj is None:
+                if weighted is None:
+                    weighted = len(parts) == 3
+                graph_obj = _new_graph(is_directed, vertex_ids, weighted)
 
+            _add_edge(graph_obj, parts, weighted, source, line_number, token)
+
+    if vertex_ids is None:
+        raise ValueError(f'{source}: missing graph type or vertex line')
+    if graph_obj is None:  # no edges
+        graph_obj = _new_graph(is_directed, vertex_ids, bool(weighted))
+    return graph_obj
+
+
+def _new_graph(is_directed, vertex_ids, weighted):
+    """Create an empty Graph or WeightedGraph holding the given vertices."""
+    graph_obj = WeightedGraph(is_directed) if weighted else Graph(is_directed)
+    for vertex_id in vertex_ids:
+        graph_obj.add_vertex(vertex_id)
     return graph_obj
 
 
+def _add_edge(graph_obj, parts, weighted, source, line_number, token):
+    """Add the edge parsed from one `(a,b)` or `(a,b,w)` token."""
+    if len(parts) != (3 if weighted else 2):
+        raise _edge_error(source, line_number, token)
+
+    vertex_id1, vertex_id2 = parts[0].strip(), parts[1].strip()
+    if not graph_obj.contains_id(vertex_id1) or not graph_obj.contains_id(vertex_id2):
+        raise ValueError(
+            f'{source}, line {line_number}: edge {token!r} uses a vertex that '
+            f'is not in the vertex list')
+
+    if weighted:
+        graph_obj.add_edge(vertex_id1, vertex_id2,
+                           _parse_weight(parts[2], source, line_number, token))
+    else:
+        graph_obj.add_edge(vertex_id1, vertex_id2)
+
+
+def _parse_weight(text, source, line_number, token):
+    """Parse an edge weight, keeping integral weights as ints."""
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        raise _edge_error(source, line_number, token) from None
+
+
+def _edge_error(source, line_number, token):
+    return ValueError(
+        f'{source}, line {line_number}: malformed edge {token!r}, '
+        f'expected (a,b) or (a,b,weight)')
+
+
 if __name__ == '__main__':
     graph = read_graph_from_file('test.txt')
 